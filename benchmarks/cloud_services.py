@@ -0,0 +1,78 @@
+"""
+Benchmark: translation throughput against the local service stand-in (offline, no keys).
+
+    python benchmarks/cloud_services.py --segments 400 --latency 0.15 --rate-limit 5 --keys 1 3
+
+Starts benchmarks/service_standin.py in-process with the given latency and per-key rate
+limit, then translates the same generated segments with both translators through a key
+pool of 1, 3, ... keys (usage goes to a temporary ledger). Reports the time taken and the
+answers of the stand-in per status, 429s included.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.translator import MicrosoftTranslator, GoogleTranslator
+from core.key_pool import KeyPool
+from core.quota import UsageLedger
+from benchmarks.service_standin import StandInServer, Faults, format_stats
+
+SENTENCES = ("The meeting has been moved to Thursday afternoon.", "Please read the attached report before then.",
+             "Our sales grew by twelve percent in the last quarter.", "The new office opens in the spring.",
+             "Remember to submit your travel expenses by Friday.")
+
+
+def make_segments(count):
+    return [f"{SENTENCES[i % len(SENTENCES)]} ({i + 1})" for i in range(count)]
+
+
+def run(translator_class, server, segments, keys, ledger):
+    settings = {'key_rate_limits': {translator_class.SERVICE: [server.faults.rate_limit, 1]}} \
+        if server.faults.rate_limit else {}
+    pool = KeyPool(translator_class.SERVICE, [{'key': f"bench-key-{i}"} for i in range(keys)], settings, ledger)
+    translator = translator_class(pool.keys[0].key, quota=pool, pool=pool)
+    translator.endpoint = server.endpoint_settings()['service_endpoints'][translator_class.SERVICE]
+    # Small requests, so there are enough of them to show the rate limits
+    translator.MAX_ITEMS = 10
+    server.stats.clear()
+    start = time.perf_counter()
+    translated = translator.translate_segments(segments, "German")
+    elapsed = time.perf_counter() - start
+    assert len(translated) == len(segments)
+    return elapsed, dict(server.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translation throughput against the service stand-in")
+    parser.add_argument("--segments", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.15, help="Seconds per answer")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of random 429 answers")
+    parser.add_argument("--rate-limit", type=float, default=5.0, help="Requests per second per key (0: none)")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 3], help="Pool sizes to compare")
+    args = parser.parse_args()
+
+    segments = make_segments(args.segments)
+    faults = Faults(latency=args.latency, throttle_rate=args.throttle_rate, rate_limit=args.rate_limit)
+    server = StandInServer(faults=faults).start()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            ledger = UsageLedger(os.path.join(folder, 'quota_usage.json'))
+            print(f"{len(segments)} segments, {args.latency:.2f} s latency, "
+                  f"{args.rate_limit or 'no'} requests/s per key")
+            for translator_class in (MicrosoftTranslator, GoogleTranslator):
+                for keys in args.keys:
+                    elapsed, stats = run(translator_class, server, segments, keys, ledger)
+                    print(f"\n{translator_class.SERVICE}, {keys} key(s): {elapsed:.2f} s, "
+                          f"{len(segments) / elapsed:.0f} segments/s")
+                    print(format_stats(stats))
+            ledger.flush()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
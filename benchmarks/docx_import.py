@@ -0,0 +1,98 @@
+"""
+Benchmark: streaming .docx reader vs python-docx on large generated documents.
+
+    python benchmarks/docx_import.py --pages 500 1000
+
+Writes synthetic documents (paragraphs plus a table every few pages) to a temporary
+folder and reports time and peak Python memory (tracemalloc) of both readers.
+"""
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.documents import iter_docx_blocks
+
+PARAGRAPHS_PER_PAGE = 12
+SENTENCE = "The quick brown fox jumps over the lazy dog while the narrator keeps reading. "
+
+CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                 '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                 '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                 '<Default Extension="xml" ContentType="application/xml"/>'
+                 '<Override PartName="/word/document.xml" '
+                 'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                 '</Types>')
+RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>')
+
+
+def paragraph_xml(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def write_docx(path, pages):
+    """Write a minimal but valid .docx with the given number of pages"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', RELS)
+        with archive.open('word/document.xml', 'w') as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+            for page in range(pages):
+                for n in range(PARAGRAPHS_PER_PAGE):
+                    f.write(paragraph_xml(f"Page {page + 1}, paragraph {n + 1}. " + SENTENCE * 4).encode('utf-8'))
+                if page % 5 == 4:
+                    row = '<w:tr>' + ''.join(f'<w:tc>{paragraph_xml(f"Cell {c}")}</w:tc>' for c in range(4)) + '</w:tr>'
+                    f.write(f'<w:tbl>{row * 3}</w:tbl>'.encode('utf-8'))
+            f.write(b'<w:sectPr/></w:body></w:document>')
+
+
+def measure(reader, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    chars = sum(len(block) for block in reader(path))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, chars
+
+
+def python_docx_blocks(path):
+    from docx import Document
+    return [para.text for para in Document(path).paragraphs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    try:
+        import docx  # noqa: F401
+        readers = [("streaming", iter_docx_blocks), ("python-docx", python_docx_blocks)]
+    except ImportError:
+        print("python-docx is not installed, measuring the streaming reader only")
+        readers = [("streaming", iter_docx_blocks)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'pages':>6} {'size MB':>8} {'reader':>12} {'time s':>8} {'peak MB':>8} {'chars':>10}")
+        for pages in args.pages:
+            path = os.path.join(folder, f"bench_{pages}.docx")
+            write_docx(path, pages)
+            size_mb = os.path.getsize(path) / 1e6
+            for name, reader in readers:
+                elapsed, peak, chars = measure(reader, path)
+                print(f"{pages:>6} {size_mb:>8.2f} {name:>12} {elapsed:>8.2f} {peak / 1e6:>8.1f} {chars:>10}")
+
+
+if __name__ == "__main__":
+    main()
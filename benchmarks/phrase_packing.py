@@ -0,0 +1,73 @@
+"""
+Benchmark: packed synthesis vs one Edge TTS request per phrase (needs network access).
+
+    python benchmarks/phrase_packing.py --phrases 200 --parallel 4
+
+Synthesizes the same short prompts both ways into a temporary folder and reports
+phrases per second, requests made and the size of the produced files.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.batch import synthesize_with_retries
+from core.packing import synthesize_phrases, group_phrases
+
+PROMPTS = ("Press one for sales", "Your call is important to us", "Please hold the line",
+           "Invalid selection, try again", "Goodbye", "Level complete", "New item unlocked",
+           "Checkpoint reached", "Game saved", "You have three new messages")
+
+
+def make_phrases(count):
+    return [f"{PROMPTS[i % len(PROMPTS)]}, number {i + 1}" for i in range(count)]
+
+
+async def per_phrase(phrases, folder, voice, parallel):
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def one(index, phrase):
+        async with semaphore:
+            size, _ = await synthesize_with_retries(phrase, voice, os.path.join(folder, f"single_{index}.mp3"))
+            return size
+
+    return await asyncio.gather(*(one(i, p) for i, p in enumerate(phrases)))
+
+
+async def packed(phrases, folder, voice, parallel):
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def one(pack):
+        async with semaphore:
+            sizes, _ = await synthesize_phrases([phrases[i] for i in pack],
+                                                [os.path.join(folder, f"packed_{i}.mp3") for i in pack], voice)
+            return sizes
+
+    results = await asyncio.gather(*(one(pack) for pack in group_phrases(phrases)))
+    return [size for sizes in results for size in sizes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=200)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--voice", default="en-US-AriaNeural")
+    args = parser.parse_args()
+
+    phrases = make_phrases(args.phrases)
+    requests = {"one request per phrase": len(phrases), "packed": len(group_phrases(phrases))}
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'mode':>24} {'requests':>9} {'time s':>8} {'phrases/s':>10} {'MB':>6}")
+        for name, runner in (("one request per phrase", per_phrase), ("packed", packed)):
+            started = time.perf_counter()
+            sizes = asyncio.run(runner(phrases, folder, args.voice, args.parallel))
+            elapsed = time.perf_counter() - started
+            print(f"{name:>24} {requests[name]:>9} {elapsed:>8.1f} {len(phrases) / elapsed:>10.1f} {sum(sizes) / 1e6:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
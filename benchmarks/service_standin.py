@@ -0,0 +1,344 @@
+"""
+Local stand-in for the translator and OCR services, for tests and benchmarks without keys or network.
+
+    python benchmarks/service_standin.py --port 8765 --latency 0.2 --throttle-rate 0.05
+    python benchmarks/service_standin.py --record cassette.json   # forward to the real services once
+    python benchmarks/service_standin.py --replay cassette.json   # answer from the recording
+
+It answers the requests of MicrosoftTranslator, GoogleTranslator and the Google Vision and
+Azure Computer Vision OCR calls, recognized by the end of the URL path, so any prefix works.
+Point the application at it in settings.json (the lines are printed at start):
+
+    "service_endpoints": {"Microsoft Translator": "http://127.0.0.1:8765/microsoft", ...},
+    "azure_endpoint": "http://127.0.0.1:8765/azure"
+
+Without a recording the answers are synthetic: a translation is the source text tagged with
+the target language, OCR finds one line naming the image size. --record forwards every
+request to the real service and saves its answer (never the key) under a hash of the
+request; --replay answers recorded requests from the file and the others synthetically (or
+404 with --strict). Latency, 500 errors, 429 throttling (random or over a per-key rate),
+rejected keys and the request size limits of the services apply in every mode.
+"""
+import os
+import sys
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.settings import SERVICE_ENDPOINTS
+from core.key_pool import TokenBucket
+
+# Route name -> (URL path suffix, service name in settings)
+ROUTES = {
+    'microsoft': ('/translate', "Microsoft Translator"),
+    'google_translate': ('/language/translate/v2', "Google Cloud Translate"),
+    'google_vision': ('/v1/images:annotate', "Google Vision API"),
+    'azure_ocr': ('/vision/v3.2/ocr', "Azure Computer Vision"),
+    'azure_analyze': ('/vision/v3.2/analyze', "Azure Computer Vision"),
+}
+# Request limits of the real services: texts or images per request, characters or bytes
+LIMITS = {
+    'microsoft': {'items': 1000, 'chars': 50000},
+    'google_translate': {'items': 128, 'chars': 30000},
+    'google_vision': {'items': 16, 'bytes': 20 * 2**20},
+    'azure_ocr': {'bytes': 4 * 2**20},
+    'azure_analyze': {'bytes': 4 * 2**20},
+}
+STANDIN_TEXT = "Stand-in OCR text"
+
+
+def match_route(path):
+    for name, (suffix, _) in ROUTES.items():
+        if path.endswith(suffix):
+            return name
+    return None
+
+
+class Faults:
+    """What the stand-in injects into its answers"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1,
+                 rate_limit=0.0, reject_keys=(), max_body=0):
+        self.latency = latency  # Seconds added to every answer
+        self.jitter = jitter  # Up to this many seconds more, uniformly random
+        self.error_rate = error_rate  # Share of requests answered 500
+        self.throttle_rate = throttle_rate  # Share of requests answered 429
+        self.retry_after = retry_after  # Retry-After of random 429 answers
+        self.rate_limit = rate_limit  # Requests per second per key before 429 (0: unlimited)
+        self.reject_keys = set(reject_keys)  # Keys answered 401
+        self.max_body = max_body  # Request bodies above this many bytes are answered 413 (0: no limit)
+
+
+class Cassette:
+    """Recorded answers by request hash in a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def fingerprint(route, params, body):
+        """Hash of route, parameters (the key left out) and body"""
+        query = sorted((name, value) for name, value in params.items() if name != 'key')
+        data = json.dumps([route, query]).encode('utf-8') + b'\n' + body
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, fingerprint):
+        with self._lock:
+            return self.entries.get(fingerprint)
+
+    def put(self, fingerprint, route, status, content_type, payload):
+        with self._lock:
+            self.entries[fingerprint] = {'route': route, 'status': status, 'content_type': content_type,
+                                         'body': payload.decode('utf-8', 'replace')}
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=1, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+
+
+def _json(status, data, headers=None):
+    return status, dict(headers or {}, **{'Content-Type': 'application/json'}), json.dumps(data).encode('utf-8')
+
+
+def synthetic_answer(route, params, body):
+    """(status, headers, body) the real service would give, with made-up content"""
+    data = json.loads(body or b'null') if route in ('microsoft', 'google_translate', 'google_vision') else None
+    if route == 'microsoft':
+        target = params.get('to', 'en')
+        return _json(200, [{'translations': [{'text': f"[{target}] {item.get('text', item.get('Text', ''))}",
+                                              'to': target}]} for item in data])
+    if route == 'google_translate':
+        texts = data['q'] if isinstance(data['q'], list) else [data['q']]
+        return _json(200, {'data': {'translations': [{'translatedText': f"[{data['target']}] {text}",
+                                                      'detectedSourceLanguage': 'und'} for text in texts]}})
+    if route == 'google_vision':
+        responses = []
+        for item in data['requests']:
+            size = len(base64.b64decode(item['image'].get('content', '')))
+            responses.append({'textAnnotations': [{'description': f"{STANDIN_TEXT} ({size} bytes)"}]})
+        return _json(200, {'responses': responses})
+    if route == 'azure_ocr':
+        words = [{'text': word} for word in f"{STANDIN_TEXT} ({len(body)} bytes)".split()]
+        return _json(200, {'language': 'en', 'orientation': 'Up', 'regions': [{'lines': [{'words': words}]}]})
+    return _json(200, {'categories': [], 'metadata': {'format': 'Png'}})
+
+
+def size_error(route, body):
+    """(status, headers, body) of a request over the service's limits, or None"""
+    limits = LIMITS.get(route, {})
+    if 'bytes' in limits and len(body) > limits['bytes']:
+        return _json(400, {'error': {'code': 'InvalidImageSize', 'message': 'Request is too large'}})
+    if route in ('microsoft', 'google_translate', 'google_vision'):
+        data = json.loads(body or b'null')
+        if route == 'microsoft':
+            items, chars = len(data), sum(len(item.get('text', item.get('Text', ''))) for item in data)
+        elif route == 'google_translate':
+            texts = data['q'] if isinstance(data['q'], list) else [data['q']]
+            items, chars = len(texts), sum(map(len, texts))
+        else:
+            items, chars = len(data['requests']), 0
+        if items > limits['items'] or chars > limits.get('chars', chars):
+            return _json(400, {'error': {'code': 400, 'message': f"Request over the limit: {items} items, {chars} characters"}})
+    return None
+
+
+class StandInServer(ThreadingHTTPServer):
+    """The stand-in; start() serves in a background thread, stop() shuts it down"""
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, faults=None, cassette=None, record=False, strict=False,
+                 azure_upstream=None):
+        super().__init__((host, port), StandInHandler)
+        self.faults = faults or Faults()
+        self.cassette = cassette
+        self.record = record
+        self.strict = strict
+        self.azure_upstream = (azure_upstream or '').rstrip('/')
+        self.stats = Counter()  # (route, status) -> answers
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def endpoint_settings(self):
+        """settings.json entries that send the application's requests here"""
+        return {
+            'service_endpoints': {
+                "Microsoft Translator": f"{self.url}/microsoft",
+                "Google Cloud Translate": f"{self.url}/google/language/translate/v2",
+                "Google Vision API": f"{self.url}/google/v1/images:annotate"
+            },
+            'azure_endpoint': f"{self.url}/azure"
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def _over_rate(self, key):
+        """Seconds to wait when key went over the per-key rate limit, else 0"""
+        if not self.faults.rate_limit:
+            return 0
+        with self._lock:
+            bucket = self._buckets.setdefault(key, TokenBucket(self.faults.rate_limit, max(1, self.faults.rate_limit)))
+            now = time.monotonic()
+            wait = bucket.delay(now)
+            if wait <= 0:
+                bucket.take(now)
+            return wait
+
+    def _upstream(self, route, path):
+        service = ROUTES[route][1]
+        if route in ('azure_ocr', 'azure_analyze'):
+            if not self.azure_upstream:
+                return None
+            return self.azure_upstream + ROUTES[route][0]
+        return SERVICE_ENDPOINTS[service] + ('/translate' if route == 'microsoft' else '')
+
+    def _forward(self, route, path, params, headers, body):
+        from core.http_client import get_client
+        url = self._upstream(route, path)
+        if url is None:
+            return _json(502, {'error': 'No upstream for this route (use --azure-upstream)'})
+        forward = {name: headers[name] for name in ('Content-Type', 'Ocp-Apim-Subscription-Key',
+                                                    'Ocp-Apim-Subscription-Region') if headers.get(name)}
+        response = get_client().request('POST', url, params=params, headers=forward, data=body, retries=0)
+        return response.status_code, {'Content-Type': response.headers.get('Content-Type', 'application/json')}, response.content
+
+    def answer(self, route, path, params, headers, body):
+        """(status, headers, body) for one request, faults included"""
+        faults = self.faults
+        delay = faults.latency + (random.uniform(0, faults.jitter) if faults.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        key = params.get('key') or headers.get('Ocp-Apim-Subscription-Key')
+        if not key or key in faults.reject_keys:
+            return _json(401, {'error': {'code': 401, 'message': 'Access denied due to invalid subscription key'}})
+        wait = self._over_rate(key)
+        if wait:
+            return _json(429, {'error': {'code': 429, 'message': 'Rate limit exceeded'}},
+                         {'Retry-After': str(max(1, round(wait)))})
+        if faults.throttle_rate and random.random() < faults.throttle_rate:
+            return _json(429, {'error': {'code': 429, 'message': 'Too many requests'}},
+                         {'Retry-After': str(faults.retry_after)})
+        if faults.error_rate and random.random() < faults.error_rate:
+            return _json(500, {'error': {'code': 500, 'message': 'Injected server error'}})
+        if faults.max_body and len(body) > faults.max_body:
+            return _json(413, {'error': {'code': 413, 'message': 'Payload too large'}})
+        error = size_error(route, body)
+        if error:
+            return error
+
+        if self.cassette is None:
+            return synthetic_answer(route, params, body)
+        fingerprint = Cassette.fingerprint(route, params, body)
+        if self.record:
+            status, answer_headers, payload = self._forward(route, path, params, headers, body)
+            if status < 500 and status != 429:
+                self.cassette.put(fingerprint, route, status, answer_headers['Content-Type'], payload)
+            return status, answer_headers, payload
+        entry = self.cassette.get(fingerprint)
+        if entry is not None:
+            return entry['status'], {'Content-Type': entry['content_type']}, entry['body'].encode('utf-8')
+        if self.strict:
+            return _json(404, {'error': 'Request not in the recording'})
+        return synthetic_answer(route, params, body)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real services
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        route = match_route(parts.path)
+        if route is None:
+            status, headers, payload = _json(404, {'error': f"Unknown endpoint {parts.path}"})
+        else:
+            try:
+                status, headers, payload = self.server.answer(route, parts.path, dict(parse_qsl(parts.query)),
+                                                              self.headers, body)
+            except (ValueError, KeyError, TypeError) as e:
+                status, headers, payload = _json(400, {'error': {'code': 400, 'message': f"Bad request: {e}"}})
+        with self.server._lock:
+            self.server.stats[(route or 'unknown', status)] += 1
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def format_stats(stats):
+    """'microsoft: 120x 200, 3x 429' per route"""
+    routes = {}
+    for (route, status), count in sorted(stats.items()):
+        routes.setdefault(route, []).append(f"{count}x {status}")
+    return '\n'.join(f"{route}: {', '.join(counts)}" for route, counts in routes.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many random seconds more")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered 500 (0-1)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered 429 (0-1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of random 429 answers (seconds)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second per key before 429")
+    parser.add_argument("--reject-key", action="append", default=[], help="Answer this key with 401 (repeatable)")
+    parser.add_argument("--max-body", type=int, default=0, help="Answer larger request bodies with 413 (bytes)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="FILE", help="Forward to the real services and save the answers")
+    mode.add_argument("--replay", metavar="FILE", help="Answer from a recording")
+    parser.add_argument("--strict", action="store_true", help="With --replay: 404 for requests not recorded")
+    parser.add_argument("--azure-upstream", help="Real Azure Computer Vision endpoint for --record")
+    args = parser.parse_args()
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.retry_after,
+                    args.rate_limit, args.reject_key, args.max_body)
+    cassette = Cassette(args.record or args.replay) if (args.record or args.replay) else None
+    server = StandInServer(args.host, args.port, faults, cassette, record=bool(args.record), strict=args.strict,
+                           azure_upstream=args.azure_upstream)
+    mode_name = "recording" if args.record else "replaying" if args.replay else "synthetic"
+    print(f"Stand-in ({mode_name}) at {server.url}; add to settings.json:")
+    print(json.dumps(server.endpoint_settings(), indent=2))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(format_stats(server.stats))
+
+
+if __name__ == "__main__":
+    main()
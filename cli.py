@@ -0,0 +1,370 @@
+"""
+OGI TTS v2.0 - headless batch converter.
+
+Converts .txt/.docx/.pdf/.epub files to speech without starting the Qt interface, e.g.:
+
+    python cli.py docs/ -o tts_audio -j 4 --summary summary.json
+    python cli.py book.epub --chapters      # tts_audio/book/001_<title>.wav ... + index.json
+    python cli.py corpus.txt --stream       # any size, read and written segment by segment
+
+Exit codes: 0 - all files converted, 1 - some files failed or manifest rows were invalid,
+2 - invalid arguments or no input files, 130 - interrupted.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from core.settings import load_settings
+from core.voices import LANGUAGES
+from core.documents import collect_documents
+from core.manifest import iter_manifest
+from core.batch import make_job, run_batch, job_record, measure_job, STATUS_DONE, STATUS_SKIPPED, STATUS_FAILED
+from core.batch_report import BatchReport
+from core.dedup import run_dedup_batch
+from core.packing import run_packed_batch
+from core.pipeline import run_pipeline_batch, STAGES, DEFAULT_QUEUE_SIZE, DEFAULT_MEMORY_BUDGET
+from core.chapters import render_chapters, chapter_record
+from core.audiobook import assemble_mp3, assemble_book, AssemblyError
+from core.audio_index import index_tree
+from core.streaming import stream_to_file, LARGE_TEXT_BYTES
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def default_output_dir():
+    """tts_audio next to the executable or main.py, same as the GUI"""
+    if getattr(sys, 'frozen', False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, 'tts_audio')
+
+
+def build_parser():
+    settings = load_settings()
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Convert .txt/.docx/.pdf/.epub files to speech with Edge TTS (no GUI).")
+    parser.add_argument("inputs", nargs="*", help="Input files or directories")
+    parser.add_argument("-m", "--manifest", action="append", default=[],
+                        help="CSV/JSONL manifest with one job per row (id,text,language,voice,rate,volume,pitch,output); repeatable")
+    parser.add_argument("-o", "--output-dir", default=default_output_dir(),
+                        help="Output directory (default: tts_audio)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("-j", "--parallel", type=int, default=2, help="Number of files synthesized concurrently (default: 2)")
+    parser.add_argument("--language", choices=LANGUAGES, help="Force language instead of auto detection")
+    parser.add_argument("--voice", help='Edge voice name (en-US-AriaNeural), batch label ("Female (Aria)") or male/female')
+    parser.add_argument("--speed", type=float, default=settings.get('voice_speed', 1.0), help="0.5 to 2.0 (default: saved setting)")
+    parser.add_argument("--volume", type=int, default=settings.get('voice_volume', 100), help="0 to 100 (default: saved setting)")
+    parser.add_argument("--pitch", type=int, default=settings.get('voice_pitch', 0), help="-50 to 50 Hz (default: saved setting)")
+    parser.add_argument("--format", choices=["wav", "mp3"], default="wav",
+                        help="Output file extension; the audio is the MP3 stream returned by Edge TTS (default: wav, as in the GUI)")
+    parser.add_argument("--skip-existing", action="store_true", help="Skip inputs whose output file is newer than the input")
+    parser.add_argument("--retries", type=int, default=2, help="Synthesis retries per file on errors (default: 2)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Synthesize paragraphs repeated across files only once and assemble outputs from shared segments")
+    parser.add_argument("--pack", action="store_true",
+                        help="Synthesize many short texts (prompts, one-liners) per request and split the audio per file")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run reading, language detection, synthesis and writing as separate stages "
+                             "connected by bounded queues, with a memory budget")
+    parser.add_argument("--stage", action="append", default=[], metavar="NAME=N",
+                        help=f"With --pipeline: workers of a stage ({', '.join(STAGES)}); repeatable")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"With --pipeline: items queued in front of each stage (default: {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 2**20,
+                        help="With --pipeline: text/audio buffered between stages before reading pauses "
+                             f"(default: {DEFAULT_MEMORY_BUDGET // 2**20})")
+    parser.add_argument("--chapters", action="store_true",
+                        help="Split documents at headings (.docx) or spine items (.epub) into one file per chapter "
+                             "in a folder per document, with index.json; unchanged chapters are not rendered again")
+    parser.add_argument("--force", action="store_true", help="With --chapters: render unchanged chapters again too")
+    parser.add_argument("--assemble", action="store_true",
+                        help="Join the outputs into one MP3 with chapter markers (no re-encoding): <book>.mp3 per "
+                             "document with --chapters, otherwise audiobook.mp3 from all converted files in input order")
+    parser.add_argument("--stream", action="store_true",
+                        help="Convert .txt inputs segment by segment straight from disk with bounded memory "
+                             f"(always used for .txt files of {LARGE_TEXT_BYTES // 2**20} MB or more)")
+    parser.add_argument("--index-audio", action="store_true",
+                        help="Only measure the audio files under the output directory (exact duration from frame "
+                             "headers, cached in .audio_index.json) and print them")
+    parser.add_argument("--summary", help="Write a JSON summary to this file ('-' for stdout)")
+    parser.add_argument("--no-report", action="store_true", help="Do not write batch_report_*.csv/json to the output directory")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print errors")
+    return parser
+
+
+def is_up_to_date(input_file, output_file):
+    try:
+        return os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+    except OSError:
+        return False
+
+
+def write_summary(path, summary):
+    data = json.dumps(summary, indent=2, ensure_ascii=False)
+    if path == '-':
+        print(data)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+
+
+async def render_books(books, args, report, on_job_done):
+    """--chapters: render every document into its own folder of chapter files, one book at a time"""
+    for job in books:
+        started = time.monotonic()
+
+        def on_chapter_done(entry, job=job):
+            report.add(chapter_record(job['input'], job['output'], entry))
+            if entry['status'] == STATUS_FAILED:
+                print(f"FAILED {job['input']} chapter {entry['number']}: {entry['error']}", file=sys.stderr)
+            elif not args.quiet:
+                print(f"{entry['status']:9} {job['input']} #{entry['number']} -> {entry['file']} "
+                      f"({entry['chars']} chars, {entry['seconds']:.1f}s)")
+
+        try:
+            index = await render_chapters(job['input'], job['output'], voice=job['voice'], language=job['language'],
+                                          speed=args.speed, volume=args.volume, pitch=args.pitch,
+                                          parallelism=args.parallel, retries=args.retries, extension=args.format,
+                                          force=args.force, on_chapter_done=on_chapter_done)
+            chapters = index['chapters']
+            failed = sum(1 for entry in chapters if entry['status'] == STATUS_FAILED)
+            job['voice'] = index['voice']
+            job['chars'] = sum(entry['chars'] for entry in chapters)
+            job['bytes'] = sum(entry['bytes'] for entry in chapters)
+            job['retries'] = sum(entry['retries'] for entry in chapters)
+            if failed:
+                job['status'] = STATUS_FAILED
+                job['error'] = f"{failed} of {len(chapters)} chapters failed"
+            elif chapters:
+                job['status'] = STATUS_DONE
+            else:
+                job['status'] = STATUS_SKIPPED
+                job['error'] = "Empty document"
+        except Exception as e:
+            job['status'] = STATUS_FAILED
+            job['error'] = str(e)
+        job['seconds'] = round(time.monotonic() - started, 3)
+        on_job_done(job)
+
+
+async def render_streams(streams, args, on_job_done):
+    """Huge .txt inputs: one file at a time, its segments synthesized -j at a time"""
+    for job in streams:
+        started = time.monotonic()
+        try:
+            result = await stream_to_file(job['input'], job['output'], voice=job['voice'], language=job['language'],
+                                          speed=args.speed, volume=args.volume, pitch=args.pitch,
+                                          parallelism=args.parallel, retries=args.retries)
+            job['voice'] = result['voice']
+            job['chars'] = result['chars']
+            job['bytes'] = result['bytes']
+            if result['segments']:
+                job['status'] = STATUS_DONE
+            else:
+                job['status'] = STATUS_SKIPPED
+                job['error'] = "Empty document"
+        except Exception as e:
+            job['status'] = STATUS_FAILED
+            job['error'] = str(e)
+        job['seconds'] = round(time.monotonic() - started, 3)
+        on_job_done(job)
+
+
+def print_audio_index(output_dir, quiet=False):
+    """--index-audio: durations of everything in the output directory"""
+    total = 0.0
+    count = 0
+    errors = 0
+    for path, info, error in index_tree(output_dir):
+        if error:
+            errors += 1
+            print(f"UNREADABLE {path}: {error}", file=sys.stderr)
+            continue
+        count += 1
+        total += info.duration
+        if not quiet:
+            print(f"{info.duration:10.2f}s {info.format:3} {info.sample_rate:6} Hz {info.bitrate // 1000:4} kbps  "
+                  f"{os.path.relpath(path, output_dir)}")
+    if not quiet:
+        print(f"{count} files, {total / 3600:.2f} h of audio")
+    return EXIT_FAILED if errors else EXIT_OK
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+    if args.dedup and args.pack:
+        parser.error("--dedup and --pack cannot be combined")
+    if args.chapters and (args.dedup or args.pack):
+        parser.error("--chapters cannot be combined with --dedup or --pack")
+    if args.pipeline and (args.dedup or args.pack):
+        parser.error("--pipeline cannot be combined with --dedup or --pack")
+    concurrency = {}
+    for option in args.stage:
+        name, _, value = option.partition('=')
+        if name not in STAGES or not value.isdigit() or int(value) < 1:
+            parser.error(f"--stage expects NAME=N with NAME one of {', '.join(STAGES)}, got {option!r}")
+        concurrency[name] = int(value)
+
+    if args.index_audio:
+        if not os.path.isdir(args.output_dir):
+            parser.error(f"{args.output_dir} is not a directory")
+        return print_audio_index(args.output_dir, args.quiet)
+
+    documents = collect_documents(args.inputs, recursive=args.recursive)
+    if not documents and not args.manifest:
+        print("No .txt/.docx/.pdf/.epub input files found", file=sys.stderr)
+        return EXIT_USAGE
+
+    jobs = []
+    books = []
+    streams = []
+    skipped = []
+    for file_path, relative_name in documents:
+        streamed = file_path.lower().endswith('.txt') and (args.stream or os.path.getsize(file_path) >= LARGE_TEXT_BYTES)
+        if args.chapters and not streamed:
+            # Output is the book folder; chapter files are kept up to date through its index.json
+            book_dir = os.path.join(args.output_dir, os.path.splitext(relative_name)[0])
+            books.append(make_job(file_path, book_dir, language=args.language, voice=args.voice))
+            continue
+        output_file = os.path.join(args.output_dir, os.path.splitext(relative_name)[0] + '.' + args.format)
+        job = make_job(file_path, output_file, language=args.language, voice=args.voice)
+        if args.skip_existing and is_up_to_date(file_path, output_file):
+            job['status'] = "up-to-date"
+            skipped.append(job)
+            continue
+        (streams if streamed else jobs).append(job)
+
+    invalid = 0
+    for manifest in args.manifest:
+        # Manifest rows carry their own language/voice/settings; --language/--voice apply to documents
+        try:
+            for item, error in iter_manifest(manifest):
+                if error:
+                    invalid += 1
+                    print(f"INVALID {manifest} {error}", file=sys.stderr)
+                    continue
+                output_file = os.path.join(args.output_dir, item.output_name)
+                job = make_job(manifest, output_file, language=item.language, voice=item.voice,
+                               speed=item.speed, volume=item.volume, pitch=item.pitch,
+                               text_offset=item.text_offset, text_column=item.text_column)
+                if args.skip_existing and is_up_to_date(manifest, output_file):
+                    job['status'] = "up-to-date"
+                    skipped.append(job)
+                    continue
+                jobs.append(job)
+        except (OSError, ValueError) as e:
+            print(f"Invalid manifest {manifest}: {e}", file=sys.stderr)
+            return EXIT_USAGE
+
+    def on_job_done(job):
+        if job['status'] == STATUS_FAILED:
+            print(f"FAILED {job['input']}: {job['error']}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{job['status']:8} {job['input']} -> {job['output']} ({job['chars']} chars, {job['seconds']:.1f}s)")
+
+    report = BatchReport()
+    started = time.time()
+    try:
+        if books:
+            asyncio.run(render_books(books, args, report, on_job_done))
+        if streams:
+            asyncio.run(render_streams(streams, args, on_job_done))
+        if args.dedup:
+            stats = asyncio.run(run_dedup_batch(jobs, parallelism=args.parallel, speed=args.speed,
+                                                volume=args.volume, pitch=args.pitch, retries=args.retries,
+                                                on_job_done=on_job_done))
+            report.stats.update(stats.as_dict())
+        elif args.pack:
+            asyncio.run(run_packed_batch(jobs, parallelism=args.parallel, speed=args.speed,
+                                         volume=args.volume, pitch=args.pitch, retries=args.retries,
+                                         on_job_done=on_job_done))
+        elif args.pipeline:
+            pipeline_stats = []
+            asyncio.run(run_pipeline_batch(jobs, parallelism=args.parallel, speed=args.speed,
+                                           volume=args.volume, pitch=args.pitch, retries=args.retries,
+                                           on_job_done=on_job_done, on_stats=pipeline_stats.append,
+                                           concurrency=concurrency, queue_size=args.queue_size,
+                                           memory_budget=args.memory_mb * 2**20))
+            if pipeline_stats:
+                # The stage with the deepest queue in front of it is the bottleneck
+                max_queued = {stage: max(stats['queued'][stage] for stats in pipeline_stats)
+                              for stage in pipeline_stats[-1]['queued']}
+                report.stats['pipeline_max_queued'] = max_queued
+                report.stats['pipeline_memory_peak'] = pipeline_stats[-1]['memory_peak']
+                if not args.quiet:
+                    print("Pipeline max queued: " + ', '.join(f"{stage} {depth}" for stage, depth in max_queued.items())
+                          + f" | peak {pipeline_stats[-1]['memory_peak'] / 2**20:.0f} MB buffered")
+        else:
+            asyncio.run(run_batch(jobs, parallelism=args.parallel, speed=args.speed,
+                                  volume=args.volume, pitch=args.pitch, retries=args.retries,
+                                  on_job_done=on_job_done))
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    report.finish()
+
+    assembled = []
+    if args.assemble:
+        try:
+            for job in books:
+                if job['status'] == STATUS_DONE:
+                    assembled.append(assemble_book(job['output']))
+            done = [job for job in streams + jobs if job['status'] == STATUS_DONE]
+            if done:
+                assembled.append(assemble_mp3([(job['output'], os.path.splitext(os.path.basename(job['input']))[0])
+                                               for job in done], os.path.join(args.output_dir, 'audiobook.mp3')))
+        except (OSError, AssemblyError) as e:
+            print(f"Assembly failed: {e}", file=sys.stderr)
+            return EXIT_FAILED
+        if not args.quiet:
+            for result in assembled:
+                print(f"Assembled {result['output']} ({len(result['chapters'])} chapters, {result['duration']:.0f}s)")
+
+    all_jobs = books + streams + jobs + skipped
+    for job in streams + jobs:
+        measure_job(job)
+        report.add(job_record(job))
+    for job in all_jobs:
+        job.pop('queued_at')  # Monotonic clock value, meaningless outside this run
+    failed = sum(1 for job in all_jobs if job['status'] == STATUS_FAILED)
+    summary = {
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+        'elapsed_seconds': round(time.time() - started, 3),
+        'parallel': args.parallel,
+        'total': len(all_jobs),
+        'converted': sum(1 for job in all_jobs if job['status'] == STATUS_DONE),
+        'failed': failed,
+        'invalid_rows': invalid,
+        'skipped': len(all_jobs) - failed - sum(1 for job in all_jobs if job['status'] == STATUS_DONE),
+        'performance': report.aggregate(),
+        'assembled': assembled,
+        'files': all_jobs
+    }
+    if report.records and not args.no_report:
+        csv_path, json_path = report.export(args.output_dir)
+        summary['report'] = {'csv': csv_path, 'json': json_path}
+    if args.summary:
+        write_summary(args.summary, summary)
+    if not args.quiet:
+        print(f"Converted {summary['converted']}/{summary['total']} files, "
+              f"{failed} failed, {summary['skipped']} skipped in {summary['elapsed_seconds']:.1f}s")
+        if report.records:
+            print(report.summary_text())
+
+    return EXIT_FAILED if failed or invalid else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Audio duration and metadata index built from file headers, without decoding.
+
+MP3 streams (what Edge TTS writes, also under a .wav name) are measured by walking
+their frame headers, which gives the exact duration and a seek table of frame offsets.
+RIFF/WAVE files are measured from their fmt/data chunk headers. The format is taken
+from the file contents, not the extension. Results are cached by path, size and
+modification time, in memory and optionally in a JSON file in the scanned folder.
+Nothing in this module imports PyQt5.
+"""
+import os
+import json
+import mmap
+import struct
+from core.mp3 import iter_frames, parse_info_tag
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav')
+INDEX_CACHE_FILE = '.audio_index.json'
+# Distance between seek table entries, in seconds of audio
+SEEK_INTERVAL = 1.0
+
+_WAVE_FORMATS = {1: 'pcm', 3: 'float', 0xFFFE: 'extensible'}
+
+
+class AudioInfo:
+    """Duration and layout of one audio file"""
+    __slots__ = ('path', 'format', 'duration', 'sample_rate', 'channels', 'bitrate', 'frames',
+                 'size', 'mtime_ns', 'data_offset', 'block_align', 'seek_table')
+
+    def __init__(self, path, format, duration=0.0, sample_rate=0, channels=0, bitrate=0, frames=0,
+                 size=0, mtime_ns=0, data_offset=0, block_align=0, seek_table=None):
+        self.path = path
+        self.format = format  # 'mp3' or 'wav'
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bitrate = bitrate  # Average, bits per second
+        self.frames = frames  # MP3 frames or PCM sample frames
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.data_offset = data_offset  # First audio byte
+        self.block_align = block_align  # PCM bytes per sample frame
+        self.seek_table = seek_table or []  # MP3: [seconds, byte offset] every SEEK_INTERVAL
+
+    def seek_offset(self, seconds):
+        """Byte offset to start reading at to play from `seconds` (frame or sample aligned)"""
+        if self.format == 'wav':
+            frame = min(int(seconds * self.sample_rate), self.frames)
+            return self.data_offset + frame * self.block_align
+        offset = self.data_offset
+        for time, frame_offset in self.seek_table:
+            if time > seconds:
+                break
+            offset = frame_offset
+        return offset
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+def index_mp3(data):
+    """(duration, sample rate, channels, frames, first frame offset, seek table) of an MP3 stream.
+
+    Encoder delay and padding from a LAME tag are subtracted from the duration.
+    """
+    samples = 0
+    frames = 0
+    sample_rate = 0
+    channels = 0
+    data_offset = None
+    trimmed = 0
+    seek_table = []
+    next_seek = 0.0
+    for frame in iter_frames(data):
+        if data_offset is None:
+            info = parse_info_tag(data, frame)
+            if info is not None:
+                trimmed = (info['delay'] or 0) + (info['padding'] or 0)
+                continue
+            data_offset = frame.offset
+            sample_rate = frame.sample_rate
+            channels = 1 if data[frame.offset + 3] >> 6 == 3 else 2
+        time = samples / frame.sample_rate
+        if time >= next_seek:
+            seek_table.append([round(time, 3), frame.offset])
+            next_seek += SEEK_INTERVAL
+        samples += frame.samples
+        frames += 1
+    if not frames:
+        raise ValueError("no MPEG audio frames found")
+    duration = max(0, samples - trimmed) / sample_rate
+    return duration, sample_rate, channels, frames, data_offset, seek_table
+
+
+def read_wav_header(f):
+    """Parse RIFF/WAVE chunk headers of an open binary file.
+
+    Returns (format name, sample rate, channels, bits per sample, block align, data offset,
+    data size) or None when the file is not RIFF/WAVE. Raises ValueError for WAVE files
+    without fmt/data chunks or with a compressed format.
+    """
+    f.seek(0)
+    header = f.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise ValueError("WAVE file has no data chunk")
+        chunk_id, chunk_size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+        if chunk_id == b'fmt ':
+            body = f.read(chunk_size + (chunk_size & 1))
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+            if format_tag not in _WAVE_FORMATS:
+                raise ValueError(f"unsupported WAVE format 0x{format_tag:04x}")
+            fmt = (_WAVE_FORMATS[format_tag], sample_rate, channels, bits, block_align)
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAVE data chunk before fmt chunk")
+            data_offset = f.tell()
+            # Streamed WAVs may leave the size unset (0 or 0xFFFFFFFF): use the file size
+            file_size = os.fstat(f.fileno()).st_size
+            if chunk_size in (0, 0xFFFFFFFF) or data_offset + chunk_size > file_size:
+                chunk_size = file_size - data_offset
+            return fmt + (data_offset, chunk_size)
+        else:
+            f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+def probe_audio(path):
+    """Index one file; raises ValueError when it is neither MP3 nor PCM WAVE"""
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        wav = read_wav_header(f)
+        if wav is not None:
+            format_name, sample_rate, channels, bits, block_align, data_offset, data_size = wav
+            frames = data_size // block_align if block_align else 0
+            return AudioInfo(path, 'wav', duration=frames / sample_rate if sample_rate else 0.0,
+                             sample_rate=sample_rate, channels=channels, bitrate=sample_rate * block_align * 8,
+                             frames=frames, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                             data_offset=data_offset, block_align=block_align)
+        if stat.st_size == 0:
+            raise ValueError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            duration, sample_rate, channels, frames, data_offset, seek_table = index_mp3(data)
+    return AudioInfo(path, 'mp3', duration=duration, sample_rate=sample_rate, channels=channels,
+                     bitrate=int((stat.st_size - data_offset) * 8 / duration) if duration else 0,
+                     frames=frames, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                     data_offset=data_offset, seek_table=seek_table)
+
+
+class AudioIndex:
+    """AudioInfo cache keyed by absolute path, valid while size and mtime stay the same"""
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.changed = False
+        if cache_file:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = {path: AudioInfo.from_dict(entry) for path, entry in data.items()}
+        except (OSError, ValueError, TypeError, KeyError):
+            self.entries = {}
+
+    def save(self):
+        """Write the cache file if anything changed since it was loaded"""
+        if not self.cache_file or not self.changed:
+            return
+        temp_path = self.cache_file + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({path: info.as_dict() for path, info in self.entries.items()}, f)
+        os.replace(temp_path, self.cache_file)
+        self.changed = False
+
+    def get(self, path):
+        """AudioInfo of path, from the cache when the file has not changed"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        info = self.entries.get(path)
+        if info is not None and info.size == stat.st_size and info.mtime_ns == stat.st_mtime_ns:
+            return info
+        info = probe_audio(path)
+        self.entries[path] = info
+        self.changed = True
+        return info
+
+    def scan(self, root, extensions=AUDIO_EXTENSIONS):
+        """Yield (path, AudioInfo or None, error or None) for every audio file under root"""
+        seen = set()
+        for folder, _, files in os.walk(root):
+            for name in sorted(files):
+                if not name.lower().endswith(extensions) or name.endswith('.part'):
+                    continue
+                path = os.path.abspath(os.path.join(folder, name))
+                seen.add(path)
+                try:
+                    yield path, self.get(path), None
+                except (OSError, ValueError) as e:
+                    yield path, None, str(e)
+        # Forget files under root that no longer exist
+        prefix = os.path.join(os.path.abspath(root), '')
+        for path in [path for path in self.entries if path.startswith(prefix) and path not in seen]:
+            del self.entries[path]
+            self.changed = True
+
+
+def index_tree(root, cache=True):
+    """Index every audio file under root, reusing and updating root/.audio_index.json"""
+    index = AudioIndex(os.path.join(root, INDEX_CACHE_FILE) if cache else None)
+    results = list(index.scan(root))
+    index.save()
+    return results
+
+
+_memory_index = AudioIndex()
+
+
+def audio_duration(path):
+    """Exact duration of an audio file in seconds, None if it cannot be read"""
+    try:
+        return _memory_index.get(path).duration
+    except (OSError, ValueError):
+        return None
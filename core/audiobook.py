@@ -0,0 +1,222 @@
+"""
+Audiobook assembly: joins the MP3 streams written by synthesis into one file by copying
+frames as they are (no decoding or re-encoding) and adds ID3v2 chapter markers
+(CHAP/CTOC) so players can jump between chapters.
+
+Inputs are scanned for frame boundaries first; their ID3 tags and Xing/Info frames are
+dropped and the audio frame runs are copied with os.copy_file_range/os.sendfile where
+the platform supports it, so assembly runs at disk speed. A fresh Info frame carries
+the frame count and, when the first and last inputs have a LAME tag, their encoder
+delay and padding so gapless players trim the joined stream like the originals.
+Joins between inputs are frame exact but keep each input's own padding; removing it
+would need a decode. Nothing in this module imports PyQt5.
+"""
+import os
+import sys
+import mmap
+from core.mp3 import iter_frames, parse_info_tag, build_info_frame, same_stream_format
+from core.chapters import load_index, STATUS_UNCHANGED
+from core.batch import STATUS_DONE
+
+# ID3v2.3 CTOC frames list at most 255 children; longer books get nested tables
+_CTOC_MAX_ENTRIES = 255
+_NO_OFFSET = b'\xff\xff\xff\xff'
+_COPY_CHUNK = 1024 * 1024
+
+
+class AssemblyError(Exception):
+    """Inputs cannot be joined by stream copy"""
+
+
+class AudioPart:
+    """Frame runs of one input file and their timing"""
+    __slots__ = ('path', 'title', 'ranges', 'frames', 'samples', 'sample_rate', 'size', 'header', 'info')
+
+    def __init__(self, path, title):
+        self.path = path
+        self.title = title
+        self.ranges = []  # (offset, length) of consecutive audio frames
+        self.frames = 0
+        self.samples = 0
+        self.sample_rate = 0
+        self.size = 0
+        self.header = None  # First audio frame header
+        self.info = None  # Xing/Info tag of the input, if any
+
+
+def scan_part(path, title=None):
+    """Find the audio frames of an MP3 file without reading it into memory"""
+    part = AudioPart(path, title or os.path.splitext(os.path.basename(path))[0])
+    if os.path.getsize(path) == 0:
+        return part
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for frame in iter_frames(data):
+            if part.header is None:
+                info = parse_info_tag(data, frame)
+                if info is not None:
+                    part.info = info  # Tag frame of the input, replaced by our own
+                    continue
+                part.header = bytes(data[frame.offset:frame.offset + 4])
+            elif not same_stream_format(data, frame.offset, part.header, 0):
+                raise AssemblyError(f"{path}: frame format changes at byte {frame.offset}")
+            if part.ranges and sum(part.ranges[-1]) == frame.offset:
+                part.ranges[-1] = (part.ranges[-1][0], part.ranges[-1][1] + frame.length)
+            else:
+                part.ranges.append((frame.offset, frame.length))
+            part.frames += 1
+            part.samples += frame.samples
+            part.sample_rate = frame.sample_rate
+            part.size += frame.length
+    return part
+
+
+def _text_frame(frame_id, text):
+    """ID3v2.3 text frame; UTF-16 keeps Cyrillic and Japanese titles intact"""
+    body = b'\x01' + text.encode('utf-16') + b'\x00\x00'
+    return frame_id + len(body).to_bytes(4, 'big') + b'\x00\x00' + body
+
+
+def _frame(frame_id, body):
+    return frame_id + len(body).to_bytes(4, 'big') + b'\x00\x00' + body
+
+
+def _syncsafe(size):
+    return bytes((size >> 21 & 0x7F, size >> 14 & 0x7F, size >> 7 & 0x7F, size & 0x7F))
+
+
+def build_chapter_tag(chapters, title=None):
+    """ID3v2.3 tag with a CTOC table and one CHAP frame per (title, start ms, end ms)"""
+    frames = []
+    if title:
+        frames.append(_text_frame(b'TIT2', title))
+    ids = [f"ch{number}".encode('ascii') for number in range(len(chapters))]
+    for element_id, (chapter_title, start, end) in zip(ids, chapters):
+        body = (element_id + b'\x00' + int(start).to_bytes(4, 'big') + int(end).to_bytes(4, 'big')
+                + _NO_OFFSET + _NO_OFFSET + _text_frame(b'TIT2', chapter_title))
+        frames.append(_frame(b'CHAP', body))
+
+    def toc(element_id, children, top_level):
+        # Flags: 0x02 ordered, 0x01 top-level
+        body = element_id + b'\x00' + bytes((0x03 if top_level else 0x02, len(children)))
+        return _frame(b'CTOC', body + b''.join(child + b'\x00' for child in children))
+
+    if len(ids) <= _CTOC_MAX_ENTRIES:
+        frames.append(toc(b'toc', ids, True))
+    else:
+        groups = [ids[i:i + _CTOC_MAX_ENTRIES] for i in range(0, len(ids), _CTOC_MAX_ENTRIES)]
+        group_ids = [f"toc{number}".encode('ascii') for number in range(len(groups))]
+        frames.append(toc(b'toc', group_ids, True))
+        frames.extend(toc(group_id, group, False) for group_id, group in zip(group_ids, groups))
+    body = b''.join(frames)
+    return b'ID3\x03\x00\x00' + _syncsafe(len(body)) + body
+
+
+def copy_range(src, dst, offset, count):
+    """Append count bytes from offset of src to dst, inside the kernel when the OS allows it.
+
+    dst must be unbuffered (open(..., 'wb', buffering=0)) so its file position is exact.
+    """
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count:
+                copied = os.copy_file_range(src_fd, dst_fd, count, offset)
+                if not copied:
+                    break
+                offset += copied
+                count -= copied
+        except OSError:
+            pass  # Cross-device or unsupported file system: try the next method
+    if count and sys.platform.startswith('linux'):
+        try:
+            while count:
+                copied = os.sendfile(dst_fd, src_fd, offset, count)
+                if not copied:
+                    break
+                offset += copied
+                count -= copied
+        except OSError:
+            pass
+    if count:
+        src.seek(offset)
+        while count:
+            chunk = src.read(min(count, _COPY_CHUNK))
+            if not chunk:
+                raise AssemblyError(f"{src.name} is shorter than expected")
+            dst.write(chunk)
+            count -= len(chunk)
+
+
+def assemble_mp3(parts, output_file, title=None, chapter_markers=True):
+    """Join MP3 files into output_file by frame copy; parts are (path, chapter title or None).
+
+    Returns a summary dict: duration in seconds, size in bytes and the chapter list
+    (title, start/end in seconds). Empty inputs are skipped. Raises AssemblyError when the
+    inputs differ in sample rate, channel mode or MPEG version.
+    """
+    scanned = [scan_part(path, part_title) for path, part_title in parts]
+    scanned = [part for part in scanned if part.frames]
+    if not scanned:
+        raise AssemblyError("No audio frames to assemble")
+    first = scanned[0]
+    for part in scanned[1:]:
+        if not same_stream_format(part.header, 0, first.header, 0) or part.sample_rate != first.sample_rate:
+            raise AssemblyError(f"{part.path} has a different audio format than {first.path}")
+
+    # Gapless info is only meaningful when both ends carry a LAME tag
+    first_info, last_info = first.info or {}, scanned[-1].info or {}
+    encoder = first_info.get('encoder') if last_info.get('encoder') else None
+    delay = (first_info.get('delay') or 0) if encoder else 0
+    padding = (last_info.get('padding') or 0) if encoder else 0
+
+    sample_rate = first.sample_rate
+    chapters = []
+    position = 0
+    for part in scanned:
+        start = max(0, position - delay)
+        position += part.samples
+        chapters.append((part.title, start / sample_rate, max(0, position - delay) / sample_rate))
+    total_frames = sum(part.frames for part in scanned)
+    audio_size = sum(part.size for part in scanned)
+    info_frame = build_info_frame(first.header, total_frames, 0, encoder, delay, padding)
+    info_frame = build_info_frame(first.header, total_frames, len(info_frame) + audio_size, encoder, delay, padding)
+    tag = b''
+    if chapter_markers:
+        tag = build_chapter_tag([(name, round(start * 1000), round(end * 1000)) for name, start, end in chapters],
+                                title)
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    temp_file = output_file + '.part'
+    with open(temp_file, 'wb', buffering=0) as out:
+        out.write(tag)
+        out.write(info_frame)
+        for part in scanned:
+            with open(part.path, 'rb') as src:
+                for offset, length in part.ranges:
+                    copy_range(src, out, offset, length)
+    os.replace(temp_file, output_file)
+    return {
+        'output': output_file,
+        'duration': round(max(0, position - delay - padding) / sample_rate, 3),
+        'bytes': len(tag) + len(info_frame) + audio_size,
+        'chapters': [{'title': name, 'start': round(start, 3), 'end': round(end, 3)}
+                     for name, start, end in chapters]
+    }
+
+
+def assemble_book(book_dir, output_file=None, title=None):
+    """Join the chapter files of a core.chapters book folder into <book_dir>.mp3 with chapter markers"""
+    index = load_index(book_dir)
+    if not index:
+        raise AssemblyError(f"{book_dir} has no chapter index")
+    entries = index['chapters']
+    missing = [entry['number'] for entry in entries if entry['status'] not in (STATUS_DONE, STATUS_UNCHANGED)]
+    if missing:
+        raise AssemblyError(f"Chapters {', '.join(map(str, missing))} are not rendered")
+    if output_file is None:
+        output_file = book_dir.rstrip('/\\') + '.mp3'
+    title = title or os.path.basename(book_dir.rstrip('/\\'))
+    return assemble_mp3([(os.path.join(book_dir, entry['file']), entry['title']) for entry in entries],
+                        output_file, title=title)
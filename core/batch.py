@@ -0,0 +1,148 @@
+"""
+Headless batch conversion: runs import, language detection, voice resolution and
+synthesis for many files with bounded parallelism.
+Nothing in this module imports PyQt5.
+"""
+import os
+import time
+import asyncio
+from core.documents import read_document
+from core.voices import detect_language, resolve_voice
+from core.synthesis import synthesize_to_file
+from core.batch_report import make_record
+from core.audio_index import audio_duration as probe_duration
+
+STATUS_DONE = "done"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+def make_job(file_path, output_file, language=None, voice=None, model="Edge TTS",
+             speed=None, volume=None, pitch=None, text_offset=None, text_column=None):
+    """Create a batch job dictionary; language/voice of None are resolved at run time.
+
+    speed/volume/pitch of None use the run-wide settings; text_offset marks a manifest
+    row whose text is read from file_path at that byte offset, from CSV column text_column
+    (see core.manifest).
+    """
+    return {
+        'input': file_path,
+        'output': output_file,
+        'model': model,
+        'language': language,
+        'voice': voice,
+        'speed': speed,
+        'volume': volume,
+        'pitch': pitch,
+        'text_offset': text_offset,
+        'text_column': text_column,
+        'status': None,
+        'error': None,
+        'chars': 0,
+        'bytes': 0,
+        'seconds': 0.0,
+        'queued_at': None,
+        'queue_wait': 0.0,
+        'retries': 0,
+        'duration': None
+    }
+
+
+def load_job_text(job, ocr=None):
+    """Text of a job: a whole document, or one manifest row (ocr is used for scanned PDF pages)"""
+    if job.get('text_offset') is not None:
+        from core.manifest import read_manifest_text
+        return read_manifest_text(job['input'], job['text_offset'], job.get('text_column'))
+    return read_document(job['input'], ocr=ocr)
+
+
+def job_settings(job, speed=1.0, volume=100, pitch=0):
+    """(speed, volume, pitch) of a job, falling back to the run-wide values"""
+    return (job['speed'] if job.get('speed') is not None else speed,
+            job['volume'] if job.get('volume') is not None else volume,
+            job['pitch'] if job.get('pitch') is not None else pitch)
+
+
+async def retry_async(factory, retries=2):
+    """Await factory() with exponential backoff; returns (result, retries used)"""
+    attempt = 0
+    while True:
+        try:
+            return await factory(), attempt
+        except Exception:
+            # Synthesis failures are usually transient network errors
+            if attempt >= retries:
+                raise
+            attempt += 1
+            await asyncio.sleep(2 ** attempt)
+
+
+async def synthesize_with_retries(text, voice, output_file, speed=1.0, volume=100, pitch=0, retries=2):
+    """Synthesize with exponential backoff; returns (bytes written, retries used)"""
+    return await retry_async(
+        lambda: synthesize_to_file(text, voice, output_file, speed=speed, volume=volume, pitch=pitch), retries)
+
+
+async def run_job(job, speed=1.0, volume=100, pitch=0, retries=2):
+    """Convert one job in place; never raises, failures are recorded on the job"""
+    started = time.monotonic()
+    if job['queued_at'] is not None:
+        job['queue_wait'] = round(started - job['queued_at'], 3)
+    try:
+        # Parsing and detection are CPU/disk bound, keep them off the event loop
+        text = await asyncio.to_thread(load_job_text, job)
+        if not text.strip():
+            job['status'] = STATUS_SKIPPED
+            job['error'] = "Empty document"
+            return job
+
+        job['chars'] = len(text)
+        if not job['language']:
+            job['language'] = await asyncio.to_thread(detect_language, text) or "English"
+        job['voice'] = resolve_voice(job['voice'], job['language'], job['model'])
+
+        output_dir = os.path.dirname(job['output'])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        speed, volume, pitch = job_settings(job, speed, volume, pitch)
+        job['bytes'], job['retries'] = await synthesize_with_retries(
+            text, job['voice'], job['output'], speed=speed, volume=volume, pitch=pitch, retries=retries)
+        job['status'] = STATUS_DONE
+    except Exception as e:
+        job['status'] = STATUS_FAILED
+        job['error'] = str(e)
+    finally:
+        job['seconds'] = round(time.monotonic() - started, 3)
+    await asyncio.to_thread(measure_job, job)
+    return job
+
+
+def measure_job(job):
+    """Read the exact audio length of a finished job's output (a walk over its MP3 frames)"""
+    if job['status'] == STATUS_DONE and job.get('duration') is None and job['output']:
+        job['duration'] = probe_duration(job['output'])
+
+
+def job_record(job):
+    """Report row for a finished job; its duration must already be measured (see measure_job)"""
+    return make_record(job['input'], job['output'], job['status'], chars=job['chars'],
+                       queue_wait=job['queue_wait'], synthesis_time=job['seconds'],
+                       size_bytes=job['bytes'], audio_duration=job.get('duration'),
+                       retries=job['retries'], error=job['error'])
+
+
+async def run_batch(jobs, parallelism=1, speed=1.0, volume=100, pitch=0, retries=2, on_job_done=None):
+    """Run jobs with at most `parallelism` concurrent syntheses"""
+    semaphore = asyncio.Semaphore(max(1, parallelism))
+    queued_at = time.monotonic()
+    for job in jobs:
+        job['queued_at'] = queued_at
+
+    async def run_limited(job):
+        async with semaphore:
+            await run_job(job, speed=speed, volume=volume, pitch=pitch, retries=retries)
+        if on_job_done:
+            on_job_done(job)
+        return job
+
+    return await asyncio.gather(*(run_limited(job) for job in jobs))
@@ -0,0 +1,123 @@
+"""
+Compact batch item storage. Items keep file metadata only; document text is read
+again when the file is actually synthesized.
+Nothing in this module imports PyQt5.
+"""
+import os
+from core.documents import read_document, iter_document
+from core.voices import detect_language, default_batch_voice
+
+# Characters used for language detection; langdetect is as accurate on a sample and much faster
+DETECTION_SAMPLE_CHARS = 10000
+
+
+class BatchItem:
+    """One queued batch file, or one row of a CSV/JSONL manifest (see core.manifest)"""
+    __slots__ = ('file_path', 'size', 'mtime', 'chars', 'language', 'model', 'voice',
+                 'output_dir', 'output_file', 'status', 'progress', 'error', 'queued_at', 'metrics',
+                 'row_id', 'text_offset', 'text_column', 'speed', 'volume', 'pitch', 'output_name')
+
+    def __init__(self, file_path, size, mtime, chars, language, model, voice, output_dir=None):
+        self.file_path = file_path
+        self.size = size
+        self.mtime = mtime
+        self.chars = chars
+        self.language = language
+        self.model = model
+        self.voice = voice
+        self.output_dir = output_dir  # None - default tts_audio folder
+        self.output_file = None
+        self.status = None
+        self.progress = 0
+        self.error = None
+        self.queued_at = None  # time.monotonic() when queued for a run
+        self.metrics = None  # Report row of the last run
+        # Manifest rows only: text is read from file_path at text_offset
+        self.row_id = None
+        self.text_offset = None
+        self.text_column = None  # CSV column of the text (core.manifest.manifest_text_column)
+        self.speed = None  # None - use the voice settings of the UI / command line
+        self.volume = None
+        self.pitch = None
+        self.output_name = None  # Output path relative to the output folder (or absolute)
+
+    @property
+    def filename(self):
+        return self.row_id or os.path.basename(self.file_path)
+
+    @classmethod
+    def from_file(cls, file_path, model="Edge TTS", output_dir=None):
+        """Stream the file once for char count and a language sample; returns None for empty files"""
+        stat = os.stat(file_path)
+        chars = 0
+        blocks = 0
+        sample = []
+        sample_chars = 0
+        has_text = False
+        # Counted like read_document: .txt files as they are, other blocks joined with newlines
+        text_file = file_path.endswith('.txt')
+        for block in (_iter_lines(file_path) if text_file else iter_document(file_path)):
+            chars += len(block)
+            blocks += 1
+            has_text = has_text or bool(block.strip())
+            if sample_chars < DETECTION_SAMPLE_CHARS:
+                sample.append(block)
+                sample_chars += len(block) + 1
+        if not has_text and not file_path.endswith('.pdf'):
+            return None  # Scanned PDFs have no text layer yet; their pages are OCR'd at synthesis
+        if not text_file:
+            chars += max(0, blocks - 1)  # Newlines joining the blocks
+        language = detect_language('\n'.join(sample)[:DETECTION_SAMPLE_CHARS]) or "English"
+        return cls(file_path, stat.st_size, stat.st_mtime, chars, language,
+                   model, default_batch_voice(model, language), output_dir)
+
+    def load_text(self, ocr=None):
+        """Read document text for synthesis.
+
+        PDFs return an iterator of page texts instead of a string, so synthesis can
+        start on the first pages while the rest is still being extracted.
+        """
+        if self.text_offset is not None:
+            from core.manifest import read_manifest_text
+            return read_manifest_text(self.file_path, self.text_offset, self.text_column)
+        if self.file_path.endswith('.pdf'):
+            return iter_document(self.file_path, ocr=ocr)
+        return read_document(self.file_path)
+
+
+def _iter_lines(file_path):
+    """Lines of a text file with their line ends"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from f
+
+
+class BatchItemList:
+    """List of BatchItem with aggregate counters maintained on every change"""
+
+    def __init__(self):
+        self.items = []
+        self.total_chars = 0
+        self.total_size = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def extend(self, items):
+        self.items.extend(items)
+        for item in items:
+            self.total_chars += item.chars
+            self.total_size += item.size
+
+    def clear(self):
+        self.items.clear()
+        self.total_chars = 0
+        self.total_size = 0
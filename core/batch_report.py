@@ -0,0 +1,134 @@
+"""
+Per-file and aggregate performance report for batch runs, exported as CSV/JSON.
+Nothing in this module imports PyQt5.
+"""
+import os
+import csv
+import json
+import time
+
+# Edge TTS returns audio-24khz-48kbitrate-mono-mp3 (constant bitrate)
+EDGE_TTS_BITRATE = 48000
+
+REPORT_FIELDS = ['file', 'output', 'status', 'chars', 'queue_wait_s', 'synthesis_s',
+                 'bytes', 'audio_s', 'retries', 'chars_per_s', 'realtime_factor', 'error']
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def estimate_audio_duration(size_bytes, bitrate=EDGE_TTS_BITRATE):
+    """Audio length in seconds of a constant bitrate stream"""
+    return size_bytes * 8 / bitrate if bitrate else 0.0
+
+
+def percentile(values, pct):
+    """Linear interpolated percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def make_record(file, output, status, chars=0, queue_wait=0.0, synthesis_time=0.0,
+                size_bytes=0, audio_duration=None, retries=0, error=None):
+    """Build one per-file report row; audio length is estimated from the size when not given.
+
+    Reading the exact length walks the whole MP3, so callers measure it in their worker
+    (core.batch.measure_job) and pass it in; report rows are often built on the GUI thread.
+    """
+    if audio_duration is None:
+        audio_duration = estimate_audio_duration(size_bytes)
+    return {
+        'file': file,
+        'output': output,
+        'status': status,
+        'chars': chars,
+        'queue_wait_s': round(queue_wait, 3),
+        'synthesis_s': round(synthesis_time, 3),
+        'bytes': size_bytes,
+        'audio_s': round(audio_duration, 3),
+        'retries': retries,
+        'chars_per_s': round(chars / synthesis_time, 1) if synthesis_time > 0 else 0.0,
+        'realtime_factor': round(audio_duration / synthesis_time, 2) if synthesis_time > 0 else 0.0,
+        'error': error or ''
+    }
+
+
+class BatchReport:
+    """Collects per-file records of one batch run"""
+
+    def __init__(self):
+        self.records = []
+        self.started = time.time()
+        self.started_monotonic = time.monotonic()
+        self.finished_monotonic = None
+        self.stats = {}  # Extra run-level counters merged into the aggregate (e.g. dedup savings)
+
+    def add(self, record):
+        self.records.append(record)
+
+    def finish(self):
+        self.finished_monotonic = time.monotonic()
+
+    @property
+    def wall_time(self):
+        end = self.finished_monotonic if self.finished_monotonic is not None else time.monotonic()
+        return end - self.started_monotonic
+
+    def aggregate(self):
+        """Totals and percentiles over successful files"""
+        done = [r for r in self.records if r['status'] == 'done']
+        total_chars = sum(r['chars'] for r in done)
+        total_audio = sum(r['audio_s'] for r in done)
+        wall_time = self.wall_time
+        summary = {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'wall_time_s': round(wall_time, 3),
+            'files': len(self.records),
+            'succeeded': len(done),
+            'failed': sum(1 for r in self.records if r['status'] == 'failed'),
+            'chars': total_chars,
+            'bytes': sum(r['bytes'] for r in done),
+            'audio_s': round(total_audio, 3),
+            'retries': sum(r['retries'] for r in self.records),
+            'chars_per_s': round(total_chars / wall_time, 1) if wall_time > 0 else 0.0,
+            'audio_per_wall_s': round(total_audio / wall_time, 2) if wall_time > 0 else 0.0
+        }
+        for field in ('synthesis_s', 'queue_wait_s', 'chars_per_s'):
+            values = [r[field] for r in done]
+            for pct in PERCENTILES:
+                summary[f'{field}_p{pct}'] = round(percentile(values, pct), 3)
+            summary[f'{field}_max'] = round(max(values), 3) if values else 0.0
+        summary.update(self.stats)
+        return summary
+
+    def summary_text(self):
+        """One-line summary for the UI and log"""
+        agg = self.aggregate()
+        text = (f"{agg['succeeded']}/{agg['files']} ok | {agg['chars_per_s']:.0f} chars/s | "
+                f"audio {agg['audio_s'] / 60:.1f} min in {agg['wall_time_s']:.0f}s | "
+                f"synth p50 {agg['synthesis_s_p50']:.1f}s p95 {agg['synthesis_s_p95']:.1f}s")
+        if 'dedup_saved_chars' in agg:
+            text += f" | dedup saved {agg['dedup_saved_chars']} chars"
+        return text
+
+    def export(self, output_dir, basename=None):
+        """Write <basename>.csv (per-file) and <basename>.json (aggregate + files); returns both paths"""
+        if basename is None:
+            basename = time.strftime('batch_report_%Y%m%d_%H%M%S', time.localtime(self.started))
+        os.makedirs(output_dir, exist_ok=True)
+        csv_path = os.path.join(output_dir, basename + '.csv')
+        json_path = os.path.join(output_dir, basename + '.json')
+
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.records)
+
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'aggregate': self.aggregate(), 'files': self.records}, f, indent=2, ensure_ascii=False)
+
+        return csv_path, json_path
@@ -0,0 +1,331 @@
+"""
+Chapter-aware splitting: long .docx/.epub documents are cut at their headings (docx
+heading styles) or spine items (EPUB) and every chapter is rendered as its own job.
+
+render_chapters writes one audio file per chapter into a book folder together with
+index.json and an .m3u playlist. The index keeps a hash of every chapter's text and
+voice settings, so running it again only re-renders chapters that failed, changed or
+whose file is missing. Nothing in this module imports PyQt5.
+"""
+import os
+import re
+import json
+import time
+import codecs
+import asyncio
+import hashlib
+import zipfile
+import posixpath
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from xml.etree import ElementTree
+from core.documents import iter_docx_paragraphs, iter_document
+from core.voices import detect_language, resolve_voice
+from core.batch import synthesize_with_retries, STATUS_DONE, STATUS_FAILED
+from core.batch_report import make_record
+from core.audio_index import audio_duration as probe_duration
+
+CHAPTER_EXTENSIONS = ('.docx', '.epub')
+CHAPTER_INDEX = 'index.json'
+CHAPTER_PLAYLIST = 'index.m3u'
+STATUS_UNCHANGED = "unchanged"
+
+# Headings up to this level start a new chapter (1 - only "Heading 1")
+DEFAULT_SPLIT_LEVEL = 1
+_TITLE_CHARS = 60
+_READ_SIZE = 64 * 1024
+
+_CONTAINER = '{urn:oasis:names:tc:opendocument:xmlns:container}'
+_OPF = '{http://www.idpf.org/2007/opf}'
+
+# XHTML elements that end a line of text
+_BLOCK_TAGS = {'p', 'div', 'br', 'li', 'tr', 'section', 'article', 'blockquote', 'pre',
+               'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dt', 'dd', 'figcaption', 'hr'}
+_HEADING_TAGS = {'h1', 'h2', 'h3'}
+_SKIPPED_TAGS = {'script', 'style', 'head'}
+
+
+class Chapter:
+    """One chapter of a document: 1-based number, title and text"""
+    __slots__ = ('number', 'title', 'text')
+
+    def __init__(self, number, title, text):
+        self.number = number
+        self.title = title
+        self.text = text
+
+
+def _short_title(text):
+    title = ' '.join(text.split())
+    return title[:_TITLE_CHARS].rstrip() or None
+
+
+def iter_docx_chapters(file_path, split_level=DEFAULT_SPLIT_LEVEL):
+    """Yield (title, text) per chapter; text before the first heading is "Front matter"."""
+    title = None
+    lines = []
+    for text, level in iter_docx_paragraphs(file_path):
+        if level is not None and 1 <= level <= split_level and text.strip():
+            if any(line.strip() for line in lines):
+                yield title or "Front matter", '\n'.join(lines)
+            title = _short_title(text)
+            lines = []
+        lines.append(text)
+    if any(line.strip() for line in lines):
+        yield title or "Front matter", '\n'.join(lines)
+
+
+class _XhtmlText(HTMLParser):
+    """Incremental XHTML to text converter that remembers the first heading and <title>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []
+        self.line = []
+        self.skip = 0
+        self.heading = None
+        self.in_heading = False
+        self.heading_parts = []
+        self.title = None
+        self.in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title':
+            self.in_title = True
+        elif tag in _SKIPPED_TAGS:
+            self.skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.end_line()
+            if tag in _HEADING_TAGS and self.heading is None:
+                self.in_heading = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self.in_title = False
+        elif tag in _SKIPPED_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.end_line()
+            if self.in_heading and tag in _HEADING_TAGS:
+                self.in_heading = False
+                self.heading = _short_title(''.join(self.heading_parts))
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title = _short_title((self.title or '') + data)
+        elif not self.skip:
+            self.line.append(data)
+            if self.in_heading:
+                self.heading_parts.append(data)
+
+    def end_line(self):
+        line = ' '.join(''.join(self.line).split())
+        if line:
+            self.lines.append(line)
+        self.line = []
+
+    def text(self):
+        self.end_line()
+        return '\n'.join(self.lines)
+
+
+def epub_spine(archive):
+    """Paths inside the archive of the linear spine items of an EPUB, in reading order"""
+    container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+    rootfile = container.find(f'.//{_CONTAINER}rootfile')
+    if rootfile is None:
+        raise ValueError("EPUB has no rootfile in META-INF/container.xml")
+    opf_path = rootfile.get('full-path')
+    package = ElementTree.fromstring(archive.read(opf_path))
+    base = posixpath.dirname(opf_path)
+    manifest = {item.get('id'): item.get('href') for item in package.iter(f'{_OPF}item')}
+    paths = []
+    for itemref in package.iter(f'{_OPF}itemref'):
+        href = manifest.get(itemref.get('idref'))
+        if href and itemref.get('linear') != 'no':
+            paths.append(posixpath.normpath(posixpath.join(base, unquote(href.split('#')[0]))))
+    return paths
+
+
+def _read_xhtml(archive, path):
+    """(title or None, text) of one spine item, decoded and parsed while it is read"""
+    parser = _XhtmlText()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with archive.open(path) as f:
+        while True:
+            data = f.read(_READ_SIZE)
+            parser.feed(decoder.decode(data, final=not data))
+            if not data:
+                break
+    parser.close()
+    return parser.heading or parser.title, parser.text()
+
+
+def iter_epub_chapters(file_path):
+    """Yield (title, text) per non-empty spine item, reading one item at a time from the zip"""
+    with zipfile.ZipFile(file_path) as archive:
+        for path in epub_spine(archive):
+            try:
+                title, text = _read_xhtml(archive, path)
+            except KeyError:
+                continue  # Spine entry missing from the archive
+            if text.strip():
+                yield title, text
+
+
+def iter_chapters(file_path, split_level=DEFAULT_SPLIT_LEVEL, ocr=None):
+    """Yield Chapter objects of a document; formats without chapters give a single one"""
+    if file_path.endswith('.epub'):
+        sections = iter_epub_chapters(file_path)
+    elif file_path.endswith('.docx'):
+        sections = iter_docx_chapters(file_path, split_level)
+    else:
+        text = '\n'.join(iter_document(file_path, ocr=ocr))
+        sections = [(None, text)] if text.strip() else []
+    for number, (title, text) in enumerate(sections, 1):
+        yield Chapter(number, title or f"Chapter {number}", text)
+
+
+def chapter_filename(number, title, extension="wav"):
+    """001_Title_words.wav - sortable and safe on every file system"""
+    safe = re.sub(r'[^\w\- ]+', '', title).strip().replace(' ', '_')[:40].strip('_')
+    return f"{number:03d}_{safe or 'chapter'}.{extension}"
+
+
+def chapter_hash(text, voice, speed, volume, pitch):
+    """Fingerprint of what a chapter file was rendered from"""
+    digest = hashlib.sha1(text.encode('utf-8'))
+    digest.update(f"\0{voice}\0{speed}\0{volume}\0{pitch}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_index(output_dir):
+    """Chapter index of a book folder; None if there is none or it is unreadable"""
+    try:
+        with open(os.path.join(output_dir, CHAPTER_INDEX), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_index(output_dir, index):
+    """Write index.json and an .m3u playlist of the rendered chapters"""
+    temp_path = os.path.join(output_dir, CHAPTER_INDEX + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, os.path.join(output_dir, CHAPTER_INDEX))
+    with open(os.path.join(output_dir, CHAPTER_PLAYLIST), 'w', encoding='utf-8') as f:
+        f.write("#EXTM3U\n")
+        for entry in index['chapters']:
+            if entry['status'] in (STATUS_DONE, STATUS_UNCHANGED):
+                f.write(f"#EXTINF:-1,{entry['title']}\n{entry['file']}\n")
+
+
+def chapter_record(source, output_dir, entry):
+    """Batch report row for one rendered chapter (reads the chapter's audio length)"""
+    output = os.path.join(output_dir, entry['file'])
+    duration = probe_duration(output) if entry['status'] == STATUS_DONE else None
+    return make_record(f"{source}#{entry['number']}", output,
+                       entry['status'], chars=entry['chars'], synthesis_time=entry['seconds'],
+                       size_bytes=entry['bytes'], audio_duration=duration, retries=entry['retries'],
+                       error=entry['error'])
+
+
+async def render_chapters(file_path, output_dir, voice=None, language=None, model="Edge TTS",
+                          speed=1.0, volume=100, pitch=0, parallelism=2, retries=2,
+                          split_level=DEFAULT_SPLIT_LEVEL, extension="wav", force=False,
+                          on_chapter_done=None):
+    """Render every chapter of file_path into output_dir as an independent job; returns the index.
+
+    Chapters are read lazily and only as fast as synthesis slots free up. A chapter whose
+    file exists and whose text and settings match the previous index is kept as it is
+    (status "unchanged") unless force is set, so a failed or edited chapter can be
+    re-rendered by running the book again.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    previous = load_index(output_dir) or {}
+    previous_hashes = {entry['file']: entry['hash'] for entry in previous.get('chapters', [])
+                       if entry['status'] in (STATUS_DONE, STATUS_UNCHANGED)}
+    semaphore = asyncio.Semaphore(max(1, parallelism))
+    chapters = iter_chapters(file_path, split_level)
+    entries = []
+    tasks = []
+
+    def finish(entry):
+        if on_chapter_done:
+            on_chapter_done(entry)
+
+    async def render(entry, text):
+        started = time.monotonic()
+        try:
+            entry['bytes'], entry['retries'] = await synthesize_with_retries(
+                text, voice, os.path.join(output_dir, entry['file']),
+                speed=speed, volume=volume, pitch=pitch, retries=retries)
+            entry['status'] = STATUS_DONE
+        except Exception as e:
+            entry['status'] = STATUS_FAILED
+            entry['error'] = str(e)
+        finally:
+            entry['seconds'] = round(time.monotonic() - started, 3)
+            semaphore.release()
+        finish(entry)
+
+    try:
+        while True:
+            # Only read the next chapter once a synthesis slot is free
+            await semaphore.acquire()
+            chapter = await asyncio.to_thread(next, chapters, None)
+            if chapter is None:
+                semaphore.release()
+                break
+            if voice is None or not voice.endswith("Neural"):
+                # Voice is resolved once from the first chapter so the whole book sounds the same
+                language = language or await asyncio.to_thread(detect_language, chapter.text) or "English"
+                voice = resolve_voice(voice, language, model)
+            entry = {
+                'number': chapter.number,
+                'title': chapter.title,
+                'file': chapter_filename(chapter.number, chapter.title, extension),
+                'chars': len(chapter.text),
+                'hash': chapter_hash(chapter.text, voice, speed, volume, pitch),
+                'status': None,
+                'error': None,
+                'bytes': 0,
+                'seconds': 0.0,
+                'retries': 0
+            }
+            entries.append(entry)
+            chapter_file = os.path.join(output_dir, entry['file'])
+            if (not force and previous_hashes.get(entry['file']) == entry['hash']
+                    and os.path.isfile(chapter_file)):
+                entry['status'] = STATUS_UNCHANGED
+                entry['bytes'] = os.path.getsize(chapter_file)
+                semaphore.release()
+                finish(entry)
+                continue
+            tasks.append(asyncio.create_task(render(entry, chapter.text)))
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        chapters.close()
+
+    # Chapters the book no longer has (fewer chapters, renamed titles) would linger in the folder
+    current_files = {entry['file'] for entry in entries}
+    for entry in previous.get('chapters', []):
+        stale = os.path.join(output_dir, os.path.basename(entry['file']))
+        if entry['file'] not in current_files and os.path.isfile(stale):
+            os.remove(stale)
+
+    index = {
+        'source': os.path.abspath(file_path),
+        'voice': voice,
+        'speed': speed,
+        'volume': volume,
+        'pitch': pitch,
+        'split_level': split_level,
+        'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'chapters': entries
+    }
+    write_index(output_dir, index)
+    return index
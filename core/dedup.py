@@ -0,0 +1,181 @@
+"""
+Cross-file paragraph deduplication for batch runs.
+
+Every document is split into paragraphs, each unique (paragraph, voice, settings)
+combination is synthesized once, and the output files are assembled from the
+shared MP3 segments (Edge TTS MP3 frames can be joined byte by byte).
+Nothing in this module imports PyQt5.
+"""
+import os
+import re
+import time
+import shutil
+import asyncio
+import hashlib
+import tempfile
+from core.voices import detect_language, resolve_voice
+from core.batch import load_job_text, job_settings, synthesize_with_retries, STATUS_DONE, STATUS_SKIPPED, STATUS_FAILED
+
+_BLANK_LINE = re.compile(r'\n\s*\n')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def split_paragraphs(text):
+    """Split text into paragraphs.
+
+    Texts with blank lines are split on blank lines (wrapped lines are joined),
+    otherwise every line is a paragraph - which is how .docx import joins paragraphs.
+    """
+    if _BLANK_LINE.search(text):
+        blocks = _BLANK_LINE.split(text)
+    else:
+        blocks = text.split('\n')
+    paragraphs = []
+    for block in blocks:
+        paragraph = _WHITESPACE.sub(' ', block).strip()
+        if paragraph:
+            paragraphs.append(paragraph)
+    return paragraphs
+
+
+def segment_key(paragraph, voice, speed, volume, pitch):
+    """Hash identifying one synthesized segment"""
+    data = f"{voice}|{speed}|{volume}|{pitch}|{paragraph}".encode('utf-8')
+    return hashlib.sha1(data).hexdigest()
+
+
+class DedupStats:
+    """Character accounting of a deduplicated run"""
+
+    def __init__(self):
+        self.total_chars = 0
+        self.synthesized_chars = 0
+        self.segments = 0
+        self.unique_segments = 0
+
+    @property
+    def saved_chars(self):
+        return self.total_chars - self.synthesized_chars
+
+    def as_dict(self):
+        return {
+            'dedup_segments': self.segments,
+            'dedup_unique_segments': self.unique_segments,
+            'dedup_total_chars': self.total_chars,
+            'dedup_synthesized_chars': self.synthesized_chars,
+            'dedup_saved_chars': self.saved_chars
+        }
+
+
+async def run_dedup_batch(jobs, parallelism=1, speed=1.0, volume=100, pitch=0, retries=2,
+                          segment_dir=None, on_job_done=None, on_progress=None):
+    """Run jobs (see core.batch.make_job) with cross-file paragraph deduplication.
+
+    on_progress(done_segments, unique_segments) is called as segments finish.
+    Returns DedupStats.
+    """
+    stats = DedupStats()
+    queued_at = time.monotonic()
+    for job in jobs:
+        job['queued_at'] = queued_at
+        job['started'] = queued_at
+
+    # 1. Segment every document; text is dropped once its keys are known
+    unique = {}  # key -> (paragraph, voice, (speed, volume, pitch))
+    for job in jobs:
+        try:
+            text = await asyncio.to_thread(load_job_text, job)
+            paragraphs = split_paragraphs(text)
+            if not paragraphs:
+                job['status'] = STATUS_SKIPPED
+                job['error'] = "Empty document"
+                continue
+            job['chars'] = len(text)
+            if not job['language']:
+                job['language'] = await asyncio.to_thread(detect_language, text) or "English"
+            job['voice'] = resolve_voice(job['voice'], job['language'], job['model'])
+
+            settings = job_settings(job, speed, volume, pitch)
+            keys = []
+            for paragraph in paragraphs:
+                key = segment_key(paragraph, job['voice'], *settings)
+                keys.append(key)
+                stats.total_chars += len(paragraph)
+                if key not in unique:
+                    unique[key] = (paragraph, job['voice'], settings)
+                    stats.synthesized_chars += len(paragraph)
+            job['segments'] = keys
+            stats.segments += len(keys)
+        except Exception as e:
+            job['status'] = STATUS_FAILED
+            job['error'] = str(e)
+    stats.unique_segments = len(unique)
+
+    # 2. Synthesize each unique segment once
+    own_segment_dir = segment_dir is None
+    if own_segment_dir:
+        base = os.path.dirname(jobs[0]['output']) if jobs else None
+        if base:
+            os.makedirs(base, exist_ok=True)
+        segment_dir = tempfile.mkdtemp(prefix='.segments_', dir=base)
+    os.makedirs(segment_dir, exist_ok=True)
+
+    semaphore = asyncio.Semaphore(max(1, parallelism))
+    segment_errors = {}
+    segment_retries = {}
+    done_count = 0
+
+    async def synthesize_segment(key, paragraph, voice, settings):
+        nonlocal done_count
+        path = os.path.join(segment_dir, key + '.mp3')
+        segment_speed, segment_volume, segment_pitch = settings
+        async with semaphore:
+            try:
+                _, segment_retries[key] = await synthesize_with_retries(
+                    paragraph, voice, path, speed=segment_speed, volume=segment_volume,
+                    pitch=segment_pitch, retries=retries)
+            except Exception as e:
+                segment_errors[key] = str(e)
+        done_count += 1
+        if on_progress:
+            on_progress(done_count, len(unique))
+
+    try:
+        await asyncio.gather(*(synthesize_segment(key, *segment) for key, segment in unique.items()))
+
+        # 3. Assemble outputs from the shared segments
+        for job in jobs:
+            if job['status'] is not None:
+                if on_job_done:
+                    on_job_done(job)
+                continue
+            failed = [segment_errors[key] for key in job['segments'] if key in segment_errors]
+            job['retries'] = sum(segment_retries.get(key, 0) for key in set(job['segments']))
+            if failed:
+                job['status'] = STATUS_FAILED
+                job['error'] = failed[0]
+            else:
+                try:
+                    output_dir = os.path.dirname(job['output'])
+                    if output_dir:
+                        os.makedirs(output_dir, exist_ok=True)
+                    with open(job['output'], 'wb') as out:
+                        for key in job['segments']:
+                            with open(os.path.join(segment_dir, key + '.mp3'), 'rb') as segment:
+                                shutil.copyfileobj(segment, out)
+                    job['bytes'] = os.path.getsize(job['output'])
+                    job['status'] = STATUS_DONE
+                except Exception as e:
+                    job['status'] = STATUS_FAILED
+                    job['error'] = str(e)
+            job['seconds'] = round(time.monotonic() - job['started'], 3)
+            if on_job_done:
+                on_job_done(job)
+    finally:
+        if own_segment_dir:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+        for job in jobs:
+            job.pop('segments', None)
+            job.pop('started', None)
+
+    return stats
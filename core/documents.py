@@ -0,0 +1,200 @@
+"""
+Document import helpers shared by the GUI tabs and the command line.
+Nothing in this module imports PyQt5.
+"""
+import os
+import zipfile
+from xml.etree import ElementTree
+
+SUPPORTED_EXTENSIONS = ('.txt', '.docx', '.pdf', '.epub')
+
+# WordprocessingML tags, as ElementTree reports them
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_BODY = _W + 'body'
+_PARAGRAPH = _W + 'p'
+_TEXT = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+_CELL = _W + 'tc'
+_STYLE = _W + 'pStyle'
+_OUTLINE_LEVEL = _W + 'outlineLvl'
+_VAL = _W + 'val'
+_STYLE_ID = _W + 'styleId'
+
+
+class DocumentError(ValueError):
+    """A document could not be read to the end"""
+
+
+def _docx_heading_levels(archive):
+    """styleId -> heading level from word/styles.xml (Title is 0, "heading N" is N)"""
+    try:
+        root = ElementTree.fromstring(archive.read('word/styles.xml'))
+    except KeyError:
+        return {}
+    levels = {}
+    based_on = {}
+    for style in root.iter(_W + 'style'):
+        style_id = style.get(_STYLE_ID)
+        name = style.find(_W + 'name')
+        name = name.get(_VAL, '').lower() if name is not None else ''
+        outline = style.find(f'{_W}pPr/{_W}outlineLvl')
+        if name == 'title':
+            levels[style_id] = 0
+        elif name.startswith('heading ') and name[8:].isdigit():
+            levels[style_id] = int(name[8:])
+        elif outline is not None and outline.get(_VAL, '9').isdigit() and int(outline.get(_VAL)) < 9:
+            levels[style_id] = int(outline.get(_VAL)) + 1
+        parent = style.find(_W + 'basedOn')
+        if parent is not None:
+            based_on[style_id] = parent.get(_VAL)
+    # Custom styles based on a heading are headings of the same level
+    for style_id, parent in based_on.items():
+        seen = set()
+        while style_id not in levels and parent and parent not in seen:
+            seen.add(parent)
+            if parent in levels:
+                levels[style_id] = levels[parent]
+            parent = based_on.get(parent)
+    return levels
+
+
+def iter_docx_paragraphs(file_path):
+    """Yield (text, heading level or None) for a .docx body in reading order without building the document tree.
+
+    word/document.xml is parsed incrementally and processed elements are dropped, so memory
+    stays bounded by the largest paragraph. Top-level paragraphs are yielded one by one,
+    table cells are yielded as one block each (their paragraphs joined with newlines,
+    nested tables included). Raises KeyError/zipfile.BadZipFile/ElementTree.ParseError
+    for files that are not valid WordprocessingML.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        heading_levels = _docx_heading_levels(archive)
+        with archive.open('word/document.xml') as xml_file:
+            body = None
+            depth = 0
+            body_depth = None
+            paragraphs = []  # Text runs of open paragraphs (text boxes nest paragraphs)
+            levels = []  # Heading level of open paragraphs
+            cells = []  # Paragraph texts of open table cells
+            for event, elem in ElementTree.iterparse(xml_file, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    depth += 1
+                    if tag == _PARAGRAPH:
+                        paragraphs.append([])
+                        levels.append(None)
+                    elif tag == _CELL:
+                        cells.append([])
+                    elif tag == _BODY:
+                        body = elem
+                        body_depth = depth
+                    elif tag == _STYLE and levels:
+                        levels[-1] = heading_levels.get(elem.get(_VAL))
+                    elif tag == _OUTLINE_LEVEL and levels and elem.get(_VAL, '9').isdigit():
+                        level = int(elem.get(_VAL))
+                        levels[-1] = level + 1 if level < 9 else None
+                    continue
+
+                depth -= 1
+                if tag == _TEXT:
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == _TAB:
+                    if paragraphs:
+                        paragraphs[-1].append('\t')
+                elif tag in _BREAKS:
+                    if paragraphs:
+                        paragraphs[-1].append('\n')
+                elif tag == _PARAGRAPH:
+                    text = ''.join(paragraphs.pop())
+                    level = levels.pop()
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield text, level
+                elif tag == _CELL:
+                    text = '\n'.join(t for t in cells.pop() if t)
+                    if cells:
+                        cells[-1].append(text)
+                    else:
+                        yield text, None
+
+                # Drop finished body children so the tree never grows
+                if body is not None and depth == body_depth:
+                    body.clear()
+                elif tag in (_PARAGRAPH, _CELL):
+                    elem.clear()
+
+
+def iter_docx_blocks(file_path):
+    """Yield the text of a .docx body in reading order (see iter_docx_paragraphs)"""
+    for text, _ in iter_docx_paragraphs(file_path):
+        yield text
+
+
+def _iter_docx_blocks_fallback(file_path):
+    """python-docx based extraction for documents the streaming reader cannot parse"""
+    from docx import Document
+    doc = Document(file_path)
+    for para in doc.paragraphs:
+        yield para.text
+
+
+def iter_document(file_path, ocr=None):
+    """Yield the text of a .txt, .docx, .pdf or .epub file line by line / paragraph by paragraph /
+    page by page / chapter by chapter.
+
+    ocr(png_bytes) -> str is used for PDF pages without a text layer (see core.pdf_import).
+    """
+    if file_path.endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+    elif file_path.endswith('.docx'):
+        yielded = False
+        try:
+            for text in iter_docx_blocks(file_path):
+                yielded = True
+                yield text
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            if yielded:
+                # Paragraphs already went out; starting over with python-docx would repeat them
+                raise DocumentError(f"{os.path.basename(file_path)} is damaged after its first paragraphs: {e}") from e
+            yield from _iter_docx_blocks_fallback(file_path)
+    elif file_path.endswith('.pdf'):
+        from core.pdf_import import iter_pdf_pages
+        yield from iter_pdf_pages(file_path, ocr=ocr)
+    elif file_path.endswith('.epub'):
+        from core.chapters import iter_epub_chapters
+        for _, text in iter_epub_chapters(file_path):
+            yield text
+    else:
+        raise ValueError(f"Unsupported file type: {os.path.splitext(file_path)[1]}")
+
+
+def read_document(file_path, ocr=None):
+    """Read text content of a .txt, .docx, .pdf or .epub file"""
+    if file_path.endswith('.txt'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return '\n'.join(iter_document(file_path, ocr=ocr))
+
+
+def collect_documents(paths, recursive=False):
+    """Expand files and directories into a sorted list of (file path, relative name) pairs"""
+    documents = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                walker = os.walk(path)
+            else:
+                walker = [(path, [], os.listdir(path))]
+            for root, _, files in walker:
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith('~$'):
+                        full_path = os.path.join(root, name)
+                        documents.append((full_path, os.path.relpath(full_path, path)))
+        elif os.path.isfile(path):
+            documents.append((path, os.path.basename(path)))
+    return documents
@@ -0,0 +1,154 @@
+import os
+import time
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+WATCH_EXTENSIONS = ('.txt', '.docx', '.pdf', '.epub')
+
+
+class FolderSnapshot:
+    """Stat-snapshot tracker for hot folders.
+
+    Only directory listings and stat results are compared, file contents are never
+    read. A file is reported once its (size, mtime) pair has stayed the same for
+    `settle_seconds`, and again whenever it changes and settles afterwards.
+    """
+
+    def __init__(self, folders, extensions=WATCH_EXTENSIONS, settle_seconds=2.0):
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.settle_seconds = settle_seconds
+        self._pending = {}  # path -> ((size, mtime_ns), first time this signature was seen)
+        self._done = {}  # path -> (size, mtime_ns) of the last reported version
+
+    def has_pending(self):
+        """True while some files are still waiting to settle"""
+        return bool(self._pending)
+
+    def scan(self, folders=None, now=None):
+        """Scan folders and return paths that became stable since the last scan"""
+        now = time.monotonic() if now is None else now
+        folders = [os.path.abspath(folder) for folder in (folders or self.folders)]
+        ready = []
+        seen = set()
+
+        for folder in folders:
+            try:
+                entries = os.scandir(folder)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(self.extensions) or entry.name.startswith('~$'):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+
+                    path = entry.path
+                    signature = (stat.st_size, stat.st_mtime_ns)
+                    seen.add(path)
+
+                    if self._done.get(path) == signature:
+                        continue
+
+                    pending = self._pending.get(path)
+                    if pending is None or pending[0] != signature:
+                        # New or still being written - restart the settle timer
+                        self._pending[path] = (signature, now)
+                    elif now - pending[1] >= self.settle_seconds:
+                        del self._pending[path]
+                        self._done[path] = signature
+                        ready.append(path)
+
+        # Forget files that vanished from the scanned folders
+        for path in list(self._pending):
+            if path not in seen and os.path.dirname(path) in folders:
+                del self._pending[path]
+        for path in list(self._done):
+            if path not in seen and os.path.dirname(path) in folders:
+                del self._done[path]
+
+        return sorted(ready)
+
+
+class FolderWatcher(QObject):
+    """Watch one or more folders and emit files once they are stable.
+
+    Uses OS change notifications through QFileSystemWatcher where the folder
+    supports them and falls back to a periodic stat scan otherwise.
+    """
+    files_ready = pyqtSignal(list)
+    log_signal = pyqtSignal(str)
+
+    def __init__(self, folders, settle_seconds=2.0, poll_interval=5.0, parent=None):
+        super().__init__(parent)
+        self.snapshot = FolderSnapshot(folders, settle_seconds=settle_seconds)
+        self.poll_interval = poll_interval
+        self.polled_folders = []
+
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self._on_directory_changed)
+        self.fs_watcher.fileChanged.connect(self._on_file_changed)
+
+        # Debounce timer: re-checks pending files until they settle
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.timeout.connect(self._scan_all)
+
+        # Polling fallback for folders without change notifications
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self._poll)
+
+    @property
+    def folders(self):
+        return self.snapshot.folders
+
+    def start(self):
+        """Start watching; files already in the folders are picked up too"""
+        self.polled_folders = []
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                self.log_signal.emit(f"Watch folder not found: {folder}")
+                continue
+            if not self.fs_watcher.addPath(folder):
+                self.polled_folders.append(folder)
+                self.log_signal.emit(f"Change notifications unavailable, polling: {folder}")
+
+        if self.polled_folders:
+            self.poll_timer.start(int(self.poll_interval * 1000))
+        self._scan_all()
+
+    def stop(self):
+        """Stop watching all folders"""
+        self.poll_timer.stop()
+        self.settle_timer.stop()
+        paths = self.fs_watcher.directories() + self.fs_watcher.files()
+        if paths:
+            self.fs_watcher.removePaths(paths)
+
+    def _on_directory_changed(self, folder):
+        self._scan([folder])
+
+    def _on_file_changed(self, path):
+        self._scan([os.path.dirname(os.path.abspath(path))])
+
+    def _poll(self):
+        self._scan(self.polled_folders)
+
+    def _scan_all(self):
+        self._scan(self.folders)
+
+    def _scan(self, folders):
+        ready = self.snapshot.scan(folders)
+        if ready:
+            # Watch reported files as well so later edits to them are noticed
+            notified = [path for path in ready if os.path.dirname(path) not in self.polled_folders]
+            if notified:
+                self.fs_watcher.addPaths(notified)
+            self.files_ready.emit(ready)
+        if self.snapshot.has_pending() and not self.settle_timer.isActive():
+            # Nothing new will be signalled while a file sits still, so re-check after the settle period
+            self.settle_timer.start(int(self.snapshot.settle_seconds * 1000) + 100)
@@ -0,0 +1,284 @@
+"""
+Shared HTTP client for the translator and OCR services.
+
+One requests.Session per host keeps TLS connections alive and pooled between calls.
+Every request gets connect/read timeouts. Connection errors, timeouts and 429/5xx
+answers are retried with jittered exponential backoff, honoring Retry-After, for
+requests marked idempotent. Per-host request, retry and latency counters are kept for
+diagnostics. request_async is the same call for asyncio code: the request runs in a
+thread and the backoff waits do not block the event loop. Inside cancel_scope(event),
+calls made by the thread stop with RequestCancelled once the event is set.
+Nothing in this module imports PyQt5.
+"""
+import time
+import random
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+# A server asking to wait longer than this gets its error returned instead
+MAX_RETRY_AFTER = 60.0
+POOL_SIZE = 8  # Connections kept per host; matches the concurrency of translation and OCR
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+
+_cancel_event = ContextVar('cancel_event', default=None)
+
+
+class RequestCancelled(requests.exceptions.RequestException):
+    """The cancel event of the calling code (cancel_scope) was set"""
+
+
+@contextmanager
+def cancel_scope(event):
+    """Requests made inside the block give up once event (a threading.Event) is set.
+
+    The flag is checked before every attempt and during the backoff waits; a request
+    already sent is not interrupted, it ends at its timeout.
+    """
+    token = _cancel_event.set(event)
+    try:
+        yield event
+    finally:
+        _cancel_event.reset(token)
+
+
+def _check_cancelled():
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise RequestCancelled("Request cancelled")
+
+
+def _cancellable_sleep(delay):
+    event = _cancel_event.get()
+    if event is None:
+        time.sleep(delay)
+    elif event.wait(delay):
+        raise RequestCancelled("Request cancelled")
+
+
+class HostStats:
+    """Counters of one host"""
+    __slots__ = ('requests', 'retries', 'failures', 'statuses', 'total_time', 'max_time')
+
+    def __init__(self):
+        self.requests = 0  # Attempts sent, retries included
+        self.retries = 0
+        self.failures = 0  # Calls that ended in an exception or an error status
+        self.statuses = {}  # Status code -> count
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'statuses': dict(self.statuses),
+            'avg_ms': round(self.total_time * 1000 / self.requests, 1) if self.requests else 0.0,
+            'max_ms': round(self.max_time * 1000, 1)
+        }
+
+
+def retry_after_seconds(response):
+    """Seconds a 429/503 response asks to wait (Retry-After as seconds or HTTP date), or None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class HttpClient:
+    """Thread-safe pooled HTTP client; one instance is shared through get_client()"""
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 retries=DEFAULT_RETRIES, pool_size=POOL_SIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def session(self, host):
+        """Keep-alive session of a host (scheme://netloc), created on first use"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _record(self, host, elapsed, status=None, retry=False, failed=False):
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if retry:
+                stats.retries += 1
+            if failed:
+                stats.failures += 1
+
+    def _send(self, method, url, host, kwargs):
+        """(response or None, exception or None, seconds)"""
+        kwargs = dict(kwargs)
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.monotonic()
+        try:
+            response = self.session(host).request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            return None, e, time.monotonic() - started
+        return response, None, time.monotonic() - started
+
+    def _retry_delay(self, response, attempt, retries, statuses=RETRY_STATUSES):
+        """Seconds to wait before the next attempt, or None to stop"""
+        if attempt >= retries:
+            return None
+        if response is None:
+            return backoff_delay(attempt)
+        if response.status_code not in statuses:
+            return None
+        wait = retry_after_seconds(response)
+        if wait is None:
+            return backoff_delay(attempt)
+        return wait if wait <= MAX_RETRY_AFTER else None
+
+    def _attempt(self, method, url, host, kwargs, attempt, retries, statuses=RETRY_STATUSES):
+        """One attempt: (response, delay before the next attempt or None to stop).
+
+        A connection error or timeout is raised once no retry is left.
+        """
+        _check_cancelled()
+        response, error, elapsed = self._send(method, url, host, kwargs)
+        delay = self._retry_delay(response, attempt, retries, statuses)
+        if error is not None:
+            self._record(host, elapsed, retry=delay is not None, failed=delay is None)
+            if delay is None:
+                raise error
+            return None, delay
+        self._record(host, elapsed, response.status_code, retry=delay is not None,
+                     failed=delay is None and response.status_code >= 400)
+        if delay is not None:
+            response.close()
+        return response, delay
+
+    def request(self, method, url, idempotent=None, retries=None, retry_statuses=RETRY_STATUSES, **kwargs):
+        """requests-style call with pooling, timeouts and retries; returns the last response.
+
+        Only idempotent requests are retried (GET/HEAD/... by default; pass idempotent=True
+        for POSTs without side effects, such as translation and OCR calls). Errors left after
+        the last retry are raised (connection) or returned (HTTP status) as with requests.
+        retry_statuses narrows the statuses retried, e.g. without 429 when the caller switches
+        to another API key instead (core.key_pool).
+        """
+        method = method.upper()
+        host = _host(url)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        retries = (self.retries if retries is None else retries) if idempotent else 0
+        attempt = 0
+        while True:
+            response, delay = self._attempt(method, url, host, kwargs, attempt, retries, retry_statuses)
+            if delay is None:
+                return response
+            _cancellable_sleep(delay)
+            attempt += 1
+
+    async def request_async(self, method, url, idempotent=None, retries=None, retry_statuses=RETRY_STATUSES,
+                            **kwargs):
+        """request() for asyncio code: the call runs in a thread, backoff waits with asyncio.sleep"""
+        method = method.upper()
+        host = _host(url)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        retries = (self.retries if retries is None else retries) if idempotent else 0
+        attempt = 0
+        while True:
+            response, delay = await asyncio.to_thread(self._attempt, method, url, host, kwargs, attempt, retries,
+                                                      retry_statuses)
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """{host: {requests, retries, failures, statuses, avg_ms, max_ms}}"""
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide shared client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def http_post(url, **kwargs):
+    """POST through the shared client (see HttpClient.request)"""
+    return get_client().post(url, **kwargs)
+
+
+def host_stats():
+    """Per-host counters of the shared client"""
+    return get_client().stats()
+
+
+def format_host_stats(stats=None):
+    """One line per host: 'api.example.com: 12 requests, 1 retries, avg 210 ms, max 900 ms'"""
+    stats = host_stats() if stats is None else stats
+    return '\n'.join(f"{urlsplit(host).netloc}: {entry['requests']} requests, {entry['retries']} retries, "
+                     f"{entry['failures']} failed, avg {entry['avg_ms']:.0f} ms, max {entry['max_ms']:.0f} ms"
+                     for host, entry in sorted(stats.items()))
@@ -0,0 +1,186 @@
+"""
+API key validation off the GUI thread, debounced and cached.
+
+A key test is a real request to the service, so the Settings and OCR tabs must not run
+one per keystroke. KeyStatusChecker waits until the input has been quiet for
+CHECK_DELAY_MS, runs the test in a KeyCheckWorker thread and reports the result with a
+signal. Results are cached per service and key hash (core.quota.key_id, never the key
+itself) for VALID_TTL or INVALID_TTL seconds. A new key cancels the check in flight:
+the test runs in a core.http_client.cancel_scope, so the old worker sends no request or
+retry after the cancel; a request already on the wire ends at its timeout, and its
+result is neither cached nor reported.
+"""
+import time
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from core.quota import key_id
+from core.http_client import cancel_scope
+
+CHECK_DELAY_MS = 700
+VALID_TTL = 600.0
+# Shorter, a key that was just created may take a minute to become active
+INVALID_TTL = 60.0
+MAX_CACHED = 64
+
+STATE_EMPTY = 'empty'
+STATE_CHECKING = 'checking'
+STATE_VALID = 'valid'
+STATE_INVALID = 'invalid'
+STATE_ERROR = 'error'
+
+
+class KeyCheckCache:
+    """Recent test results by (service, key hash); safe to share between threads"""
+
+    def __init__(self, valid_ttl=VALID_TTL, invalid_ttl=INVALID_TTL, max_entries=MAX_CACHED):
+        self.valid_ttl = valid_ttl
+        self.invalid_ttl = invalid_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (service, key id) -> (valid, expires)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(service, api_key, scope):
+        # scope separates keys that are only valid together with something else (the Azure endpoint)
+        return service, key_id(f"{scope}\n{api_key}" if scope else api_key)
+
+    def get(self, service, api_key, scope=''):
+        """True/False from a result that has not expired yet, None otherwise"""
+        key = self._key(service, api_key, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def put(self, service, api_key, valid, scope=''):
+        ttl = self.valid_ttl if valid else self.invalid_ttl
+        key = self._key(service, api_key, scope)
+        with self._lock:
+            self._entries[key] = (bool(valid), time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = KeyCheckCache()
+
+
+def get_key_check_cache():
+    """The process-wide result cache"""
+    return _cache
+
+
+class KeyCheckWorker(QThread):
+    """Worker thread running one key test; stop() cancels it (see the module docstring)"""
+    finished = pyqtSignal(object)  # {'generation', 'state', 'error'}
+
+    def __init__(self, generation, service, api_key, test, scope='', cache=None):
+        super().__init__()
+        self.generation = generation
+        self.service = service
+        self.api_key = api_key
+        self.test = test
+        self.scope = scope
+        self.cache = cache or get_key_check_cache()
+        self.cancelled = threading.Event()
+
+    @property
+    def stopped(self):
+        return self.cancelled.is_set()
+
+    def stop(self):
+        self.cancelled.set()
+
+    def run(self):
+        result = {'generation': self.generation, 'state': None, 'error': None}
+        if self.stopped:
+            self.finished.emit(result)
+            return
+        try:
+            with cancel_scope(self.cancelled):
+                valid = bool(self.test(self.api_key))
+            # Tests turn errors into False, so a cancelled test says nothing about the key
+            if not self.stopped:
+                self.cache.put(self.service, self.api_key, valid, self.scope)
+                result['state'] = STATE_VALID if valid else STATE_INVALID
+        except Exception as e:
+            if not self.stopped:
+                result['state'] = STATE_ERROR
+                result['error'] = str(e)
+        self.finished.emit(result)
+
+
+class KeyStatusChecker(QObject):
+    """Debounced key checks for one status label.
+
+    Call request() on every change of the key or service; status_changed(state, message)
+    is emitted at once for empty and cached keys, and after the test otherwise.
+    """
+    status_changed = pyqtSignal(str, str)
+
+    def __init__(self, delay_ms=CHECK_DELAY_MS, cache=None, parent=None):
+        super().__init__(parent)
+        self.cache = cache or get_key_check_cache()
+        self.generation = 0
+        self.pending = None  # (service, api_key, test, scope) waiting for the timer
+        self.current = None  # Worker of the latest request
+        self._workers = set()  # Running workers, superseded ones included, kept until they finish
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self._start)
+
+    def request(self, service, api_key, test, scope=''):
+        """Check api_key of service with test(api_key) -> bool once the input settles"""
+        self.generation += 1
+        self.timer.stop()
+        self.pending = None
+        if self.current is not None:
+            self.current.stop()
+            self.current = None
+
+        if not api_key:
+            self.status_changed.emit(STATE_EMPTY, "No key entered")
+            return
+        cached = self.cache.get(service, api_key, scope)
+        if cached is not None:
+            self.status_changed.emit(STATE_VALID if cached else STATE_INVALID, "Valid" if cached else "Invalid")
+            return
+        self.pending = (service, api_key, test, scope)
+        self.status_changed.emit(STATE_CHECKING, "Checking...")
+        self.timer.start()
+
+    def _start(self):
+        if self.pending is None:
+            return
+        service, api_key, test, scope = self.pending
+        self.pending = None
+        worker = KeyCheckWorker(self.generation, service, api_key, test, scope, self.cache)
+        worker.finished.connect(lambda result, worker=worker: self._on_finished(worker, result))
+        self._workers.add(worker)
+        self.current = worker
+        worker.start()
+
+    def _on_finished(self, worker, result):
+        self._workers.discard(worker)
+        # finished is emitted by run() itself; wait for the thread to end before deleting it
+        worker.wait()
+        worker.deleteLater()
+        if worker is self.current:
+            self.current = None
+        if result['generation'] != self.generation or result['state'] is None:
+            return  # Superseded by a newer key
+        if result['state'] == STATE_ERROR:
+            self.status_changed.emit(STATE_ERROR, f"Error - {result['error']}")
+        else:
+            self.status_changed.emit(result['state'], "Valid" if result['state'] == STATE_VALID else "Invalid")
@@ -0,0 +1,294 @@
+"""
+API key pools: several keys per cloud service, rate-limited per key and rotated on errors.
+
+The key entered in the Settings or IMG to Text tab is always the first key of its service;
+more keys (with their Azure region or endpoint) can be listed in settings.json:
+
+    "api_keys": {
+        "Microsoft Translator": ["key2", {"key": "key3", "region": "northeurope"}],
+        "Azure Computer Vision": [{"key": "key4", "endpoint": "https://eastus.api.cognitive.microsoft.com/"}]
+    }
+
+Every key has a token bucket (RATE_LIMITS requests per second and burst, changed per
+service with "key_rate_limits" or per key with "rate"), and request() sends through the
+key that can go soonest, which spreads the requests over the keys. A key answering
+401/403 is dropped for the session, one answering 429 rests for its Retry-After, and one
+whose monthly budget (core.quota) would be exceeded is skipped while other keys have
+room. Usage is recorded per key in the quota ledger.
+Nothing in this module imports PyQt5.
+"""
+import time
+import threading
+import requests
+from core.settings import load_settings
+from core.quota import (QuotaGuard, QuotaExceeded, STATUS_OVER, ACTION_WARN, ACTION_BLOCK,
+                        evaluate, key_id, get_ledger)
+from core.http_client import get_client, retry_after_seconds, RETRY_STATUSES, MAX_RETRY_AFTER
+
+# Requests per second and burst of one key
+RATE_LIMITS = {
+    "Microsoft Translator": (10.0, 10),
+    "Google Cloud Translate": (10.0, 10),
+    "Google Vision API": (30.0, 30),  # 1,800 requests per minute
+    "Azure Computer Vision": (20 / 60, 2),  # Free tier: 20 calls per minute
+}
+DEFAULT_RATE = (5.0, 5)
+COOLDOWN = 60.0  # Rest after a 429 without Retry-After
+REJECT_STATUSES = frozenset((401, 403))
+# 429 is handled here by switching keys, the other statuses by the shared client
+CLIENT_RETRY_STATUSES = RETRY_STATUSES - {429}
+MAX_WAIT_STEP = 1.0  # A waiting request looks for a free key again at least this often
+
+KEY_ACTIVE = 'active'
+KEY_COOLING = 'cooling down'
+KEY_OVER_QUOTA = 'over quota'
+KEY_REJECTED = 'rejected'
+
+
+class KeyPoolExhausted(Exception):
+    """A pool has no key left to send with (none configured, or all rejected by the service)"""
+
+
+class TokenBucket:
+    """`rate` tokens per second, at most `burst` saved up; the pool lock guards it"""
+
+    def __init__(self, rate, burst):
+        self.rate = max(float(rate), 1e-6)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """Seconds until a token is available"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class PoolKey:
+    """One API key with its region/endpoint, rate limit and counters"""
+    __slots__ = ('key', 'region', 'endpoint', 'bucket', 'guard', 'rejected', 'available_at',
+                 'requests', 'errors', 'last_error')
+
+    def __init__(self, key, region=None, endpoint=None, bucket=None, guard=None):
+        self.key = key
+        self.region = region  # Microsoft Translator resource region, None for the translator default
+        self.endpoint = endpoint  # Azure Computer Vision resource endpoint, None for the saved one
+        self.bucket = bucket
+        self.guard = guard  # core.quota.QuotaGuard of this key
+        self.rejected = False
+        self.available_at = 0.0  # time.monotonic() when a 429 cool-down ends
+        self.requests = 0
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def masked(self):
+        """'abcd…wxyz' for display"""
+        return f"{self.key[:4]}…{self.key[-4:]}" if len(self.key) > 8 else "…"
+
+
+def _rate(value, default):
+    """(rate, burst) from a number (requests per second, burst the same) or a [rate, burst] pair"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value), max(1, int(value))
+    return float(value[0]), value[1]
+
+
+def pool_entries(service, primary=None, settings=None):
+    """Key entries {'key', 'region', 'endpoint', 'rate'} of service: primary first, then "api_keys"
+
+    primary is the key of the tab (a string or an entry dict); repeated keys are dropped.
+    """
+    settings = load_settings() if settings is None else settings
+    entries = []
+    seen = set()
+    for entry in [primary] + list(settings.get('api_keys', {}).get(service, [])):
+        entry = {'key': entry} if isinstance(entry, str) else dict(entry or {})
+        key = (entry.get('key') or '').strip()
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        entry['key'] = key
+        entries.append(entry)
+    return entries
+
+
+class KeyPool:
+    """Keys of one service; thread-safe, shared through get_key_pool().
+
+    Has check()/require()/action like core.quota.QuotaGuard, summed over its keys, so it
+    can stand in for one in the pre-flight quota checks.
+    """
+
+    def __init__(self, service, entries, settings=None, ledger=None):
+        settings = load_settings() if settings is None else settings
+        ledger = ledger or get_ledger()
+        self.service = service
+        self.action = settings.get('quota_action', ACTION_WARN)
+        rate = _rate(settings.get('key_rate_limits', {}).get(service), RATE_LIMITS.get(service, DEFAULT_RATE))
+        self.keys = [PoolKey(entry['key'], entry.get('region'), entry.get('endpoint'),
+                             TokenBucket(*_rate(entry.get('rate'), rate)),
+                             QuotaGuard(service, entry['key'], ledger, settings))
+                     for entry in entries]
+        self.signature = None  # Settings the pool was built from (get_key_pool)
+        self._lock = threading.Lock()
+
+    def _pick(self, units, now):
+        """(key, seconds to wait) of the usable key that can send soonest"""
+        if not self.keys:
+            raise KeyPoolExhausted(f"{self.service}: no API key configured")
+        usable = [key for key in self.keys if not key.rejected]
+        if not usable:
+            raise KeyPoolExhausted(f"{self.service}: every API key was rejected")
+        in_budget = [key for key in usable if key.guard.check(units).status != STATUS_OVER]
+        if not in_budget:
+            if self.action == ACTION_BLOCK:
+                raise QuotaExceeded(self.check(units).message())
+            in_budget = usable
+        # Least used key first among the ones ready at the same time
+        return min(((key, max(key.available_at - now, key.bucket.delay(now))) for key in in_budget),
+                   key=lambda item: (item[1], item[0].requests))
+
+    def acquire(self, units=0):
+        """Key for the next request of `units`, waiting for its rate limit or cool-down"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                key, wait = self._pick(units, now)
+                if wait <= 0:
+                    key.bucket.take(now)
+                    key.requests += 1
+                    return key
+            time.sleep(min(wait, MAX_WAIT_STEP))
+
+    def report(self, key, response=None, units=0, error=None):
+        """Book the outcome of a request sent with key: reject, cool down or record usage"""
+        with self._lock:
+            if response is None:
+                key.errors += 1
+                key.last_error = str(error)
+                return
+            status = response.status_code
+            if status in REJECT_STATUSES:
+                key.rejected = True
+            elif status == 429:
+                wait = retry_after_seconds(response)
+                key.available_at = time.monotonic() + (COOLDOWN if wait is None else wait)
+            if status >= 400:
+                key.errors += 1
+                key.last_error = f"HTTP {status}"
+                return
+            key.last_error = None
+        if units:
+            key.guard.record(units)
+
+    def _can_retry(self):
+        """True while some key is not rejected and its cool-down ends soon enough to wait for"""
+        now = time.monotonic()
+        with self._lock:
+            return any(not key.rejected and key.available_at - now <= MAX_RETRY_AFTER for key in self.keys)
+
+    def request(self, method, build, units=0, **kwargs):
+        """Send build(key) -> (url, requests kwargs) with the next key through the shared client.
+
+        A 401/403 or 429 answer moves the request to another key (or waits for the 429
+        cool-down of the only one); the last response is returned when no key is left,
+        so callers handle errors as with a single key. units are recorded on success.
+        """
+        attempts = len(self.keys) + get_client().retries
+        for attempt in range(attempts):
+            key = self.acquire(units)
+            url, request_kwargs = build(key)
+            request_kwargs.update(kwargs)
+            try:
+                response = get_client().request(method, url, idempotent=True,
+                                                retry_statuses=CLIENT_RETRY_STATUSES, **request_kwargs)
+            except requests.exceptions.RequestException as e:
+                self.report(key, error=e)
+                raise
+            self.report(key, response, units)
+            rotate = response.status_code in REJECT_STATUSES or response.status_code == 429
+            if not rotate or attempt == attempts - 1 or not self._can_retry():
+                return response
+            response.close()
+        return response
+
+    def check(self, units):
+        """QuotaCheck of sending units, against the summed usage and budgets of the usable keys"""
+        keys = [key for key in self.keys if not key.rejected] or self.keys
+        checks = [key.guard.check(0) for key in keys]
+        return evaluate(self.service, sum(check.used for check in checks), units,
+                        sum(check.budget for check in checks))
+
+    def require(self, units):
+        result = self.check(units)
+        if result.status == STATUS_OVER and self.action == ACTION_BLOCK:
+            raise QuotaExceeded(result.message())
+        return result
+
+    def stats(self):
+        """Per key: {'key' (masked), 'id', 'location', 'state', 'requests', 'errors', 'used', 'budget', 'unit', 'last_error'}"""
+        now = time.monotonic()
+        rows = []
+        with self._lock:
+            for key in self.keys:
+                check = key.guard.check(0)
+                if key.rejected:
+                    state = KEY_REJECTED
+                elif key.available_at > now:
+                    state = KEY_COOLING
+                elif check.status == STATUS_OVER or (check.budget and check.used >= check.budget):
+                    state = KEY_OVER_QUOTA
+                else:
+                    state = KEY_ACTIVE
+                rows.append({'key': key.masked, 'id': key_id(key.key), 'location': key.region or key.endpoint or '',
+                             'state': state, 'requests': key.requests, 'errors': key.errors,
+                             'used': check.used, 'budget': check.budget, 'unit': check.unit,
+                             'last_error': key.last_error})
+        return rows
+
+
+def format_pool_stats(service, rows):
+    """'Microsoft Translator' heading and one line per key: 'abcd…wxyz: active, 12,000 / 2,000,000 chars (1%), ...'"""
+    lines = [service]
+    for row in rows:
+        usage = f"{row['used']:,} / {row['budget']:,} {row['unit']}" if row['budget'] else f"{row['used']:,} {row['unit']}"
+        if row['budget']:
+            usage += f" ({row['used'] * 100 // row['budget']}%)"
+        location = f" ({row['location']})" if row['location'] else ""
+        line = f"  {row['key']}{location}: {row['state']}, {usage} this month, {row['requests']} requests"
+        if row['errors']:
+            line += f", {row['errors']} errors (last: {row['last_error'] or 'none'})"
+        lines.append(line)
+    if len(lines) == 1:
+        lines.append("  No API key")
+    return '\n'.join(lines)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_key_pool(service, primary=None, settings=None):
+    """The process-wide pool of service, rebuilt when its keys or limits change in settings"""
+    settings = load_settings() if settings is None else settings
+    entries = pool_entries(service, primary, settings)
+    signature = repr((entries, settings.get('key_rate_limits', {}).get(service),
+                      settings.get('quota_budgets', {}).get(service), settings.get('quota_action')))
+    with _pools_lock:
+        pool = _pools.get(service)
+        if pool is None or pool.signature != signature:
+            pool = KeyPool(service, entries, settings)
+            pool.signature = signature
+            _pools[service] = pool
+        return pool
@@ -36,6 +36,7 @@ class LocalizationManager:
                 "api_key_label": "API Key:",
                 "azure_endpoint_label": "Azure Endpoint:",
                 "description_label": "Description:",
+                "key_usage_label": "API key usage this month:",
                 "image_selection_group": "Image Selection",
                 "ocr_service_label": "OCR Service:",
                 "ocr_settings_group": "OCR Settings",
@@ -61,10 +62,24 @@ class LocalizationManager:
                     '<a href="https://www.youtube.com/results?search_query=google+cloud+translate+api+setup" style="color: #0066CC;">Video guide</a>\n'
                     "Enter the key in the field below."
                 ),
-                "batch_import_tooltip": "Import multiple text files (.txt, .docx) and convert them to audio files. Each file will be processed separately with automatic language detection.",
+                "batch_import_tooltip": "Import multiple text files (.txt, .docx, .pdf, .epub) and convert them to audio files. Each file will be processed separately with automatic language detection.",
+                "batch_filter_placeholder": "Filter...",
+                "watch_folder": "Watch Folder",
+                "watch_folder_tooltip": "Watch folders and convert new or changed .txt/.docx/.pdf/.epub files automatically",
+                "batch_dedup": "Deduplicate",
+                "batch_dedup_tooltip": "Synthesize paragraphs repeated across files only once and assemble outputs from shared audio segments",
+                "batch_pack": "Pack short phrases",
+                "batch_pack_tooltip": "Synthesize many short files (prompts, one-liners) in one request and split the audio back into one file each",
+                "batch_translate": "Translate to",
+                "batch_translate_tooltip": "Translate every file to the selected language before synthesis; the language and voice of each row follow the translation",
+                "chapter_split": "Split into chapters",
+                "chapter_split_tooltip": "Save .docx/.epub documents as one audio file per chapter (headings or EPUB chapters) with an index; unchanged chapters are not rendered again",
+                "translate_speak": "Translate on save",
+                "translate_speak_tooltip": "Save Audio translates the text to the language chosen next to Translate and speaks each part as soon as it is translated, so translation and synthesis overlap",
                 "support_author": "Support Author",
                 "support_author_tooltip": "Support the developer",
                 "translate_button": "Translate",
+                "translate_cancel": "Cancel",
                 "reset_settings_button": "Reset Settings",
                 "reset_settings_tooltip": "Reset voice settings to default values (Speed: 100%, Volume: 100%, Pitch: 0Hz)"
             },
@@ -100,6 +115,7 @@ class LocalizationManager:
                 "api_key_label": "API ключ:",
                 "azure_endpoint_label": "Azure Endpoint:",
                 "description_label": "Описание:",
+                "key_usage_label": "Использование ключей API за месяц:",
                 "image_selection_group": "Выбор изображения",
                 "ocr_service_label": "OCR служба:",
                 "ocr_settings_group": "Настройки OCR",
@@ -125,10 +141,24 @@ class LocalizationManager:
                     '<a href="https://www.youtube.com/results?search_query=google+cloud+translate+api+setup" style="color: #0066CC;">Видео гайд</a>\n'
                     "Введите ключ в поле ниже."
                 ),
-                "batch_import_tooltip": "Импорт нескольких текстовых файлов (.txt, .docx) и конвертация их в аудиофайлы. Каждый файл будет обработан отдельно с автоматическим определением языка.",
+                "batch_import_tooltip": "Импорт нескольких текстовых файлов (.txt, .docx, .pdf, .epub) и конвертация их в аудиофайлы. Каждый файл будет обработан отдельно с автоматическим определением языка.",
+                "batch_filter_placeholder": "Фильтр...",
+                "watch_folder": "Следить за папкой",
+                "watch_folder_tooltip": "Следить за папками и автоматически конвертировать новые или измененные файлы .txt/.docx/.pdf/.epub",
+                "batch_dedup": "Без повторов",
+                "batch_dedup_tooltip": "Озвучивать абзацы, повторяющиеся в разных файлах, только один раз и собирать файлы из общих фрагментов",
+                "batch_pack": "Упаковать короткие фразы",
+                "batch_pack_tooltip": "Озвучивать много коротких файлов (подсказки, однострочники) одним запросом и разрезать звук обратно по файлам",
+                "batch_translate": "Перевести на",
+                "batch_translate_tooltip": "Переводить каждый файл на выбранный язык перед озвучкой; язык и голос строки меняются вместе с переводом",
+                "chapter_split": "Разбить на главы",
+                "chapter_split_tooltip": "Сохранять документы .docx/.epub по одному аудиофайлу на главу (заголовки или главы EPUB) с оглавлением; неизмененные главы не озвучиваются повторно",
+                "translate_speak": "Перевести при сохранении",
+                "translate_speak_tooltip": "«Сохранить аудио» переводит текст на язык, выбранный рядом с кнопкой «Перевести», и озвучивает каждую часть сразу после перевода, так что перевод и озвучивание идут одновременно",
                 "support_author": "Поддержать автора",
                 "support_author_tooltip": "Поддержать разработчика",
                 "translate_button": "Перевести",
+                "translate_cancel": "Отмена",
                 "reset_settings_button": "Сброс настроек",
                 "reset_settings_tooltip": "Сбросить настройки голоса к значениям по умолчанию (Скорость: 100%, Громкость: 100%, Тон: 0Hz)"
             },
@@ -164,6 +194,7 @@ class LocalizationManager:
                 "api_key_label": "API ключ:",
                 "azure_endpoint_label": "Azure Endpoint:",
                 "description_label": "Опис:",
+                "key_usage_label": "Використання ключів API за місяць:",
                 "image_selection_group": "Вибір зображення",
                 "ocr_service_label": "OCR служба:",
                 "ocr_settings_group": "Налаштування OCR",
@@ -189,10 +220,24 @@ class LocalizationManager:
                     '<a href="https://www.youtube.com/results?search_query=google+cloud+translate+api+setup" style="color: #0066CC;">Відео гайд</a>\n'
                     "Введіть ключ у поле нижче."
                 ),
-                "batch_import_tooltip": "Імпорт декількох текстових файлів (.txt, .docx) та конвертація їх в аудіофайли. Кожен файл буде оброблено окремо з автоматичним визначенням мови.",
+                "batch_import_tooltip": "Імпорт декількох текстових файлів (.txt, .docx, .pdf, .epub) та конвертація їх в аудіофайли. Кожен файл буде оброблено окремо з автоматичним визначенням мови.",
+                "batch_filter_placeholder": "Фільтр...",
+                "watch_folder": "Стежити за текою",
+                "watch_folder_tooltip": "Стежити за теками та автоматично конвертувати нові або змінені файли .txt/.docx/.pdf/.epub",
+                "batch_dedup": "Без повторів",
+                "batch_dedup_tooltip": "Озвучувати абзаци, що повторюються в різних файлах, лише один раз і збирати файли зі спільних фрагментів",
+                "batch_pack": "Пакувати короткі фрази",
+                "batch_pack_tooltip": "Озвучувати багато коротких файлів (підказки, однорядкові тексти) одним запитом і розрізати звук назад по файлах",
+                "batch_translate": "Перекласти на",
+                "batch_translate_tooltip": "Перекладати кожен файл вибраною мовою перед озвученням; мова й голос рядка змінюються разом із перекладом",
+                "chapter_split": "Розбити на розділи",
+                "chapter_split_tooltip": "Зберігати документи .docx/.epub по одному аудіофайлу на розділ (заголовки або розділи EPUB) зі змістом; незмінені розділи не озвучуються повторно",
+                "translate_speak": "Перекласти при збереженні",
+                "translate_speak_tooltip": "«Зберегти аудіо» перекладає текст мовою, вибраною поруч із кнопкою «Перекласти», і озвучує кожну частину одразу після перекладу, тож переклад і озвучування йдуть одночасно",
                 "support_author": "Підтримати автора",
                 "support_author_tooltip": "Підтримати розробника",
                 "translate_button": "Перекласти",
+                "translate_cancel": "Скасувати",
                 "reset_settings_button": "Скинути налаштування",
                 "reset_settings_tooltip": "Скинути налаштування голосу до значень за замовчуванням (Швидкість: 100%, Гучність: 100%, Тон: 0Hz)"
             }
@@ -252,6 +297,26 @@ class LocalizationManager:
             main_window.batchModelLabel.setText(self.get_text("default_model"))
         if hasattr(main_window, 'batchInfoLabel') and main_window.batchInfoLabel is not None:
             main_window.batchInfoLabel.setText(self.get_text("batch_import_tooltip"))
+        if hasattr(main_window, 'batchFilterInput') and main_window.batchFilterInput is not None:
+            main_window.batchFilterInput.setPlaceholderText(self.get_text("batch_filter_placeholder"))
+        if hasattr(main_window, 'batchWatchButton') and main_window.batchWatchButton is not None:
+            main_window.batchWatchButton.setText(self.get_text("watch_folder"))
+            main_window.batchWatchButton.setToolTip(self.get_text("watch_folder_tooltip"))
+        if hasattr(main_window, 'batchDedupCheckBox') and main_window.batchDedupCheckBox is not None:
+            main_window.batchDedupCheckBox.setText(self.get_text("batch_dedup"))
+            main_window.batchDedupCheckBox.setToolTip(self.get_text("batch_dedup_tooltip"))
+        if hasattr(main_window, 'batchPackCheckBox') and main_window.batchPackCheckBox is not None:
+            main_window.batchPackCheckBox.setText(self.get_text("batch_pack"))
+            main_window.batchPackCheckBox.setToolTip(self.get_text("batch_pack_tooltip"))
+        if hasattr(main_window, 'batchTranslateCheckBox') and main_window.batchTranslateCheckBox is not None:
+            main_window.batchTranslateCheckBox.setText(self.get_text("batch_translate"))
+            main_window.batchTranslateCheckBox.setToolTip(self.get_text("batch_translate_tooltip"))
+        if hasattr(main_window, 'chapterSplitCheckBox') and main_window.chapterSplitCheckBox is not None:
+            main_window.chapterSplitCheckBox.setText(self.get_text("chapter_split"))
+            main_window.chapterSplitCheckBox.setToolTip(self.get_text("chapter_split_tooltip"))
+        if hasattr(main_window, 'translateSpeakCheckBox') and main_window.translateSpeakCheckBox is not None:
+            main_window.translateSpeakCheckBox.setText(self.get_text("translate_speak"))
+            main_window.translateSpeakCheckBox.setToolTip(self.get_text("translate_speak_tooltip"))
 
         # Translator buttons
         if hasattr(main_window, 'translatorRegisterButton') and main_window.translatorRegisterButton is not None:
@@ -290,6 +355,8 @@ class LocalizationManager:
             main_window.translatorApiLabel.setText(self.get_text("api_key_label"))
         if hasattr(main_window, 'translatorDescriptionLabel') and main_window.translatorDescriptionLabel is not None:
             main_window.translatorDescriptionLabel.setText(self.get_text("description_label"))
+        if hasattr(main_window, 'keyUsageLabel') and main_window.keyUsageLabel is not None:
+            main_window.keyUsageLabel.setText(self.get_text("key_usage_label"))
         if hasattr(main_window, 'ocrServiceLabel') and main_window.ocrServiceLabel is not None:
             main_window.ocrServiceLabel.setText(self.get_text("ocr_service_label"))
         if hasattr(main_window, 'ocrApiKeyLabel') and main_window.ocrApiKeyLabel is not None:
@@ -0,0 +1,204 @@
+"""
+CSV/JSONL manifest import: one synthesis job per row with its own text, output name,
+language, voice and rate/volume/pitch.
+
+Manifests are parsed as a stream. Rows become compact BatchItem records that keep only
+the byte offset of their row; the text is read back from the manifest when the row is
+synthesized, so memory does not grow with the manifest.
+
+Columns (CSV header or JSON keys): id, text (required), language, voice, rate, volume,
+pitch, output. Nothing in this module imports PyQt5.
+"""
+import io
+import os
+import csv
+import json
+from core.batch_items import BatchItem
+from core.voices import LANGUAGES, LANG_CODES, DETECTED_LANGUAGES, detect_language, default_batch_voice, batch_voice_options
+
+MANIFEST_EXTENSIONS = ('.csv', '.jsonl')
+MANIFEST_FIELDS = ('id', 'text', 'language', 'voice', 'rate', 'volume', 'pitch', 'output')
+
+# Language names and codes accepted in the language column
+_LANGUAGE_ALIASES = {name.lower(): name for name in LANGUAGES}
+_LANGUAGE_ALIASES.update({code: name for name, code in LANG_CODES.items()})
+_LANGUAGE_ALIASES.update(DETECTED_LANGUAGES)
+
+
+class ManifestError(ValueError):
+    """Invalid manifest row"""
+
+
+def _read_csv_record(f):
+    """Read one CSV record (quoted fields may span lines); returns bytes or b'' at the end"""
+    record = f.readline()
+    while record and record.count(b'"') % 2:
+        line = f.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _parse_csv_record(record, header=None):
+    row = next(csv.reader(io.StringIO(record.decode('utf-8-sig'))), [])
+    if header is None:
+        return row
+    return dict(zip(header, row))
+
+
+def _csv_header(f):
+    header = [name.strip().lower() for name in _parse_csv_record(_read_csv_record(f))]
+    if 'text' not in header:
+        raise ManifestError("CSV manifest needs a 'text' column")
+    return header
+
+
+def iter_manifest_records(path):
+    """Yield (line number, byte offset, record dict or None, error or None) for every row"""
+    with open(path, 'rb') as f:
+        header = _csv_header(f) if path.endswith('.csv') else None
+        line_number = 1 if header else 0
+        while True:
+            offset = f.tell()
+            record = _read_csv_record(f) if header else f.readline()
+            if not record:
+                return
+            first_line = line_number + 1
+            line_number += max(1, record.count(b'\n'))
+            if not record.strip():
+                continue
+            try:
+                if header:
+                    yield first_line, offset, _parse_csv_record(record, header), None
+                else:
+                    data = json.loads(record)
+                    if not isinstance(data, dict):
+                        raise ValueError("row is not a JSON object")
+                    yield first_line, offset, {str(key).lower(): value for key, value in data.items()}, None
+            except (ValueError, csv.Error) as e:
+                yield first_line, offset, None, str(e)
+
+
+def manifest_text_column(path):
+    """Index of the text column of a CSV manifest (None for JSONL), read once per manifest"""
+    if not path.endswith('.csv'):
+        return None
+    with open(path, 'rb') as f:
+        return _csv_header(f).index('text')
+
+
+def read_manifest_text(path, offset, text_column=None):
+    """Text of the row starting at byte offset (what BatchItem.load_text calls).
+
+    text_column comes from manifest_text_column; without it the CSV header is parsed again.
+    """
+    with open(path, 'rb') as f:
+        if path.endswith('.csv'):
+            if text_column is None:
+                text_column = _csv_header(f).index('text')
+            f.seek(offset)
+            row = _parse_csv_record(_read_csv_record(f))
+            return row[text_column] if text_column < len(row) else ''
+        f.seek(offset)
+        return str(json.loads(f.readline()).get('text', ''))
+
+
+def _number(value, name, low, high, cast=float, suffixes=()):
+    """Parse an optional numeric column; '' / None mean 'use the default'"""
+    if value is None or value == '':
+        return None
+    text = str(value).strip()
+    for suffix in suffixes:
+        if text.lower().endswith(suffix):
+            text = text[:-len(suffix)]
+    try:
+        number = cast(float(text))
+    except ValueError:
+        raise ManifestError(f"{name} must be a number, got {value!r}")
+    if not low <= number <= high:
+        raise ManifestError(f"{name} must be between {low} and {high}, got {value!r}")
+    return number
+
+
+def parse_rate(value):
+    """Speed multiplier from 1.2 or an Edge style '+20%'"""
+    if isinstance(value, str) and value.strip().endswith('%'):
+        percent = _number(value, "rate", -50, 100, suffixes=('%',))
+        return None if percent is None else 1 + percent / 100
+    return _number(value, "rate", 0.5, 2.0)
+
+
+def check_voice(voice, language, model="Edge TTS"):
+    """Batch voice labels are per language, so a label must belong to the row's language"""
+    if voice.endswith("Neural") or voice.lower() in ("male", "female"):
+        return
+    if voice not in batch_voice_options(model, language):
+        raise ManifestError(f"unknown voice {voice!r} for {language} "
+                            "(use an Edge voice name, a batch label of that language or male/female)")
+
+
+def validate_record(record, model="Edge TTS"):
+    """Check one manifest record; returns (id, text, language or None, voice or None, speed, volume, pitch, output).
+
+    Without a language column the voice is checked by iter_manifest once the language is detected.
+    """
+    text = str(record.get('text') or '').strip()
+    if not text:
+        raise ManifestError("empty text")
+
+    language = record.get('language') or None
+    if language:
+        language = _LANGUAGE_ALIASES.get(str(language).strip().lower())
+        if language is None:
+            raise ManifestError(f"unsupported language {record.get('language')!r}")
+
+    voice = str(record.get('voice') or '').strip() or None
+    if voice and language:
+        check_voice(voice, language, model)
+
+    speed = parse_rate(record.get('rate'))
+    volume = _number(record.get('volume'), "volume", 0, 100, cast=int, suffixes=('%',))
+    pitch = _number(record.get('pitch'), "pitch", -50, 50, cast=int, suffixes=('hz',))
+
+    row_id = str(record.get('id') or '').strip()
+    output = str(record.get('output') or '').strip()
+    for name, value in (("id", row_id), ("output", output)):
+        # Absolute outputs are used as they are, relative ones must stay in the output folder
+        if value and not os.path.isabs(value) and '..' in value.replace('\\', '/').split('/'):
+            raise ManifestError(f"{name} {value!r} leaves the output folder")
+    return row_id, text, language, voice, speed, volume, pitch, output
+
+
+def iter_manifest(path, model="Edge TTS", output_dir=None):
+    """Yield (BatchItem, None) for valid rows and (None, 'line N: error') for invalid ones"""
+    stat = os.stat(path)
+    text_column = manifest_text_column(path)
+    for line_number, offset, record, error in iter_manifest_records(path):
+        if error:
+            yield None, f"line {line_number}: {error}"
+            continue
+        try:
+            row_id, text, language, voice, speed, volume, pitch, output = validate_record(record, model)
+        except ManifestError as e:
+            yield None, f"line {line_number}: {e}"
+            continue
+        if language is None:
+            language = detect_language(text) or "English"
+            if voice:
+                try:
+                    check_voice(voice, language, model)
+                except ManifestError as e:
+                    yield None, f"line {line_number}: {e}"
+                    continue
+        row_id = row_id or f"row_{line_number}"
+        item = BatchItem(path, 0, stat.st_mtime, len(text), language, model,
+                         voice or default_batch_voice(model, language), output_dir)
+        item.row_id = row_id
+        item.text_offset = offset
+        item.text_column = text_column
+        item.speed = speed
+        item.volume = volume
+        item.pitch = pitch
+        item.output_name = output or f"{row_id}.wav"
+        yield item, None
@@ -0,0 +1,191 @@
+"""
+Minimal MPEG audio frame parsing (the format Edge TTS returns), used to cut and join
+audio on frame boundaries without decoding.
+Nothing in this module imports PyQt5.
+"""
+
+# Bitrates in kbps by [version row][layer][index]; version row 0 - MPEG-1, 1 - MPEG-2/2.5
+_BITRATES = (
+    {1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+     2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+     3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)},
+    {1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+     2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+     3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)},
+)
+# Sample rates by version bits (0 - MPEG-2.5, 2 - MPEG-2, 3 - MPEG-1)
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+
+class Mp3Frame:
+    """Location and timing of one MPEG audio frame"""
+    __slots__ = ('offset', 'length', 'samples', 'sample_rate', 'bitrate')
+
+    def __init__(self, offset, length, samples, sample_rate, bitrate):
+        self.offset = offset
+        self.length = length
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.bitrate = bitrate
+
+    @property
+    def duration(self):
+        return self.samples / self.sample_rate
+
+
+def parse_frame_header(data, offset=0):
+    """Parse the 4-byte frame header at offset; returns Mp3Frame or None if it is not one"""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 3
+    layer = 4 - ((b1 >> 1) & 3)  # 1, 2 or 3; 4 means reserved
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    padding = (b2 >> 1) & 1
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    bitrate = _BITRATES[0 if version == 3 else 1][layer][bitrate_index] * 1000
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if (layer == 3 and version != 3) else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    return Mp3Frame(offset, length, samples, sample_rate, bitrate)
+
+
+def id3v2_size(data):
+    """Size of a leading ID3v2 tag (header included), 0 when there is none"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def id3v1_size(data):
+    """Size of a trailing ID3v1 tag, 0 when there is none"""
+    return 128 if len(data) >= 128 and data[len(data) - 128:len(data) - 125] == b'TAG' else 0
+
+
+def iter_frames(data):
+    """Yield Mp3Frame for every frame in data, skipping ID3 tags and resyncing over garbage"""
+    offset = id3v2_size(data)
+    end = len(data) - id3v1_size(data)
+    while offset + 4 <= end:
+        frame = parse_frame_header(data, offset)
+        if frame is not None and frame.length >= 4:
+            if offset + frame.length > end:
+                return  # Truncated last frame
+            yield frame
+            offset += frame.length
+            continue
+        next_sync = data.find(b'\xff', offset + 1)
+        if next_sync < 0:
+            return
+        offset = next_sync
+
+
+def split_at_times(data, cut_times):
+    """Split MP3 data at the given times (seconds, ascending) on frame boundaries.
+
+    Returns len(cut_times) + 1 byte strings; each cut goes to the first frame starting
+    at or after its time.
+    """
+    frames = list(iter_frames(data))
+    pieces = []
+    start_offset = frames[0].offset if frames else 0
+    position = 0.0
+    index = 0
+    for cut in cut_times:
+        while index < len(frames) and position < cut:
+            position += frames[index].duration
+            index += 1
+        cut_offset = frames[index].offset if index < len(frames) else len(data)
+        pieces.append(bytes(data[start_offset:cut_offset]))
+        start_offset = cut_offset
+    pieces.append(bytes(data[start_offset:]))
+    return pieces
+
+
+def side_info_size(data, offset=0):
+    """Layer III side information length of the frame at offset (where a Xing/Info tag starts)"""
+    mpeg1 = (data[offset + 1] >> 3) & 3 == 3
+    mono = data[offset + 3] >> 6 == 3
+    if mpeg1:
+        return 17 if mono else 32
+    return 9 if mono else 17
+
+
+def same_stream_format(data, offset, other, other_offset):
+    """True when two frame headers agree on version, layer, sample rate and channel mode"""
+    return (data[offset + 1] & 0xFE == other[other_offset + 1] & 0xFE
+            and data[offset + 2] & 0x0C == other[other_offset + 2] & 0x0C
+            and data[offset + 3] >> 6 == other[other_offset + 3] >> 6)
+
+
+def parse_info_tag(data, frame):
+    """Xing/Info (+ LAME) tag of a frame, or None when the frame is ordinary audio.
+
+    Returns a dict with 'frames' and 'bytes' (None when absent) and, for LAME style tags,
+    'encoder' (9 bytes), 'delay' and 'padding' in samples.
+    """
+    start = frame.offset + 4 + side_info_size(data, frame.offset)
+    end = frame.offset + frame.length
+    if start + 8 > end or bytes(data[start:start + 4]) not in (b'Xing', b'Info'):
+        return None
+    flags = int.from_bytes(data[start + 4:start + 8], 'big')
+    position = start + 8
+    info = {'frames': None, 'bytes': None, 'encoder': None, 'delay': None, 'padding': None}
+    for flag, name in ((1, 'frames'), (2, 'bytes')):
+        if flags & flag:
+            info[name] = int.from_bytes(data[position:position + 4], 'big')
+            position += 4
+    position += (100 if flags & 4 else 0) + (4 if flags & 8 else 0)
+    if position + 24 <= end and data[position:position + 4] != b'\0\0\0\0':
+        delay_bytes = data[position + 21:position + 24]
+        info['encoder'] = bytes(data[position:position + 9])
+        info['delay'] = delay_bytes[0] << 4 | delay_bytes[1] >> 4
+        info['padding'] = (delay_bytes[1] & 0x0F) << 8 | delay_bytes[2]
+    return info
+
+
+def _lame_crc16(data):
+    """CRC-16 (polynomial 0x8005, reflected) used by the LAME tag"""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def build_info_frame(header, frames, size, encoder=None, delay=0, padding=0):
+    """Silent frame carrying an Info tag (frame count, stream size) for a stream-copied file.
+
+    header is the 4-byte header of the stream's audio frames; the tag frame reuses its
+    format with a bitrate large enough to hold the tag. A LAME extension with encoder
+    delay/padding is added when encoder (the source's 9-byte encoder string) is given,
+    so gapless players trim the joined stream like the original one.
+    """
+    b1, b2, b3 = header[1] | 1, header[2] & 0x0C, header[3]  # No CRC, no padding
+    frame = None
+    for bitrate_index in range(1, 15):
+        candidate = bytes((0xFF, b1, b2 | bitrate_index << 4, b3))
+        frame = parse_frame_header(candidate)
+        if frame is not None and frame.length >= 192:
+            break
+    data = bytearray(frame.length)
+    data[:4] = candidate
+    position = 4 + side_info_size(data)
+    data[position:position + 16] = b'Info' + (3).to_bytes(4, 'big') + frames.to_bytes(4, 'big') + size.to_bytes(4, 'big')
+    if encoder:
+        lame = position + 16
+        data[lame:lame + 9] = encoder[:9].ljust(9, b' ')
+        data[lame + 21:lame + 24] = bytes((delay >> 4 & 0xFF, (delay & 0x0F) << 4 | padding >> 8 & 0x0F, padding & 0xFF))
+        data[lame + 34:lame + 36] = _lame_crc16(data[:190]).to_bytes(2, 'big')
+    return bytes(data)
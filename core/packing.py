@@ -0,0 +1,236 @@
+"""
+Micro-batch packing: many short same-voice phrases are synthesized in one Edge TTS
+request and the audio is cut back into one file per phrase using WordBoundary timing.
+
+run_packed_batch is a drop-in replacement for core.batch.run_batch; callers get the
+same per-file outputs and job records, only with far fewer requests. Packs whose
+boundaries cannot be matched to phrases fall back to one request per phrase.
+Nothing in this module imports PyQt5.
+"""
+import os
+import time
+import asyncio
+from bisect import bisect_right
+from core.voices import detect_language, resolve_voice
+from core.synthesis import synthesize_with_boundaries
+from core.mp3 import split_at_times
+from core.batch import (run_job, retry_async, synthesize_with_retries, load_job_text, job_settings,
+                        STATUS_DONE, STATUS_SKIPPED, STATUS_FAILED)
+
+# Only texts up to this length are packed; longer ones gain nothing from it
+PACK_MAX_PHRASE_CHARS = 200
+# Limits of one packed request (Edge TTS splits longer texts into several requests itself)
+PACK_MAX_CHARS = 2000
+PACK_MAX_PHRASES = 40
+# Paragraph break between phrases, spoken as a pause the cut can fall into
+PACK_SEPARATOR = "\n\n"
+_TERMINATORS = ('.', '!', '?', '…', ';', ':', '。', '！', '？')
+
+
+class PackingError(Exception):
+    """Word boundaries of a packed request could not be matched to its phrases"""
+
+
+def group_phrases(phrases, max_chars=PACK_MAX_CHARS, max_phrases=PACK_MAX_PHRASES):
+    """Split phrases into consecutive packs within the request limits; returns lists of indexes"""
+    packs = []
+    current = []
+    size = 0
+    for index, phrase in enumerate(phrases):
+        added = len(phrase) + len(PACK_SEPARATOR)
+        if current and (size + added > max_chars or len(current) >= max_phrases):
+            packs.append(current)
+            current = []
+            size = 0
+        current.append(index)
+        size += added
+    if current:
+        packs.append(current)
+    return packs
+
+
+def pack_text(phrases):
+    """Join phrases for one request; returns (text, start offset of every phrase)"""
+    parts = []
+    starts = []
+    position = 0
+    for phrase in phrases:
+        phrase = phrase.strip()
+        if not phrase.endswith(_TERMINATORS):
+            phrase += '.'  # Sentence end keeps Edge TTS from running phrases together
+        if parts:
+            position += len(PACK_SEPARATOR)
+        starts.append(position)
+        parts.append(phrase)
+        position += len(phrase)
+    return PACK_SEPARATOR.join(parts), starts
+
+
+def cut_times(text, starts, boundaries):
+    """Times between consecutive phrases, from WordBoundary events.
+
+    Each boundary word is located in the packed text to find its phrase; the cut is the
+    middle of the pause between the last word of a phrase and the first word of the next.
+    Words missing from the text (normalized numbers, abbreviations) are skipped; one that
+    falls between two phrases could belong to either, so it raises PackingError, as does
+    a phrase without words or words out of order.
+    """
+    first = [None] * len(starts)
+    last = [None] * len(starts)
+    cursor = 0
+    previous_phrase = 0
+    unmatched = False
+    for offset, duration, word in boundaries:
+        position = text.find(word, cursor) if word else -1
+        if position < 0:
+            unmatched = True
+            continue
+        phrase = bisect_right(starts, position) - 1
+        cursor = position + len(word)
+        if phrase < previous_phrase:
+            raise PackingError("Word boundaries out of order")
+        if unmatched and phrase != previous_phrase and first[previous_phrase] is not None:
+            raise PackingError(f"Unmatched word boundary before phrase {phrase + 1}")
+        unmatched = False
+        previous_phrase = phrase
+        if first[phrase] is None:
+            first[phrase] = offset
+        last[phrase] = offset + duration
+    if None in first:
+        raise PackingError(f"No word boundaries for phrase {first.index(None) + 1}")
+    return [(last[i] + first[i + 1]) / 2 for i in range(len(starts) - 1)]
+
+
+async def synthesize_pack(phrases, voice, speed=1.0, volume=100, pitch=0, retries=0):
+    """Synthesize phrases in one request; returns (one MP3 byte string per phrase, retries used)
+
+    Only the request is retried: a PackingError comes from the cut and would only repeat.
+    """
+    text, starts = pack_text(phrases)
+    (audio, boundaries), attempts = await retry_async(
+        lambda: synthesize_with_boundaries(text, voice, speed=speed, volume=volume, pitch=pitch), retries)
+    if not audio:
+        raise PackingError("No audio received")
+    return split_at_times(audio, cut_times(text, starts, boundaries)), attempts
+
+
+async def synthesize_phrases(phrases, output_files, voice, speed=1.0, volume=100, pitch=0, retries=2):
+    """Write every phrase to its output file using one request per pack.
+
+    Returns (sizes, retries used per phrase); a pack that cannot be cut is synthesized
+    phrase by phrase. The retries of a shared request are charged to its first phrase only.
+    """
+    sizes = [0] * len(phrases)
+    used_retries = [0] * len(phrases)
+    for pack in group_phrases(phrases):
+        pack_phrases = [phrases[i] for i in pack]
+        try:
+            pieces, attempts = await synthesize_pack(pack_phrases, voice, speed=speed, volume=volume, pitch=pitch,
+                                                     retries=retries)
+            used_retries[pack[0]] += attempts
+        except PackingError:
+            pieces = None
+        for position, index in enumerate(pack):
+            if pieces is None:
+                sizes[index], attempts = await synthesize_with_retries(
+                    phrases[index], voice, output_files[index], speed=speed, volume=volume, pitch=pitch, retries=retries)
+                used_retries[index] += attempts
+                continue
+            with open(output_files[index], 'wb') as f:
+                f.write(pieces[position])
+            sizes[index] = len(pieces[position])
+    return sizes, used_retries
+
+
+def _prepare_job(job):
+    """Read, detect and resolve one job; returns its text when it is short enough to pack"""
+    text = load_job_text(job)
+    if not text.strip():
+        job['status'] = STATUS_SKIPPED
+        job['error'] = "Empty document"
+        return None
+    if len(text) > PACK_MAX_PHRASE_CHARS:
+        return None  # Synthesized on its own by run_job, which reads it again
+    job['chars'] = len(text)
+    if not job['language']:
+        job['language'] = detect_language(text) or "English"
+    job['voice'] = resolve_voice(job['voice'], job['language'], job['model'])
+    return text
+
+
+async def run_packed_batch(jobs, parallelism=1, speed=1.0, volume=100, pitch=0, retries=2,
+                           on_job_done=None, on_progress=None):
+    """Run jobs like core.batch.run_batch, packing short same-voice texts into shared requests"""
+    semaphore = asyncio.Semaphore(max(1, parallelism))
+    queued_at = time.monotonic()
+    for job in jobs:
+        job['queued_at'] = queued_at
+    done_count = 0
+
+    def finish(job):
+        nonlocal done_count
+        done_count += 1
+        if on_job_done:
+            on_job_done(job)
+        if on_progress:
+            on_progress(done_count, len(jobs))
+
+    # Short texts grouped by voice and settings (pack order follows job order within a group)
+    groups = {}
+    single = []
+    for job in jobs:
+        try:
+            text = await asyncio.to_thread(_prepare_job, job)
+        except Exception as e:
+            job['status'] = STATUS_FAILED
+            job['error'] = str(e)
+            text = None
+        if job['status'] is not None:
+            finish(job)
+        elif text is None:
+            single.append(job)
+        else:
+            key = (job['voice'],) + job_settings(job, speed, volume, pitch)
+            groups.setdefault(key, []).append((job, text))
+
+    async def run_single(job):
+        async with semaphore:
+            await run_job(job, speed=speed, volume=volume, pitch=pitch, retries=retries)
+        finish(job)
+
+    async def run_pack(key, entries):
+        voice, pack_speed, pack_volume, pack_pitch = key
+        async with semaphore:
+            started = time.monotonic()
+            for job, _ in entries:
+                job['queue_wait'] = round(started - job['queued_at'], 3)
+                output_dir = os.path.dirname(job['output'])
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+            try:
+                sizes, used_retries = await synthesize_phrases(
+                    [text for _, text in entries], [job['output'] for job, _ in entries],
+                    voice, speed=pack_speed, volume=pack_volume, pitch=pack_pitch, retries=retries)
+                error = None
+            except Exception as e:
+                sizes, used_retries, error = [0] * len(entries), [0] * len(entries), str(e)
+            # Request time is shared evenly by the phrases of the pack
+            seconds = round((time.monotonic() - started) / len(entries), 3)
+        for (job, _), size, job_retries in zip(entries, sizes, used_retries):
+            job['seconds'] = seconds
+            job['retries'] = job_retries
+            if error:
+                job['status'] = STATUS_FAILED
+                job['error'] = error
+            else:
+                job['bytes'] = size
+                job['status'] = STATUS_DONE
+            finish(job)
+
+    # Groups are split into packs before scheduling so packs run in parallel
+    tasks = [run_single(job) for job in single]
+    for key, entries in groups.items():
+        for pack in group_phrases([text for _, text in entries]):
+            tasks.append(run_pack(key, [entries[i] for i in pack]))
+    await asyncio.gather(*tasks)
+    return jobs
@@ -0,0 +1,85 @@
+"""
+PDF text extraction for the import paths.
+
+Pages with a text layer are extracted in a process pool, a few pages per task, and
+yielded strictly in page order as soon as they are ready, so synthesis of the first
+pages can start while later ones are still being parsed. Pages without a text layer
+(scans) are rendered to PNG and handed to an OCR callback.
+Requires PyMuPDF (pip install pymupdf). Nothing in this module imports PyQt5.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Pages extracted by one pool task
+PAGES_PER_TASK = 4
+# Resolution scanned pages are rendered at for OCR
+OCR_DPI = 300
+# Documents up to this many pages are read in-process, a pool would only add start-up time
+MIN_PAGES_FOR_POOL = 16
+
+
+def _open_pdf(file_path):
+    try:
+        import fitz
+    except ImportError:
+        raise Exception("PDF support requires PyMuPDF. Run: pip install pymupdf")
+    return fitz.open(file_path)
+
+
+def pdf_page_count(file_path):
+    with _open_pdf(file_path) as doc:
+        return doc.page_count
+
+
+def _extract_pages(file_path, start, stop, render_scans):
+    """Pool task: [(text, png bytes or None)] for pages start..stop-1"""
+    pages = []
+    with _open_pdf(file_path) as doc:
+        for number in range(start, stop):
+            page = doc.load_page(number)
+            text = page.get_text().strip()
+            image = None
+            if not text and render_scans:
+                image = page.get_pixmap(dpi=OCR_DPI).tobytes('png')
+            pages.append((text, image))
+    return pages
+
+
+def iter_pdf_pages(file_path, ocr=None, workers=None):
+    """Yield the text of every page in order.
+
+    ocr(png_bytes) -> str is called for pages without a text layer; without it such
+    pages yield an empty string. At most 2 * workers tasks are in flight, which
+    bounds memory for documents of any length.
+    """
+    page_count = pdf_page_count(file_path)
+    render_scans = ocr is not None
+
+    def resolve(pages):
+        for text, image in pages:
+            if image is not None:
+                text = (ocr(image) or '').strip()
+            yield text
+
+    if page_count <= MIN_PAGES_FOR_POOL:
+        yield from resolve(_extract_pages(file_path, 0, page_count, render_scans))
+        return
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PAGES_PER_TASK)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        next_range = 0
+        try:
+            while next_range < len(ranges) or pending:
+                while next_range < len(ranges) and len(pending) < 2 * workers:
+                    start, stop = ranges[next_range]
+                    pending.append(pool.submit(_extract_pages, file_path, start, stop, render_scans))
+                    next_range += 1
+                # Oldest task first keeps page order; later tasks keep running meanwhile
+                yield from resolve(pending.pop(0).result())
+        finally:
+            # Reader stopped early (cancelled batch): do not parse the rest of the document
+            for future in pending:
+                future.cancel()
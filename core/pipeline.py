@@ -0,0 +1,426 @@
+"""
+Staged batch pipeline: read -> detect -> (translate) -> synthesize -> write.
+
+Every stage is a pool of asyncio workers with its own concurrency, connected to the
+next stage by a bounded queue, so reading and language detection (disk/CPU, run in
+threads) overlap with synthesis (network) and writing (disk). A MemoryBudget counts the
+text and audio held between stages; the read stage waits while the budget is exceeded,
+which holds back the whole pipeline until synthesis and writing catch up. Queue depths,
+active workers and buffered bytes are reported through on_stats for tuning.
+
+PDFs travel as one item per page: pages are extracted as the budget allows, share the
+language detected on the first page, and the writer appends their audio to the output
+in page order, so a document of any length is never held whole.
+
+run_pipeline_batch is a drop-in replacement for core.batch.run_batch.
+Nothing in this module imports PyQt5.
+"""
+import os
+import sys
+import time
+import asyncio
+from core.voices import detect_language, resolve_voice, voice_gender
+from core.synthesis import synthesize_to_bytes
+from core.documents import iter_document
+from core.batch import load_job_text, job_settings, retry_async, STATUS_DONE, STATUS_SKIPPED, STATUS_FAILED
+
+STAGES = ('read', 'detect', 'translate', 'synthesize', 'write')
+# Workers per stage; synthesize defaults to the batch parallelism
+DEFAULT_CONCURRENCY = {'read': 2, 'detect': 1, 'translate': 2, 'write': 1}
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+STATS_INTERVAL = 0.5
+# Documents read page by page (manifest rows are always read whole)
+PAGED_TYPES = ('.pdf',)
+
+
+class MemoryBudget:
+    """Byte counter for data buffered between stages.
+
+    Only the stage that brings new data in waits (wait_below); later stages charge what
+    they produce without waiting, so the pipeline can always drain and never deadlocks.
+    """
+
+    def __init__(self, limit=DEFAULT_MEMORY_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self._released = asyncio.Condition()
+
+    def charge(self, size):
+        self.used += size
+        self.peak = max(self.peak, self.used)
+
+    async def release(self, size):
+        self.used -= size
+        async with self._released:
+            self._released.notify_all()
+
+    async def wait_below(self):
+        """Wait until buffered data is under the limit (an empty pipeline always proceeds)"""
+        async with self._released:
+            await self._released.wait_for(lambda: self.used < self.limit or self.used <= 0)
+
+
+class _Item:
+    """A job, or one page of a paged document, travelling through the pipeline with its text and audio"""
+    __slots__ = ('job', 'document', 'part', 'language', 'voice', 'text', 'audio', 'charged')
+
+    def __init__(self, job, document=None, part=0):
+        self.job = job
+        self.document = document  # _Document of a page, None for a whole job
+        self.part = part
+        self.language = None
+        self.voice = None
+        self.text = None
+        self.audio = None
+        self.charged = 0
+
+
+class _Document:
+    """State shared by the page items of one paged job"""
+    __slots__ = ('item', 'parts', 'in_flight', 'written', 'pending', 'temp_file', 'out', 'language',
+                 'lock', 'read_done', 'settled', 'error')
+
+    def __init__(self, item):
+        self.item = item  # The job's own item, finished once all pages are written
+        self.parts = 0  # Pages sent on so far
+        self.in_flight = 0  # Pages sent on and not yet written or dropped
+        self.written = 0
+        self.pending = {}  # Part -> synthesized page waiting for the pages before it
+        self.temp_file = item.job['output'] + '.part'
+        self.out = None
+        self.language = None  # Detected on the first page, used for all
+        self.lock = asyncio.Lock()
+        self.read_done = False
+        self.settled = False
+        self.error = None
+
+
+class BatchPipeline:
+    """One pipeline run over a list of job dicts (see core.batch.make_job)"""
+
+    def __init__(self, jobs, parallelism=2, speed=1.0, volume=100, pitch=0, retries=2,
+                 concurrency=None, queue_size=DEFAULT_QUEUE_SIZE, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 translate=None, ocr=None, on_job_done=None, on_progress=None, on_stats=None):
+        self.jobs = jobs
+        self.speed = speed
+        self.volume = volume
+        self.pitch = pitch
+        self.retries = retries
+        self.translate = translate  # async (text, language) -> (text, language), or None
+        self.ocr = ocr
+        self.on_job_done = on_job_done
+        self.on_progress = on_progress
+        self.on_stats = on_stats
+        self.concurrency = dict(DEFAULT_CONCURRENCY, synthesize=max(1, parallelism))
+        self.concurrency.update(concurrency or {})
+        self.stages = [stage for stage in STAGES if stage != 'translate' or translate]
+        self.queue_size = queue_size
+        self.memory_budget = memory_budget
+        self.budget = None
+        self.queues = {}
+        self.active = dict.fromkeys(self.stages, 0)
+        self.done_count = 0
+        self._last_stats = 0.0
+
+    def stats(self):
+        """Queue depth in front of every stage, busy workers and buffered bytes"""
+        return {
+            'queued': {stage: self.queues[stage].qsize() for stage in self.queues},
+            'active': dict(self.active),
+            'memory_used': self.budget.used if self.budget else 0,
+            'memory_peak': self.budget.peak if self.budget else 0,
+            'memory_budget': self.memory_budget,
+            'done': self.done_count,
+            'total': len(self.jobs)
+        }
+
+    def report_stats(self, force=False):
+        now = time.monotonic()
+        if self.on_stats and (force or now - self._last_stats >= STATS_INTERVAL):
+            self._last_stats = now
+            self.on_stats(self.stats())
+
+    async def finish(self, item):
+        await self.budget.release(item.charged)
+        item.charged = 0
+        item.text = item.audio = None
+        self.done_count += 1
+        if self.on_job_done:
+            self.on_job_done(item.job)
+        if self.on_progress:
+            self.on_progress(self.done_count, len(self.jobs))
+        self.report_stats(force=self.done_count == len(self.jobs))
+
+    async def fail(self, item, error):
+        if item.document is not None:
+            item.document.error = item.document.error or str(error)
+            await self.drop_page(item)
+            return
+        item.job['status'] = STATUS_FAILED
+        item.job['error'] = str(error)
+        await self.finish(item)
+
+    async def release_page(self, item):
+        await self.budget.release(item.charged)
+        item.charged = 0
+        item.text = item.audio = None
+        item.document.in_flight -= 1
+
+    async def drop_page(self, item):
+        """Discard a page of a failed document"""
+        await self.release_page(item)
+        await self.settle(item.document)
+
+    async def settle(self, document):
+        """Finish a paged job once it is read and every page is written or dropped"""
+        while document.error and document.pending:
+            await self.release_page(document.pending.popitem()[1])
+        if document.settled or not document.read_done or document.in_flight:
+            return
+        document.settled = True
+        job = document.item.job
+        if document.out is not None:
+            await asyncio.to_thread(document.out.close)
+        if document.error:
+            job['status'] = STATUS_FAILED
+            job['error'] = document.error
+            if os.path.exists(document.temp_file):
+                os.remove(document.temp_file)
+        elif not document.parts:
+            job['status'] = STATUS_SKIPPED
+            job['error'] = "Empty document"
+        else:
+            os.replace(document.temp_file, job['output'])
+            job['status'] = STATUS_DONE
+        await self.finish(document.item)
+
+    def next_stage(self, stage):
+        return self.stages[self.stages.index(stage) + 1]
+
+    # Stage bodies: each returns True when the item goes on to the next stage
+
+    async def read(self, item):
+        job = item.job
+        if job.get('text_offset') is None and job['input'].lower().endswith(PAGED_TYPES):
+            await self.read_pages(item)
+            return False
+        await self.budget.wait_below()
+        item.text = await asyncio.to_thread(load_job_text, job, self.ocr)
+        item.charged = sys.getsizeof(item.text)
+        self.budget.charge(item.charged)
+        if not item.text.strip():
+            job['status'] = STATUS_SKIPPED
+            job['error'] = "Empty document"
+            await self.finish(item)
+            return False
+        job['chars'] = len(item.text)
+        return True
+
+    async def read_pages(self, item):
+        """Send the pages of a paged job on one by one, each waiting for the memory budget"""
+        job = item.job
+        document = _Document(item)
+        next_queue = self.queues[self.next_stage('read')]
+        pages = iter_document(job['input'], ocr=self.ocr)
+        try:
+            while not document.error:
+                await self.budget.wait_below()
+                text = await asyncio.to_thread(next, pages, None)
+                if text is None:
+                    break
+                if not text.strip():
+                    continue
+                page = _Item(job, document, document.parts)
+                page.text = text
+                page.charged = sys.getsizeof(text)
+                self.budget.charge(page.charged)
+                job['chars'] += len(text)
+                document.parts += 1
+                document.in_flight += 1
+                await next_queue.put(page)
+        except Exception as e:
+            document.error = document.error or str(e)
+        finally:
+            await asyncio.to_thread(pages.close)
+        document.read_done = True
+        await self.settle(document)
+
+    async def detect(self, item):
+        job = item.job
+        document = item.document
+        if document is None:
+            if not job['language']:
+                job['language'] = await asyncio.to_thread(detect_language, item.text) or "English"
+            job['voice'] = resolve_voice(job['voice'], job['language'], job['model'])
+        else:
+            # The first page decides for the whole document
+            async with document.lock:
+                if document.language is None:
+                    if not job['language']:
+                        job['language'] = await asyncio.to_thread(detect_language, item.text) or "English"
+                    job['voice'] = resolve_voice(job['voice'], job['language'], job['model'])
+                    document.language = job['language']
+        item.language = document.language if document is not None else job['language']
+        item.voice = job['voice']
+        return True
+
+    async def translate_text(self, item):
+        job = item.job
+        item.text, language = await self.translate(item.text, item.language)
+        if language != item.language:
+            # Same gender in the new language
+            item.voice = resolve_voice(voice_gender(item.voice, item.language, job['model']), language, job['model'])
+            item.language = language
+            job['voice'] = item.voice
+            job['language'] = language
+        if item.document is None:
+            job['chars'] = len(item.text)
+        return True
+
+    async def synthesize(self, item):
+        job = item.job
+        speed, volume, pitch = job_settings(job, self.speed, self.volume, self.pitch)
+        started = time.monotonic()
+        if item.part == 0:
+            job['queue_wait'] = round(started - job['queued_at'], 3)
+        try:
+            item.audio, retries = await retry_async(
+                lambda: synthesize_to_bytes(item.text, item.voice, speed=speed, volume=volume, pitch=pitch),
+                self.retries)
+            job['retries'] += retries
+        finally:
+            # Pages of a document add up
+            job['seconds'] = round(job['seconds'] + time.monotonic() - started, 3)
+        # The text is no longer needed, the audio waits for the writer
+        text_size = item.charged
+        item.text = None
+        item.charged = len(item.audio)
+        self.budget.charge(item.charged)
+        await self.budget.release(text_size)
+        return True
+
+    async def write(self, item):
+        job = item.job
+        if item.document is not None:
+            await self.write_page(item)
+            return False
+        await asyncio.to_thread(_write_file, job['output'], item.audio)
+        job['bytes'] = len(item.audio)
+        job['status'] = STATUS_DONE
+        await self.finish(item)
+        return False
+
+    async def write_page(self, item):
+        """Append the pages that are next in order to the document's temporary file"""
+        document = item.document
+        document.pending[item.part] = item
+        while document.written in document.pending and not document.error:
+            page = document.pending.pop(document.written)
+            try:
+                if document.out is None:
+                    document.out = await asyncio.to_thread(_open_output, document.temp_file)
+                await asyncio.to_thread(document.out.write, page.audio)
+                item.job['bytes'] += len(page.audio)
+                document.written += 1
+            except Exception as e:
+                document.error = document.error or str(e)
+            finally:
+                await self.release_page(page)
+        await self.settle(document)
+
+    async def worker(self, stage):
+        handler = {'read': self.read, 'detect': self.detect, 'translate': self.translate_text,
+                   'synthesize': self.synthesize, 'write': self.write}[stage]
+        queue = self.queues[stage]
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if item.document is not None and item.document.error:
+                await self.drop_page(item)
+                queue.task_done()
+                continue
+            self.active[stage] += 1
+            self.report_stats()
+            try:
+                forward = await handler(item)
+            except Exception as e:
+                forward = False
+                await self.fail(item, e)
+            finally:
+                self.active[stage] -= 1
+            if forward:
+                await self.queues[self.next_stage(stage)].put(item)
+            queue.task_done()
+
+    async def run(self):
+        self.budget = MemoryBudget(self.memory_budget)
+        # The read queue is fed by the producer below, so it is bounded like the others
+        self.queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in self.stages}
+        workers = {stage: [asyncio.create_task(self.worker(stage)) for _ in range(max(1, self.concurrency[stage]))]
+                   for stage in self.stages}
+        queued_at = time.monotonic()
+        try:
+            for job in self.jobs:
+                job['queued_at'] = queued_at
+                await self.queues['read'].put(_Item(job))
+            # Drain stage by stage, then stop that stage's workers
+            for stage in self.stages:
+                await self.queues[stage].join()
+                for _ in workers[stage]:
+                    await self.queues[stage].put(None)
+                await asyncio.gather(*workers[stage])
+        finally:
+            for tasks in workers.values():
+                for task in tasks:
+                    task.cancel()
+        self.report_stats(force=True)
+        return self.jobs
+
+
+def _write_file(path, data):
+    """Write through a temporary file so a half-written output never replaces a good one"""
+    temp_path = path + '.part'
+    with _open_output(temp_path) as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _open_output(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, 'wb')
+
+
+async def run_pipeline_batch(jobs, parallelism=2, speed=1.0, volume=100, pitch=0, retries=2,
+                             on_job_done=None, on_progress=None, on_stats=None, concurrency=None,
+                             queue_size=DEFAULT_QUEUE_SIZE, memory_budget=DEFAULT_MEMORY_BUDGET,
+                             translate=None, ocr=None):
+    """Run jobs like core.batch.run_batch through the staged pipeline; returns the jobs"""
+    pipeline = BatchPipeline(jobs, parallelism=parallelism, speed=speed, volume=volume, pitch=pitch,
+                             retries=retries, concurrency=concurrency, queue_size=queue_size,
+                             memory_budget=memory_budget, translate=translate, ocr=ocr,
+                             on_job_done=on_job_done, on_progress=on_progress, on_stats=on_stats)
+    return await pipeline.run()
+
+
+def translation_stage(translator, target_language):
+    """translate hook for BatchPipeline: documents not in target_language are translated with
+    translator (core.translator); its request slots are shared by all documents in flight,
+    so the stage concurrency does not multiply the requests sent to the service"""
+    async def translate(text, language):
+        if language == target_language:
+            return text, language
+        translated = await asyncio.to_thread(translator.translate, text, target_language)
+        return translated, target_language
+    return translate
+
+
+def format_stats(stats):
+    """One-line queue depth summary: 'queued read 2, detect 0, ... | 12/256 MB buffered'"""
+    queued = ', '.join(f"{stage} {depth}" for stage, depth in stats['queued'].items())
+    return (f"{stats['done']}/{stats['total']} done | queued {queued} | "
+            f"{stats['memory_used'] / 2**20:.0f}/{stats['memory_budget'] / 2**20:.0f} MB buffered")
@@ -0,0 +1,219 @@
+"""
+Local usage ledger for the cloud APIs and pre-flight quota checks.
+
+Characters sent to the translators and images sent to the OCR services are counted
+per service, per API key (stored as a short hash, never the key itself) and per
+calendar month in quota_usage.json next to settings.json. The file is written at most
+every SAVE_INTERVAL seconds or SAVE_EVERY records, and on exit. Before a job, check()
+compares what it would send with the monthly budget of the service: below
+WARN_RATIO it passes, above it warns, and past the budget it either warns or, with
+"quota_action": "block", stops the job (QuotaExceeded) before the service starts
+refusing requests.
+
+Budgets default to the free tiers and can be changed with "quota_budgets" in
+settings.json, e.g. {"Microsoft Translator": 2000000}.
+Nothing in this module imports PyQt5.
+"""
+import os
+import json
+import atexit
+import time
+import hashlib
+import threading
+from core.settings import SETTINGS_FILE, load_settings
+
+LEDGER_FILE = os.path.join(os.path.dirname(SETTINGS_FILE), 'quota_usage.json')
+
+UNIT_CHARS = 'chars'
+UNIT_IMAGES = 'images'
+# Monthly free tier and price per unit beyond it (USD) of every metered service
+SERVICES = {
+    "Microsoft Translator": {'unit': UNIT_CHARS, 'budget': 2000000, 'price': 10 / 1000000},
+    "Google Cloud Translate": {'unit': UNIT_CHARS, 'budget': 500000, 'price': 20 / 1000000},
+    "Google Vision API": {'unit': UNIT_IMAGES, 'budget': 1000, 'price': 1.5 / 1000},
+    "Azure Computer Vision": {'unit': UNIT_IMAGES, 'budget': 5000, 'price': 1 / 1000},
+}
+WARN_RATIO = 0.8
+# Usage is saved this long after the first unsaved record, or after this many records
+SAVE_INTERVAL = 5.0
+SAVE_EVERY = 100
+ACTION_WARN = 'warn'
+ACTION_BLOCK = 'block'
+
+STATUS_OK = 'ok'
+STATUS_WARN = 'warn'  # The job takes usage past WARN_RATIO of the budget
+STATUS_OVER = 'over'  # The job would exceed the budget
+
+
+class QuotaExceeded(Exception):
+    """A job would take a service past its monthly budget while quota_action is block"""
+
+
+def key_id(api_key):
+    """Short, non-reversible identifier of an API key for the ledger"""
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+
+
+def current_month():
+    return time.strftime('%Y-%m')
+
+
+class QuotaCheck:
+    """Outcome of a pre-flight check"""
+    __slots__ = ('service', 'unit', 'used', 'requested', 'budget', 'status', 'cost')
+
+    def __init__(self, service, unit, used, requested, budget, status, cost):
+        self.service = service
+        self.unit = unit
+        self.used = used
+        self.requested = requested
+        self.budget = budget
+        self.status = status
+        self.cost = cost  # Estimated USD for the part beyond the free budget
+
+    @property
+    def remaining(self):
+        return max(0, self.budget - self.used) if self.budget else None
+
+    def message(self):
+        """'Microsoft Translator: 12,000 chars requested, 1,990,000 of 2,000,000 used this month ...'"""
+        text = f"{self.service}: {self.requested:,} {self.unit} requested, {self.used:,}"
+        text += f" of {self.budget:,} used this month" if self.budget else " used this month"
+        if self.status == STATUS_OVER:
+            text += f" - exceeds the monthly budget (about ${self.cost:.2f} beyond it)"
+        elif self.status == STATUS_WARN:
+            text += f" - over {int(WARN_RATIO * 100)}% of the monthly budget"
+        return text
+
+
+class UsageLedger:
+    """Monthly usage counters in a JSON file; safe to share between threads.
+
+    Records are saved in batches (see the module docstring); flush() saves at once.
+    """
+
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0  # Records not yet written to the file
+        self._timer = None
+        self.data = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def _save(self):
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving quota usage: {e}")
+
+    def usage(self, service, api_key, month=None):
+        """Units used by one key of a service in a month (default: this month)"""
+        with self._lock:
+            entry = self.data.get(month or current_month(), {}).get(service, {}).get(key_id(api_key), {})
+            return entry.get(SERVICES.get(service, {}).get('unit', UNIT_CHARS), 0)
+
+    def service_usage(self, service, month=None):
+        """{key id: units} of all keys of a service in a month"""
+        unit = SERVICES.get(service, {}).get('unit', UNIT_CHARS)
+        with self._lock:
+            keys = self.data.get(month or current_month(), {}).get(service, {})
+            return {key: entry.get(unit, 0) for key, entry in keys.items()}
+
+    def record(self, service, api_key, units):
+        """Add units (characters or images, depending on the service) sent with api_key"""
+        if units <= 0:
+            return
+        unit = SERVICES.get(service, {}).get('unit', UNIT_CHARS)
+        with self._lock:
+            entry = (self.data.setdefault(current_month(), {}).setdefault(service, {})
+                     .setdefault(key_id(api_key), {}))
+            entry[unit] = entry.get(unit, 0) + units
+            entry['requests'] = entry.get('requests', 0) + 1
+            self._unsaved += 1
+            if self._unsaved >= SAVE_EVERY:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(SAVE_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Save the records not written yet"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._unsaved:
+            self._unsaved = 0
+            self._save()
+
+    def check(self, service, api_key, units, budgets=None):
+        """QuotaCheck of sending `units` more with api_key this month"""
+        budget = (budgets or {}).get(service, SERVICES.get(service, {}).get('budget', 0))
+        return evaluate(service, self.usage(service, api_key), units, budget)
+
+
+def evaluate(service, used, units, budget):
+    """QuotaCheck of sending `units` more when `used` of `budget` (0: unlimited) is spent"""
+    info = SERVICES.get(service, {'unit': UNIT_CHARS, 'budget': 0, 'price': 0})
+    after = used + units
+    if budget and after > budget:
+        status = STATUS_OVER
+    elif budget and after > budget * WARN_RATIO:
+        status = STATUS_WARN
+    else:
+        status = STATUS_OK
+    cost = max(0, after - max(budget, used)) * info['price'] if budget else 0.0
+    return QuotaCheck(service, info['unit'], used, units, budget, status, cost)
+
+
+class QuotaGuard:
+    """Ledger plus the quota settings: checks and records usage for one service and key"""
+
+    def __init__(self, service, api_key, ledger=None, settings=None):
+        settings = load_settings() if settings is None else settings
+        self.service = service
+        self.api_key = api_key
+        self.ledger = ledger or get_ledger()
+        self.budgets = settings.get('quota_budgets', {})
+        self.action = settings.get('quota_action', ACTION_WARN)
+
+    def check(self, units):
+        return self.ledger.check(self.service, self.api_key, units, self.budgets)
+
+    def require(self, units):
+        """Raise QuotaExceeded when sending units would exceed the budget and the action is block"""
+        result = self.check(units)
+        if result.status == STATUS_OVER and self.action == ACTION_BLOCK:
+            raise QuotaExceeded(result.message())
+        return result
+
+    def record(self, units):
+        self.ledger.record(self.service, self.api_key, units)
+
+    def usage(self):
+        return self.ledger.usage(self.service, self.api_key)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """The process-wide ledger in LEDGER_FILE"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+            atexit.register(_ledger.flush)
+        return _ledger
@@ -4,6 +4,15 @@ import os
 # Settings management
 SETTINGS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'settings.json')
 
+# Cloud API endpoints; "service_endpoints" in settings.json overrides them, e.g. to point at
+# the local stand-in server (benchmarks/service_standin.py). Azure Computer Vision uses the
+# "azure_endpoint" setting of the IMG to Text tab.
+SERVICE_ENDPOINTS = {
+    "Microsoft Translator": "https://api.cognitive.microsofttranslator.com",
+    "Google Cloud Translate": "https://translation.googleapis.com/language/translate/v2",
+    "Google Vision API": "https://vision.googleapis.com/v1/images:annotate"
+}
+
 def load_settings():
     """Load application settings from file"""
     if os.path.exists(SETTINGS_FILE):
@@ -20,4 +29,9 @@ def save_settings(settings):
         with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
             json.dump(settings, f, indent=2, ensure_ascii=False)
     except Exception as e:
-        print(f"Error saving settings: {e}")
\ No newline at end of file
+        print(f"Error saving settings: {e}")
+
+def service_endpoint(service, settings=None):
+    """API endpoint of a cloud service: the settings override or the default"""
+    settings = load_settings() if settings is None else settings
+    return settings.get('service_endpoints', {}).get(service) or SERVICE_ENDPOINTS[service]
@@ -0,0 +1,155 @@
+"""
+Streaming conversion for text files too large to hold in memory.
+
+The file is mapped window by window and decoded with an incremental UTF-8 decoder,
+the text is cut into segments at sentence boundaries, and every segment's audio is
+appended to the output as soon as it (and all segments before it) are synthesized.
+Only the current window, a partial segment and the segments in flight are held in
+memory, so peak memory does not depend on the input size.
+Nothing in this module imports PyQt5.
+"""
+import os
+import re
+import mmap
+import codecs
+import asyncio
+from core.voices import detect_language, resolve_voice
+from core.synthesis import synthesize_to_bytes
+from core.batch import retry_async
+
+# .txt files above this size are converted in streaming mode by the GUI
+LARGE_TEXT_BYTES = 10 * 1024 * 1024
+# Bytes mapped at a time; unmapping each window keeps file pages out of the process
+WINDOW_BYTES = 16 * 1024 * 1024
+READ_BYTES = 1024 * 1024
+# Target segment length: long enough to keep requests few, short enough to retry cheaply
+SEGMENT_CHARS = 3000
+# Text shown in the editor instead of a streamed file
+PREVIEW_CHARS = 20000
+
+# Sentence end followed by whitespace, or a blank line
+_SENTENCE_END = re.compile(r'(?:[.!?…;。！？]+["\'»”)\]]*\s+|\n\s*\n)')
+
+
+def iter_text_chunks(path, read_bytes=READ_BYTES, window_bytes=WINDOW_BYTES):
+    """Yield decoded text of a UTF-8 file piece by piece through memory-mapped windows.
+
+    Multi-byte characters split between pieces are completed by the incremental decoder;
+    invalid bytes are replaced instead of failing the whole file.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    size = os.path.getsize(path)
+    window_bytes -= window_bytes % mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        for window_start in range(0, size, window_bytes):
+            length = min(window_bytes, size - window_start)
+            with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ, offset=window_start) as window:
+                for start in range(0, length, read_bytes):
+                    text = decoder.decode(window[start:start + read_bytes])
+                    if text:
+                        yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def read_preview(path, max_chars=PREVIEW_CHARS):
+    """First max_chars characters of a text file, read without loading the rest"""
+    chunks = iter_text_chunks(path)
+    try:
+        return next(chunks, '')[:max_chars]
+    finally:
+        chunks.close()
+
+
+def iter_segments(chunks, max_chars=SEGMENT_CHARS):
+    """Regroup text pieces into segments of at most max_chars, cut after sentence ends.
+
+    A segment without any sentence end is cut at the last whitespace, or hard at max_chars.
+    """
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk  # What is left over is shorter than max_chars
+        start = 0
+        while len(buffer) - start >= max_chars:
+            end = start + max_chars
+            cut = 0
+            for match in _SENTENCE_END.finditer(buffer, start, end):
+                cut = match.end()
+            if not cut:
+                cut = buffer.rfind(' ', start, end) + 1 or end
+            segment = buffer[start:cut]
+            start = cut
+            if segment.strip():
+                yield segment
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer
+
+
+async def stream_to_file(path, output_file, voice=None, language=None, model="Edge TTS",
+                         speed=1.0, volume=100, pitch=0, parallelism=2, retries=2,
+                         segment_chars=SEGMENT_CHARS, on_segment=None, synthesize=synthesize_to_bytes):
+    """Convert a large text file segment by segment, appending audio to output_file in order.
+
+    At most `parallelism` segments are in flight (being synthesized or waiting for an
+    earlier one); their audio is appended in input order as soon as it is ready.
+    on_segment(number, bytes of input consumed, input size) is called per written segment.
+    Returns {'segments', 'chars', 'bytes', 'voice'}.
+    """
+    size = os.path.getsize(path)
+    parallelism = max(1, parallelism)
+    segments = iter_segments(iter_text_chunks(path), segment_chars)
+    pending = {}  # Segment number -> task, in input order
+    result = {'segments': 0, 'chars': 0, 'bytes': 0, 'voice': voice}
+    consumed = 0
+    written = 0
+
+    async def render(text):
+        audio, _ = await retry_async(lambda: synthesize(text, result['voice'], speed=speed,
+                                                        volume=volume, pitch=pitch), retries)
+        return audio, len(text.encode('utf-8'))
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    temp_file = output_file + '.part'
+    try:
+        with open(temp_file, 'wb') as out:
+
+            async def write_next():
+                """Wait for the oldest segment in flight and append its audio"""
+                nonlocal written, consumed
+                audio, input_bytes = await pending.pop(written)
+                out.write(audio)
+                written += 1
+                consumed += input_bytes
+                result['bytes'] += len(audio)
+                if on_segment:
+                    on_segment(written, min(consumed, size), size)
+
+            number = 0
+            while True:
+                # A segment is held in memory until it is written, so this bounds memory too
+                while len(pending) >= parallelism or (pending and pending[written].done()):
+                    await write_next()
+                segment = await asyncio.to_thread(next, segments, None)
+                if segment is None:
+                    break
+                if result['voice'] is None or not result['voice'].endswith("Neural"):
+                    language = language or await asyncio.to_thread(detect_language, segment) or "English"
+                    result['voice'] = resolve_voice(result['voice'], language, model)
+                pending[number] = asyncio.create_task(render(segment))
+                number += 1
+                result['segments'] = number
+                result['chars'] += len(segment)
+            while pending:
+                await write_next()
+        os.replace(temp_file, output_file)
+    finally:
+        for task in pending.values():
+            task.cancel()
+        segments.close()
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    return result
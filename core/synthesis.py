@@ -0,0 +1,79 @@
+"""
+Edge TTS synthesis helpers shared by TTSWorker and the command line.
+Nothing in this module imports PyQt5.
+"""
+import os
+import edge_tts
+
+
+def edge_tts_kwargs(voice, speed=1.0, volume=100, pitch=0):
+    """Build edge_tts.Communicate keyword arguments from UI voice settings"""
+    # Adjust voice settings with validation
+    kwargs = {"voice": voice}
+
+    # Validate and set speed (rate) - Edge TTS accepts -100% to +100%
+    if speed != 1.0:
+        rate_value = int((speed - 1) * 100)
+        # Clamp rate to valid range
+        rate_value = max(-100, min(100, rate_value))
+        kwargs["rate"] = f"{rate_value:+d}%"  # Always include sign
+
+    # Validate and set volume - Edge TTS accepts -100% to +100%
+    if volume != 100:
+        if volume == 0:
+            kwargs["volume"] = "+0%"
+        else:
+            # Clamp volume to valid range
+            volume_value = max(-100, min(100, volume - 100))
+            kwargs["volume"] = f"{volume_value:+d}%"
+
+    # Validate and set pitch - Edge TTS accepts -50Hz to +50Hz
+    if pitch != 0:
+        # Clamp pitch to valid range
+        pitch_value = max(-50, min(50, pitch))
+        kwargs["pitch"] = f"{pitch_value:+d}Hz"
+
+    return kwargs
+
+
+async def synthesize_to_file(text, voice, output_file, speed=1.0, volume=100, pitch=0):
+    """Synthesize text into output_file and return the number of bytes written"""
+    communicate = edge_tts.Communicate(text, **edge_tts_kwargs(voice, speed, volume, pitch))
+    await communicate.save(output_file)
+    return os.path.getsize(output_file)
+
+
+def make_communicate(text, voice, speed=1.0, volume=100, pitch=0, word_boundaries=False):
+    """edge_tts.Communicate, asking for WordBoundary events when word_boundaries is set"""
+    kwargs = edge_tts_kwargs(voice, speed, volume, pitch)
+    if word_boundaries:
+        try:
+            # edge-tts 7+ sends SentenceBoundary unless asked otherwise
+            return edge_tts.Communicate(text, boundary="WordBoundary", **kwargs)
+        except TypeError:
+            pass  # Older edge-tts always sends WordBoundary
+    return edge_tts.Communicate(text, **kwargs)
+
+
+async def synthesize_with_boundaries(text, voice, speed=1.0, volume=100, pitch=0):
+    """Synthesize text in memory; returns (MP3 bytes, [(offset s, duration s, word)])"""
+    communicate = make_communicate(text, voice, speed, volume, pitch, word_boundaries=True)
+    audio = bytearray()
+    boundaries = []
+    async for message in communicate.stream():
+        if message["type"] == "audio":
+            audio += message["data"]
+        elif message["type"] == "WordBoundary":
+            # Offsets are in 100 ns ticks
+            boundaries.append((message["offset"] / 1e7, message["duration"] / 1e7, message["text"]))
+    return bytes(audio), boundaries
+
+
+async def synthesize_to_bytes(text, voice, speed=1.0, volume=100, pitch=0):
+    """Synthesize text in memory and return the MP3 bytes"""
+    communicate = edge_tts.Communicate(text, **edge_tts_kwargs(voice, speed, volume, pitch))
+    audio = bytearray()
+    async for message in communicate.stream():
+        if message["type"] == "audio":
+            audio += message["data"]
+    return bytes(audio)
@@ -0,0 +1,140 @@
+"""
+Translate-and-speak: translation and synthesis of one text run as a pipeline.
+
+The text is cut into segments, translation requests for small groups of segments are
+sent concurrently, and every segment is synthesized as soon as its translation
+arrives; the audio is appended to the output in order. Translation of later segments
+overlaps with synthesis of earlier ones, so the whole run takes about as long as the
+slower of the two steps instead of their sum.
+Nothing in this module imports PyQt5.
+"""
+import os
+import asyncio
+from core.translator import segment_text, pack_segments, LANGUAGE_CODES, TranslationCancelled, TranslatorError
+from core.synthesis import synthesize_to_bytes
+from core.batch import retry_async
+
+# Small segments and requests make the first audio start early
+SEGMENT_CHARS = 1500
+REQUEST_CHARS = 3000
+
+
+async def translate_and_speak(text, output_file, translator, target_language, voice, speed=1.0, volume=100,
+                              pitch=0, parallelism=2, retries=2, on_progress=None, is_cancelled=None,
+                              synthesize=synthesize_to_bytes):
+    """Translate text with translator (core.translator) and speak it into output_file.
+
+    on_progress(segments translated, segments spoken, total) is called as both advance;
+    is_cancelled() is checked between steps and raises TranslationCancelled.
+    Returns {'text' (the full translation), 'segments', 'chars', 'bytes', 'stats'}.
+    """
+    segments, layout = segment_text(text, min(SEGMENT_CHARS, translator.MAX_SEGMENT_CHARS))
+    total = len(segments)
+    if not total:
+        raise TranslatorError("Nothing to translate")
+    target = LANGUAGE_CODES.get(target_language, "en")
+    loop = asyncio.get_running_loop()
+    translations = [loop.create_future() for _ in segments]
+    translated_count = 0
+    spoken_count = 0
+
+    def report():
+        if on_progress:
+            on_progress(translated_count, spoken_count, total)
+
+    def check_cancelled():
+        if is_cancelled and is_cancelled():
+            raise TranslationCancelled("Translation cancelled")
+
+    def resolve(index, translation):
+        nonlocal translated_count
+        translated_count += 1
+        translations[index].set_result(translation)
+
+    memory = translator.memory
+    found = await asyncio.to_thread(memory.lookup, translator.SERVICE, target, segments) if memory else {}
+    for index, translation in found.items():
+        resolve(index, translation)
+    missing = [index for index in range(total) if index not in found]
+    # Segments are packed by position, so the requests come back roughly in reading order
+    batches = [[missing[i] for i in batch] for batch in
+               pack_segments([segments[i] for i in missing], translator.MAX_ITEMS,
+                             min(REQUEST_CHARS, translator.MAX_REQUEST_CHARS))]
+    request_slots = asyncio.Semaphore(translator.MAX_CONCURRENT_REQUESTS)
+
+    async def translate_batch(batch):
+        async with request_slots:
+            check_cancelled()
+            texts = [segments[i] for i in batch]
+            result = await asyncio.to_thread(translator.send_batch, texts, target_language)
+        if len(result) != len(batch):
+            raise TranslatorError("Invalid response format")
+        if memory:
+            await asyncio.to_thread(memory.store, translator.SERVICE, target, list(zip(texts, result)))
+        for index, translation in zip(batch, result):
+            resolve(index, translation)
+        report()
+
+    async def speak(index):
+        translation = await translations[index]
+        check_cancelled()
+        if not translation.strip():
+            return b''
+        audio, _ = await retry_async(lambda: synthesize(translation, voice, speed=speed, volume=volume,
+                                                        pitch=pitch), retries)
+        return audio
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    temp_file = output_file + '.part'
+    translating = asyncio.gather(*(translate_batch(batch) for batch in batches))
+    pending = {}  # Segment index -> speak task, at most `parallelism` ahead of the writer
+    written = 0
+    audio_bytes = 0
+
+    async def write_next(out):
+        """Append the audio of the next segment in order; a failed translation request fails it too"""
+        nonlocal written, audio_bytes, spoken_count
+        task = pending[written]
+        while not task.done():
+            waiting = [task] if translating.done() else [task, translating]
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if translating.done() and not translating.cancelled() and translating.exception():
+                raise translating.exception()
+        audio = pending.pop(written).result()
+        out.write(audio)
+        audio_bytes += len(audio)
+        written += 1
+        spoken_count = written
+        report()
+
+    try:
+        report()
+        with open(temp_file, 'wb') as out:
+            for index in range(total):
+                while len(pending) >= max(1, parallelism):
+                    await write_next(out)
+                pending[index] = asyncio.create_task(speak(index))
+            while pending:
+                await write_next(out)
+        await translating
+        os.replace(temp_file, output_file)
+    finally:
+        translating.cancel()
+        for task in pending.values():
+            task.cancel()
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    translated = [future.result() for future in translations]
+    chars_sent = sum(len(segments[i]) for i in missing)
+    chars = sum(map(len, segments))
+    return {
+        'text': ''.join(translated[item] if isinstance(item, int) else item for item in layout),
+        'segments': total,
+        'chars': chars,
+        'bytes': audio_bytes,
+        'stats': {'segments': total, 'hits': len(found), 'chars': chars,
+                  'chars_sent': chars_sent, 'chars_saved': chars - chars_sent}
+    }
@@ -0,0 +1,128 @@
+"""
+Persistent translation memory: translated segments stored in SQLite, so translating a
+document again, or one that shares paragraphs with an earlier one, only sends the new
+segments to the translation service.
+
+Entries are keyed by service, target language and a SHA-256 of the normalized segment
+(Unicode NFC, whitespace collapsed). The least recently used entries are removed once
+the memory holds more than max_entries.
+Nothing in this module imports PyQt5.
+"""
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from core.settings import SETTINGS_FILE
+
+MEMORY_FILE = os.path.join(os.path.dirname(SETTINGS_FILE), 'translation_memory.db')
+DEFAULT_MAX_ENTRIES = 100000
+# Evict in steps so a full memory does not run a DELETE on every store
+EVICT_MARGIN = 0.05
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_segment(text):
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def segment_key(service, target, text):
+    """Memory key of a segment: hash of service, target language and normalized text"""
+    data = f"{service}\n{target}\n{normalize_segment(text)}".encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite-backed segment cache with an LRU entry cap; safe to share between threads"""
+
+    def __init__(self, path=MEMORY_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('''CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                service TEXT NOT NULL,
+                target TEXT NOT NULL,
+                chars INTEGER NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL)''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used)')
+            # Upper bound of the rows: replaced segments are counted again, so the table is
+            # only counted (a full scan) when this passes max_entries
+            self._count = self._db.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+
+    def lookup(self, service, target, segments):
+        """{index in segments: translation} for the segments already in memory"""
+        keys = {}
+        for index, segment in enumerate(segments):
+            keys.setdefault(segment_key(service, target, segment), []).append(index)
+        found = {}
+        now = time.time()
+        with self._lock, self._db:
+            key_list = list(keys)
+            # SQLite limits bound parameters per statement
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                rows = self._db.execute(f'SELECT key, translation FROM segments WHERE key IN ({marks})', chunk)
+                for key, translation in rows.fetchall():
+                    for index in keys[key]:
+                        found[index] = translation
+                self._db.execute(f'UPDATE segments SET last_used = ? WHERE key IN ({marks})', [now, *chunk])
+        return found
+
+    def store(self, service, target, pairs):
+        """Remember (source segment, translation) pairs and evict the least recently used overflow"""
+        now = time.time()
+        rows = [(segment_key(service, target, source), service, target, len(source), translation, now)
+                for source, translation in pairs]
+        if not rows:
+            return
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self._count += len(rows)
+            if self._count <= self.max_entries:
+                return
+            self._count = self._db.execute('SELECT COUNT(*) FROM segments').fetchone()[0]
+            if self._count > self.max_entries:
+                keep = int(self.max_entries * (1 - EVICT_MARGIN))
+                self._db.execute('DELETE FROM segments WHERE key IN '
+                                 '(SELECT key FROM segments ORDER BY last_used LIMIT ?)', (self._count - keep,))
+                self._count = keep
+
+    def stats(self):
+        """{'entries', 'chars'} stored"""
+        with self._lock:
+            entries, chars = self._db.execute('SELECT COUNT(*), COALESCE(SUM(chars), 0) FROM segments').fetchone()
+        return {'entries': entries, 'chars': chars}
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM segments')
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory(max_entries=DEFAULT_MAX_ENTRIES):
+    """The process-wide memory in MEMORY_FILE, opened on first use"""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(MEMORY_FILE, max_entries)
+        return _memory
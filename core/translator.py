@@ -1,20 +1,262 @@
+import re
+import sqlite3
 import requests
 import json
 import uuid
-from typing import Optional, Dict, Any
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable
+from core.http_client import http_post
+from core.settings import service_endpoint
+from core.translation_memory import get_translation_memory
+from core.quota import QuotaExceeded
+from core.key_pool import PoolKey, KeyPoolExhausted, get_key_pool
+
+# Map language names to codes
+LANGUAGE_CODES = {
+    "English": "en",
+    "Russian": "ru",
+    "Ukrainian": "uk",
+    "Japanese": "ja"
+}
+
+# Line breaks (with the spaces around them) separate paragraphs and are kept as they are
+_LINE_BREAK = re.compile(r'(\s*\n\s*)')
+# Whitespace after a sentence end; CJK sentence ends need no whitespace after them
+_SENTENCE_BREAK = re.compile(r'((?<=[.!?…;])\s+|(?<=[。！？])\s*)')
+
 
 class TranslatorError(Exception):
     """Custom exception for translation errors"""
     pass
 
-class BaseTranslator:
-    """Base class for translation services"""
 
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+class TranslationCancelled(TranslatorError):
+    """translate() was stopped through its is_cancelled callback"""
+    pass
 
-    def translate(self, text: str, target_lang: str) -> str:
-        """Translate text to target language"""
+
+def _split_long(paragraph: str, max_chars: int) -> List[str]:
+    """Cut one paragraph into pieces of at most max_chars at sentence ends (or spaces, or hard)"""
+    pieces = []
+    current = ''
+    parts = _SENTENCE_BREAK.split(paragraph)
+    # parts alternates sentence, whitespace, sentence, ...; whitespace stays with the sentence before it
+    sentences = [parts[i] + (parts[i + 1] if i + 1 < len(parts) else '') for i in range(0, len(parts), 2)]
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars) + 1 or max_chars
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:]
+        if len(current) + len(sentence) > max_chars:
+            pieces.append(current)
+            current = ''
+        current += sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def segment_text(text: str, max_chars: int) -> Tuple[List[str], List[Union[int, str]]]:
+    """Split text into segments of at most max_chars for translation.
+
+    Returns (segments, layout): layout lists, in order, either the index of a segment or a
+    literal string (line breaks, indentation, spaces between pieces of a long paragraph)
+    that is copied to the translation unchanged, so paragraph structure survives.
+    """
+    segments = []
+    layout = []
+    parts = _LINE_BREAK.split(text)
+    for number, part in enumerate(parts):
+        if number % 2 or not part.strip():
+            if part:
+                layout.append(part)
+            continue
+        leading = part[:len(part) - len(part.lstrip())]
+        if leading:
+            layout.append(leading)
+        for piece in _split_long(part.strip(), max_chars):
+            stripped = piece.rstrip()
+            if not stripped:
+                layout.append(piece)
+                continue
+            layout.append(len(segments))
+            segments.append(stripped)
+            if len(piece) > len(stripped):
+                layout.append(piece[len(stripped):])
+        trailing = part[len(part.rstrip()):]
+        if trailing:
+            layout.append(trailing)
+    return segments, layout
+
+
+def pack_segments(segments: List[str], max_items: int, max_chars: int) -> List[List[int]]:
+    """Group segment indexes, in order, into requests of at most max_items and max_chars"""
+    batches = []
+    current = []
+    size = 0
+    for index, segment in enumerate(segments):
+        if current and (len(current) >= max_items or size + len(segment) > max_chars):
+            batches.append(current)
+            current = []
+            size = 0
+        current.append(index)
+        size += len(segment)
+    if current:
+        batches.append(current)
+    return batches
+
+
+class BaseTranslator:
+    """Base class for translation services.
+
+    Subclasses implement translate_batch (one request for a list of texts) and set the
+    service limits; translate splits a document into segments, packs them into requests
+    within those limits, sends the requests concurrently and reassembles the result.
+    """
+    SERVICE = None  # Name in TranslatorManager, part of the translation memory key
+    MAX_ITEMS = 100  # Texts per request
+    MAX_REQUEST_CHARS = 5000  # Characters per request
+    MAX_SEGMENT_CHARS = 5000  # Characters per text
+    MAX_CONCURRENT_REQUESTS = 4
+
+    def __init__(self, api_key: str, memory=None, quota=None, pool=None):
+        self.api_key = api_key
+        self.memory = memory  # core.translation_memory.TranslationMemory, or None
+        self.quota = quota  # core.quota.QuotaGuard (or the KeyPool) counting the characters sent, or None
+        self.pool = pool  # core.key_pool.KeyPool the requests go out through, or None to use api_key only
+        # Segments, memory hits and characters sent/saved by the last translate call
+        self.last_stats: Dict[str, int] = {}
+        # Requests in flight across all concurrent translate calls (e.g. a batch of documents)
+        self._request_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_REQUESTS)
+
+    def translate(self, text: str, target_lang: str,
+                  on_progress: Optional[Callable[[int, int], None]] = None,
+                  is_cancelled: Optional[Callable[[], bool]] = None) -> str:
+        """Translate text to target language; segments found in the translation memory are not sent.
+
+        on_progress(segments done, total segments) is called as requests complete; when
+        is_cancelled() returns True, requests not sent yet are dropped and
+        TranslationCancelled is raised.
+        """
+        if not self.api_key:
+            raise TranslatorError("API key is required")
+        segments, layout = segment_text(text, min(self.MAX_SEGMENT_CHARS, self.MAX_REQUEST_CHARS))
+        self.last_stats = {'segments': len(segments), 'hits': 0, 'chars': sum(map(len, segments)),
+                           'chars_sent': 0, 'chars_saved': 0}
+        if not segments:
+            return text
+        target = LANGUAGE_CODES.get(target_lang, "en")
+        translated = [None] * len(segments)
+        found = self.memory.lookup(self.SERVICE, target, segments) if self.memory is not None else {}
+        for index, translation in found.items():
+            translated[index] = translation
+        # Segments repeated in the document are sent once
+        pending = list(dict.fromkeys(segment for segment, done in zip(segments, translated) if done is None))
+        total = len(segments)
+        reused = total - sum(1 for done in translated if done is None)
+        if on_progress:
+            on_progress(reused, total)
+            progress = lambda sent: on_progress(min(total, reused + sent), total)
+        else:
+            progress = None
+        results = self.translate_segments(pending, target_lang, progress, is_cancelled)
+        if self.memory is not None and results:
+            self.memory.store(self.SERVICE, target, zip(pending, results))
+        by_source = dict(zip(pending, results))
+        for index, segment in enumerate(segments):
+            if translated[index] is None:
+                translated[index] = by_source[segment]
+        chars_sent = sum(map(len, pending))
+        self.last_stats.update(hits=len(found), chars_sent=chars_sent,
+                               chars_saved=self.last_stats['chars'] - chars_sent)
+        return ''.join(translated[item] if isinstance(item, int) else item for item in layout)
+
+    def estimate(self, text: str, target_lang: str) -> int:
+        """Characters translate(text, target_lang) would send: segments not in the memory, repeats once"""
+        segments, _ = segment_text(text, min(self.MAX_SEGMENT_CHARS, self.MAX_REQUEST_CHARS))
+        found = {}
+        if self.memory is not None:
+            found = self.memory.lookup(self.SERVICE, LANGUAGE_CODES.get(target_lang, "en"), segments)
+        return sum(map(len, dict.fromkeys(segment for index, segment in enumerate(segments) if index not in found)))
+
+    def send_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """translate_batch with the characters checked against and recorded in the quota ledger"""
+        chars = sum(map(len, texts))
+        # A key pool checks and records the quota of the key each request goes out with
+        guard = self.quota if self.pool is None else None
+        try:
+            if guard is not None:
+                guard.require(chars)
+            with self._request_slots:
+                result = self.translate_batch(texts, target_lang)
+        except (QuotaExceeded, KeyPoolExhausted) as e:
+            raise TranslatorError(str(e))
+        if guard is not None:
+            guard.record(chars)
+        return result
+
+    def post(self, build: Callable[[PoolKey], Tuple[str, Dict[str, Any]]], units: int = 0):
+        """POST build(key) -> (url, requests kwargs) with the next key of the pool, or with api_key"""
+        if self.pool is not None:
+            return self.pool.request('POST', build, units)
+        url, kwargs = build(PoolKey(self.api_key))
+        # Translation has no side effects, so failed requests are retried
+        return http_post(url, idempotent=True, **kwargs)
+
+    def translate_segments(self, segments: List[str], target_lang: str,
+                           on_progress: Optional[Callable[[int], None]] = None,
+                           is_cancelled: Optional[Callable[[], bool]] = None) -> List[str]:
+        """Translate segments in requests packed to the service limits, sent concurrently.
+
+        on_progress(segments translated) follows every completed request.
+        """
+        if not segments:
+            return []
+        batches = pack_segments(segments, self.MAX_ITEMS, self.MAX_REQUEST_CHARS)
+        translated = [None] * len(segments)
+        done = 0
+        queued = iter(batches)
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+            # Submit only as many requests as run at once, so a cancel drops everything not yet sent
+            running = {}
+
+            def submit_next():
+                batch = next(queued, None)
+                if batch is not None:
+                    # Run in the caller's context, so a core.http_client.cancel_scope reaches the pool threads
+                    future = executor.submit(contextvars.copy_context().run, self.send_batch,
+                                             [segments[i] for i in batch], target_lang)
+                    running[future] = batch
+
+            if is_cancelled and is_cancelled():
+                raise TranslationCancelled("Translation cancelled")
+            for _ in range(self.MAX_CONCURRENT_REQUESTS):
+                submit_next()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch = running.pop(future)
+                    result = future.result()
+                    if len(result) != len(batch):
+                        raise TranslatorError("Invalid response format")
+                    for index, translation in zip(batch, result):
+                        translated[index] = translation
+                    done += len(batch)
+                    if on_progress:
+                        on_progress(done)
+                if is_cancelled and is_cancelled():
+                    raise TranslationCancelled("Translation cancelled")
+                for _ in finished:
+                    submit_next()
+        return translated
+
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """Translate a list of texts in one request, keeping their order"""
         raise NotImplementedError
 
     def test_key(self) -> bool:
@@ -23,26 +265,19 @@ class BaseTranslator:
 
 class MicrosoftTranslator(BaseTranslator):
     """Microsoft Translator API implementation"""
-
-    def __init__(self, api_key: str):
-        super().__init__(api_key)
-        self.endpoint = "https://api.cognitive.microsofttranslator.com"
+    SERVICE = "Microsoft Translator"
+    # Translator v3: up to 1000 array elements and 50,000 characters per request
+    MAX_ITEMS = 1000
+    MAX_REQUEST_CHARS = 50000
+
+    def __init__(self, api_key: str, memory=None, quota=None, pool=None):
+        super().__init__(api_key, memory, quota, pool)
+        self.endpoint = service_endpoint(self.SERVICE)
         self.location = "westeurope"  # Default location
 
-    def translate(self, text: str, target_lang: str) -> str:
-        """Translate text using Microsoft Translator API"""
-        if not self.api_key:
-            raise TranslatorError("API key is required")
-
-        # Map language names to codes
-        lang_codes = {
-            "English": "en",
-            "Russian": "ru",
-            "Ukrainian": "uk",
-            "Japanese": "ja"
-        }
-
-        target_code = lang_codes.get(target_lang, "en")
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """Translate texts using Microsoft Translator API"""
+        target_code = LANGUAGE_CODES.get(target_lang, "en")
 
         path = '/translate'
         constructed_url = self.endpoint + path
@@ -52,24 +287,24 @@ class MicrosoftTranslator(BaseTranslator):
             'to': target_code
         }
 
-        headers = {
-            'Ocp-Apim-Subscription-Key': self.api_key,
-            'Ocp-Apim-Subscription-Region': self.location,
-            'Content-type': 'application/json',
-            'X-ClientTraceId': str(uuid.uuid4())
-        }
+        def build(key):
+            headers = {
+                'Ocp-Apim-Subscription-Key': key.key,
+                'Ocp-Apim-Subscription-Region': key.region or self.location,
+                'Content-type': 'application/json',
+                'X-ClientTraceId': str(uuid.uuid4())
+            }
+            return constructed_url, {'params': params, 'headers': headers, 'json': body}
 
-        body = [{
-            'text': text
-        }]
+        body = [{'text': text} for text in texts]
 
         try:
-            response = requests.post(constructed_url, params=params, headers=headers, json=body, timeout=10)
+            response = self.post(build, sum(map(len, texts)))
             response.raise_for_status()
 
             result = response.json()
-            if result and len(result) > 0 and 'translations' in result[0]:
-                return result[0]['translations'][0]['text']
+            if isinstance(result, list) and len(result) == len(texts) and all('translations' in item for item in result):
+                return [item['translations'][0]['text'] for item in result]
             else:
                 raise TranslatorError("Invalid response format")
 
@@ -87,39 +322,34 @@ class MicrosoftTranslator(BaseTranslator):
 
 class GoogleTranslator(BaseTranslator):
     """Google Cloud Translate API implementation"""
-
-    def __init__(self, api_key: str):
-        super().__init__(api_key)
-        self.endpoint = "https://translation.googleapis.com/language/translate/v2"
-
-    def translate(self, text: str, target_lang: str) -> str:
-        """Translate text using Google Cloud Translate API"""
-        if not self.api_key:
-            raise TranslatorError("API key is required")
-
-        # Map language names to codes
-        lang_codes = {
-            "English": "en",
-            "Russian": "ru",
-            "Ukrainian": "uk",
-            "Japanese": "ja"
-        }
-
-        target_code = lang_codes.get(target_lang, "en")
-
-        params = {
-            'q': text,
+    SERVICE = "Google Cloud Translate"
+    # Translate v2: up to 128 q values per request, about 5,000 characters recommended
+    MAX_ITEMS = 128
+    MAX_REQUEST_CHARS = 5000
+
+    def __init__(self, api_key: str, memory=None, quota=None, pool=None):
+        super().__init__(api_key, memory, quota, pool)
+        self.endpoint = service_endpoint(self.SERVICE)
+
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """Translate texts using Google Cloud Translate API"""
+        target_code = LANGUAGE_CODES.get(target_lang, "en")
+
+        # The text goes in the JSON body: URL parameters are limited to a few kilobytes
+        body = {
+            'q': texts,
             'target': target_code,
-            'key': self.api_key
+            'format': 'text'
         }
 
         try:
-            response = requests.post(self.endpoint, params=params, timeout=10)
+            response = self.post(lambda key: (self.endpoint, {'params': {'key': key.key}, 'json': body}),
+                                 sum(map(len, texts)))
             response.raise_for_status()
 
             result = response.json()
-            if 'data' in result and 'translations' in result['data'] and len(result['data']['translations']) > 0:
-                return result['data']['translations'][0]['translatedText']
+            if 'data' in result and 'translations' in result['data'] and len(result['data']['translations']) == len(texts):
+                return [item['translatedText'] for item in result['data']['translations']]
             else:
                 raise TranslatorError("Invalid response format")
 
@@ -144,12 +374,25 @@ class TranslatorManager:
             "Google Cloud Translate": GoogleTranslator
         }
 
-    def get_translator(self, service_name: str, api_key: str) -> BaseTranslator:
-        """Get translator instance for specified service"""
+    def get_translator(self, service_name: str, api_key: str, use_memory: bool = False,
+                       track_quota: bool = False) -> BaseTranslator:
+        """Get translator instance for specified service.
+
+        use_memory adds the shared translation memory. track_quota sends through the key
+        pool of the service (core.key_pool: api_key plus the keys in settings, rate limits,
+        rotation), which counts the characters sent per key and applies the quota settings.
+        """
         if service_name not in self.services:
             raise TranslatorError(f"Unknown service: {service_name}")
 
-        return self.services[service_name](api_key)
+        memory = None
+        if use_memory:
+            try:
+                memory = get_translation_memory()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Translation memory unavailable: {e}")
+        pool = get_key_pool(service_name, api_key) if track_quota else None
+        return self.services[service_name](api_key, memory, pool, pool)
 
     def get_service_descriptions(self, localization_manager=None) -> Dict[str, str]:
         """Get descriptions for all available services"""
@@ -2,9 +2,20 @@ import sys
 import os
 import asyncio
 import tempfile
+import threading
 import subprocess
 import edge_tts
 from PyQt5.QtCore import QThread, pyqtSignal
+from core.synthesis import edge_tts_kwargs
+from core.manifest import iter_manifest
+from core.documents import iter_document
+from core.chapters import render_chapters, STATUS_UNCHANGED
+from core.audiobook import assemble_book
+from core.batch import STATUS_FAILED, measure_job
+from core.audio_index import audio_duration as probe_duration
+from core.streaming import stream_to_file
+from core.translator import TranslationCancelled
+from core.translate_speak import translate_and_speak
 
 # Try to import optional modules
 try:
@@ -29,9 +40,11 @@ class TTSWorker(QThread):
     finished = pyqtSignal(str)
     log_signal = pyqtSignal(str)
 
-    def __init__(self, text, voice, output_file, speed=1.0, volume=100, pitch=0, play_only=False, model="Edge TTS"):
+    def __init__(self, text, voice, output_file, speed=1.0, volume=100, pitch=0, play_only=False, model="Edge TTS",
+                 text_loader=None, measure_output=False):
         super().__init__()
         self.text = text
+        self.text_loader = text_loader  # Called in the worker thread when text is None
         self.voice = voice
         self.output_file = output_file
         self.speed = speed
@@ -39,17 +52,36 @@ class TTSWorker(QThread):
         self.pitch = pitch
         self.play_only = play_only
         self.model = model
+        self.measure_output = measure_output
+        self.audio_duration = None  # Length of the saved file, read in this thread when measure_output is set
 
     def run(self):
         print("Starting TTS...")
         self.progress.emit(10)
         self.log_signal.emit("Starting TTS... 10%")
         try:
+            if self.text is None and self.text_loader:
+                self.text = self.text_loader()
             self.run_edge_tts()
         except Exception as e:
             print(f"TTS Error: {e}")
             self.finished.emit(f"Error: {e}")
 
+    async def save_chunks(self, kwargs):
+        """Synthesize an iterable of text chunks into one output file (MP3 frames are appended)"""
+        self.progress.emit(50)
+        with open(self.output_file, 'wb') as out:
+            for number, chunk in enumerate(self.text, 1):
+                if not chunk.strip():
+                    continue
+                communicate = edge_tts.Communicate(chunk, **kwargs)
+                async for message in communicate.stream():
+                    if message["type"] == "audio":
+                        out.write(message["data"])
+                self.log_signal.emit(f"Page {number} synthesized")
+        self.progress.emit(90)
+        self.log_signal.emit("Saving audio... 90%")
+
     def run_edge_tts(self):
         print("Using Edge TTS")
         self.progress.emit(20)
@@ -57,30 +89,12 @@ class TTSWorker(QThread):
         async def generate_tts():
             self.progress.emit(30)
             self.log_signal.emit("Preparing voice... 30%")
-            # Adjust voice settings with validation
-            kwargs = {"voice": self.voice}
-
-            # Validate and set speed (rate) - Edge TTS accepts -100% to +100%
-            if self.speed != 1.0:
-                rate_value = int((self.speed - 1) * 100)
-                # Clamp rate to valid range
-                rate_value = max(-100, min(100, rate_value))
-                kwargs["rate"] = f"{rate_value:+d}%"  # Always include sign
-
-            # Validate and set volume - Edge TTS accepts -100% to +100%
-            if self.volume != 100:
-                if self.volume == 0:
-                    kwargs["volume"] = "+0%"
-                else:
-                    # Clamp volume to valid range
-                    volume_value = max(-100, min(100, self.volume - 100))
-                    kwargs["volume"] = f"{volume_value:+d}%"
+            kwargs = edge_tts_kwargs(self.voice, self.speed, self.volume, self.pitch)
 
-            # Validate and set pitch - Edge TTS accepts -50Hz to +50Hz
-            if self.pitch != 0:
-                # Clamp pitch to valid range
-                pitch_value = max(-50, min(50, self.pitch))
-                kwargs["pitch"] = f"{pitch_value:+d}Hz"
+            if not isinstance(self.text, str):
+                # Page iterator (PDF import): each page is synthesized as soon as it is extracted
+                await self.save_chunks(kwargs)
+                return
 
             communicate = edge_tts.Communicate(self.text, **kwargs)
             self.progress.emit(50)
@@ -199,7 +213,316 @@ class TTSWorker(QThread):
                 self.log_signal.emit("Saving audio... 90%")
 
         asyncio.run(generate_tts())
+        if self.measure_output and not self.play_only:
+            self.audio_duration = probe_duration(self.output_file)
         self.progress.emit(100)
         self.log_signal.emit("TTS completed 100%")
         self.finished.emit("TTS completed")
-        print("TTS finished successfully")
\ No newline at end of file
+        print("TTS finished successfully")
+
+
+class AsyncBatchWorker(QThread):
+    """Worker thread running an asyncio batch runner over job dicts (core.pipeline, core.dedup, core.packing)"""
+    progress = pyqtSignal(int)
+    log_signal = pyqtSignal(str)
+    job_finished = pyqtSignal(int, object)  # index in jobs, job dict
+    stats = pyqtSignal(object)  # Pipeline queue depths (core.pipeline), when report_stats is set
+    finished = pyqtSignal(object)  # Runner result, or None on error
+
+    def __init__(self, jobs, runner, speed=1.0, volume=100, pitch=0, parallelism=2,
+                 runner_kwargs=None, report_stats=False):
+        super().__init__()
+        self.jobs = jobs
+        self.runner = runner
+        self.speed = speed
+        self.volume = volume
+        self.pitch = pitch
+        self.parallelism = parallelism
+        self.runner_kwargs = dict(runner_kwargs or {})
+        if report_stats:
+            self.runner_kwargs['on_stats'] = self.stats.emit
+
+    def run(self):
+        indexes = {id(job): index for index, job in enumerate(self.jobs)}
+
+        def on_progress(done, total):
+            self.progress.emit(int(done * 100 / total) if total else 100)
+
+        def on_job_done(job):
+            # The report row is built on the GUI thread, so the audio is measured here
+            measure_job(job)
+            self.job_finished.emit(indexes[id(job)], job)
+
+        try:
+            result = asyncio.run(self.runner(self.jobs, parallelism=self.parallelism, speed=self.speed,
+                                             volume=self.volume, pitch=self.pitch,
+                                             on_job_done=on_job_done, on_progress=on_progress,
+                                             **self.runner_kwargs))
+            self.finished.emit(result)
+        except Exception as e:
+            self.log_signal.emit(f"Error: {e}")
+            self.finished.emit(None)
+
+
+class DocumentImportWorker(QThread):
+    """Worker thread extracting a PDF page by page (scanned pages through ocr).
+
+    follow() iterates over the pages from another thread as they arrive, so synthesis
+    can start on the first pages while the rest is still being extracted.
+    """
+    page_ready = pyqtSignal(int, str)  # Page number, text
+    log_signal = pyqtSignal(str)
+    finished = pyqtSignal(object)  # {'text', 'pages', 'error', 'cancelled'}
+
+    def __init__(self, file_path, ocr=None):
+        super().__init__()
+        self.file_path = file_path
+        self.ocr = ocr
+        self.pages = []
+        self.done = False
+        self.error = None
+        self.stopped = False
+        self._changed = threading.Condition()
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        try:
+            for number, page in enumerate(iter_document(self.file_path, ocr=self.ocr), 1):
+                if self.stopped:
+                    break
+                with self._changed:
+                    self.pages.append(page)
+                    self._changed.notify_all()
+                self.page_ready.emit(number, page)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            with self._changed:
+                self.done = True
+                self._changed.notify_all()
+        self.finished.emit({'text': '\n'.join(self.pages), 'pages': len(self.pages), 'error': self.error,
+                            'cancelled': self.stopped})
+
+    def follow(self):
+        """Yield the pages imported so far, then each new one until the import ends"""
+        index = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: index < len(self.pages) or self.done)
+                if index >= len(self.pages):
+                    if self.error:
+                        raise Exception(self.error)
+                    return
+                page = self.pages[index]
+            index += 1
+            yield page
+
+
+class ManifestWorker(QThread):
+    """Worker thread parsing and validating a CSV/JSONL manifest, delivering rows in chunks"""
+    rows_ready = pyqtSignal(list)  # BatchItem chunk
+    log_signal = pyqtSignal(str)
+    finished = pyqtSignal(int, int)  # Valid rows, invalid rows
+
+    CHUNK_SIZE = 500
+    MAX_LOGGED_ERRORS = 20
+
+    def __init__(self, path, model="Edge TTS", output_dir=None):
+        super().__init__()
+        self.path = path
+        self.model = model
+        self.output_dir = output_dir
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        loaded = 0
+        errors = 0
+        chunk = []
+        try:
+            for item, error in iter_manifest(self.path, self.model, self.output_dir):
+                if self.stopped:
+                    break
+                if error:
+                    errors += 1
+                    if errors <= self.MAX_LOGGED_ERRORS:
+                        self.log_signal.emit(f"Skipped {error}")
+                    continue
+                chunk.append(item)
+                loaded += 1
+                if len(chunk) >= self.CHUNK_SIZE:
+                    self.rows_ready.emit(chunk)
+                    chunk = []
+            if chunk and not self.stopped:
+                self.rows_ready.emit(chunk)
+        except Exception as e:
+            self.log_signal.emit(f"Error: {e}")
+        self.finished.emit(loaded, errors)
+
+
+class ChapterWorker(QThread):
+    """Worker thread rendering a .docx/.epub document as one audio file per chapter (core.chapters)"""
+    progress = pyqtSignal(int)
+    log_signal = pyqtSignal(str)
+    finished = pyqtSignal(str)
+
+    def __init__(self, file_path, output_dir, voice, speed=1.0, volume=100, pitch=0, parallelism=2):
+        super().__init__()
+        self.file_path = file_path
+        self.output_dir = output_dir
+        self.voice = voice
+        self.speed = speed
+        self.volume = volume
+        self.pitch = pitch
+        self.parallelism = parallelism
+
+    def run(self):
+        done = 0
+        failed = 0
+
+        def on_chapter_done(entry):
+            nonlocal done, failed
+            done += 1
+            if entry['status'] == STATUS_FAILED:
+                failed += 1
+                self.log_signal.emit(f"Chapter {entry['number']} ({entry['title']}) failed: {entry['error']}")
+            elif entry['status'] == STATUS_UNCHANGED:
+                self.log_signal.emit(f"Chapter {entry['number']} unchanged: {entry['file']}")
+            else:
+                self.log_signal.emit(f"Chapter {entry['number']} saved: {entry['file']}")
+            # The chapter count is unknown until the document is read to the end
+            self.progress.emit(min(95, 10 + done * 5))
+
+        self.progress.emit(10)
+        try:
+            index = asyncio.run(render_chapters(self.file_path, self.output_dir, voice=self.voice,
+                                                speed=self.speed, volume=self.volume, pitch=self.pitch,
+                                                parallelism=self.parallelism, on_chapter_done=on_chapter_done))
+        except Exception as e:
+            self.finished.emit(f"Error: {e}")
+            return
+        self.progress.emit(100)
+        total = len(index['chapters'])
+        if failed:
+            self.finished.emit(f"{total - failed}/{total} chapters saved, {failed} failed - save again to retry them")
+            return
+        try:
+            # Frame copy into one file with chapter markers, no re-encoding
+            result = assemble_book(self.output_dir)
+            self.log_signal.emit(f"Audiobook assembled: {result['output']} ({result['duration']:.0f}s)")
+        except Exception as e:
+            self.log_signal.emit(f"Could not assemble the audiobook: {e}")
+        self.finished.emit(f"{total} chapters saved to {self.output_dir}")
+
+
+class StreamingWorker(QThread):
+    """Worker thread converting a huge .txt file segment by segment with bounded memory (core.streaming)"""
+    progress = pyqtSignal(int)
+    log_signal = pyqtSignal(str)
+    finished = pyqtSignal(str)
+
+    LOG_EVERY = 50  # Segments between log lines
+
+    def __init__(self, file_path, output_file, voice=None, language=None, model="Edge TTS",
+                 speed=1.0, volume=100, pitch=0, parallelism=2):
+        super().__init__()
+        self.file_path = file_path
+        self.output_file = output_file
+        self.voice = voice
+        self.language = language
+        self.model = model
+        self.speed = speed
+        self.volume = volume
+        self.pitch = pitch
+        self.parallelism = parallelism
+
+    def run(self):
+        def on_segment(number, consumed, size):
+            self.progress.emit(min(99, int(consumed * 100 / size)) if size else 99)
+            if number % self.LOG_EVERY == 0:
+                self.log_signal.emit(f"Segment {number} saved ({consumed / 2**20:.0f}/{size / 2**20:.0f} MB read)")
+
+        self.progress.emit(1)
+        try:
+            result = asyncio.run(stream_to_file(self.file_path, self.output_file, voice=self.voice,
+                                                language=self.language, model=self.model, speed=self.speed,
+                                                volume=self.volume, pitch=self.pitch,
+                                                parallelism=self.parallelism, on_segment=on_segment))
+        except Exception as e:
+            self.finished.emit(f"Error: {e}")
+            return
+        self.progress.emit(100)
+        self.finished.emit(f"TTS completed: {result['segments']} segments, {result['bytes'] / 2**20:.1f} MB of audio")
+
+
+class TranslationWorker(QThread):
+    """Worker thread running translator.translate off the GUI thread; stop() cancels between requests"""
+    progress = pyqtSignal(int, int)  # Segments done, total segments
+    finished = pyqtSignal(object)  # {'text', 'stats', 'error', 'cancelled'}
+
+    def __init__(self, translator, text, target_language):
+        super().__init__()
+        self.translator = translator
+        self.text = text
+        self.target_language = target_language
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        result = {'text': None, 'stats': {}, 'error': None, 'cancelled': False}
+        try:
+            result['text'] = self.translator.translate(self.text, self.target_language,
+                                                       on_progress=self.progress.emit,
+                                                       is_cancelled=lambda: self.stopped)
+            result['stats'] = self.translator.last_stats
+        except TranslationCancelled:
+            result['cancelled'] = True
+        except Exception as e:
+            result['error'] = e
+        self.finished.emit(result)
+
+
+class TranslateSpeakWorker(QThread):
+    """Worker thread translating text and synthesizing each translated segment as it arrives (core.translate_speak)"""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)  # {'result', 'error', 'cancelled'}
+
+    def __init__(self, translator, text, target_language, voice, output_file, speed=1.0, volume=100, pitch=0,
+                 parallelism=2):
+        super().__init__()
+        self.translator = translator
+        self.text = text
+        self.target_language = target_language
+        self.voice = voice
+        self.output_file = output_file
+        self.speed = speed
+        self.volume = volume
+        self.pitch = pitch
+        self.parallelism = parallelism
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+    def run(self):
+        def on_progress(translated, spoken, total):
+            # First half of the bar follows translation, second half the audio written
+            self.progress.emit((translated + spoken) * 100 // (2 * total) if total else 100)
+
+        result = {'result': None, 'error': None, 'cancelled': False}
+        try:
+            result['result'] = asyncio.run(translate_and_speak(
+                self.text, self.output_file, self.translator, self.target_language, self.voice,
+                speed=self.speed, volume=self.volume, pitch=self.pitch, parallelism=self.parallelism,
+                on_progress=on_progress, is_cancelled=lambda: self.stopped))
+        except TranslationCancelled:
+            result['cancelled'] = True
+        except Exception as e:
+            result['error'] = e
+        self.finished.emit(result)
@@ -0,0 +1,134 @@
+"""
+Language detection and voice resolution shared by the GUI tabs and the command line.
+Nothing in this module imports PyQt5.
+"""
+import os
+from langdetect import detect
+
+LANGUAGES = ["English", "Russian", "Ukrainian", "Japanese"]
+
+# langdetect code -> application language name
+DETECTED_LANGUAGES = {
+    'en': "English",
+    'ru': "Russian",
+    'uk': "Ukrainian",
+    'ja': "Japanese"
+}
+
+# Language -> short code used in output file names
+LANG_CODES = {
+    "Russian": "ru",
+    "English": "eng",
+    "Ukrainian": "ua",
+    "Japanese": "jp"
+}
+
+MODEL_TAGS = {
+    "Edge TTS": "edge"
+}
+
+# Batch voice labels -> Edge TTS voice names
+BATCH_VOICE_MAP = {
+    "English": {
+        "Male (Zira)": "en-US-ZiraNeural",
+        "Female (Aria)": "en-US-AriaNeural"
+    },
+    "Russian": {
+        "Male (Dmitry)": "ru-RU-DmitryNeural",
+        "Female (Svetlana)": "ru-RU-SvetlanaNeural"
+    },
+    "Ukrainian": {
+        "Male (Ostap)": "uk-UA-OstapNeural",
+        "Female (Polina)": "uk-UA-PolinaNeural"
+    },
+    "Japanese": {
+        "Male (Keita)": "ja-JP-KeitaNeural",
+        "Female (Nanami)": "ja-JP-NanamiNeural"
+    }
+}
+
+DEFAULT_VOICE = "en-US-AriaNeural"
+
+
+def detect_language(text):
+    """Detect application language of text; None if detection failed"""
+    try:
+        return DETECTED_LANGUAGES.get(detect(text), "English")
+    except Exception:
+        return None
+
+
+def batch_voice_options(model, lang):
+    """Return available voice labels for a batch row based on model and language"""
+    if model == "Edge TTS":
+        if lang == "English":
+            return ["Male (Zira)", "Female (Aria)"]
+        elif lang == "Russian":
+            return ["Male (Dmitry)", "Female (Svetlana)"]
+        elif lang == "Ukrainian":
+            return ["Male (Ostap)", "Female (Polina)"]
+        elif lang == "Japanese":
+            return ["Male (Keita)", "Female (Nanami)"]
+        else:
+            return ["Female (Aria)", "Male (Zira)"]
+    return []
+
+
+def default_batch_voice(model, lang):
+    """Language-appropriate default voice label (the female voice)"""
+    if model == "Edge TTS":
+        if lang == "English":
+            return "Female (Aria)"
+        elif lang == "Russian":
+            return "Female (Svetlana)"
+        elif lang == "Ukrainian":
+            return "Female (Polina)"
+        elif lang == "Japanese":
+            return "Female (Nanami)"
+    return "Female (Aria)"
+
+
+def resolve_batch_voice(model, lang, voice_label):
+    """Map a batch voice label to the Edge TTS voice name"""
+    if model == "Edge TTS":
+        return BATCH_VOICE_MAP.get(lang, {}).get(voice_label, DEFAULT_VOICE)
+    return DEFAULT_VOICE
+
+
+def batch_voice_label(model, lang, voice):
+    """Batch label of an Edge TTS voice name for lang ("en-US-AriaNeural" -> "Female (Aria)")"""
+    if model == "Edge TTS":
+        for label, name in BATCH_VOICE_MAP.get(lang, {}).items():
+            if name == voice:
+                return label
+    return default_batch_voice(model, lang)
+
+
+def voice_gender(voice, lang=None, model="Edge TTS"):
+    """"male"/"female" of a batch label, a gender or (with lang) an Edge TTS name; None if unknown"""
+    if voice and voice.endswith("Neural") and lang:
+        voice = next((label for label, name in BATCH_VOICE_MAP.get(lang, {}).items() if name == voice), None)
+    gender = voice.split(' ')[0].lower() if voice else None
+    return gender if gender in ("male", "female") else None
+
+
+def resolve_voice(voice, lang, model="Edge TTS"):
+    """Resolve a user supplied voice for lang.
+
+    Accepts a full Edge TTS name ("en-US-AriaNeural"), a batch label
+    ("Female (Aria)"), a gender ("male"/"female") or nothing (language default).
+    """
+    if voice and voice.endswith("Neural"):
+        return voice
+    if voice and voice.lower() in ("male", "female"):
+        for label in batch_voice_options(model, lang):
+            if label.lower().startswith(voice.lower()):
+                return resolve_batch_voice(model, lang, label)
+    return resolve_batch_voice(model, lang, voice or default_batch_voice(model, lang))
+
+
+def batch_output_filename(index, lang, model, filename, extension="wav"):
+    """Output file name used by batch conversion: batch_<n>_<lang>_<model>_<name>.<ext>"""
+    lang_code = LANG_CODES.get(lang, "unk")
+    model_tag = MODEL_TAGS.get(model, "edge")
+    return f"batch_{index}_{lang_code}_{model_tag}_{os.path.splitext(filename)[0]}.{extension}"
@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QTimer, QEvent
 from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QPlainTextEdit, QVBoxLayout, QWidget, QPushButton, QLabel, QSlider, QSpinBox, QHBoxLayout, QGroupBox, QStyle, QListWidget, QProgressBar, QComboBox
 from PyQt5.QtGui import QIcon
@@ -66,7 +67,7 @@ class MainWindow(QMainWindow):
         self.voice_pitch = 0  # -50 to +50 Hz
 
         # Batch processing variables
-        self.batch_files = []  # List of (file_path, content, detected_lang, selected_model, selected_lang, selected_voice)
+        self.batch_files = []  # Batch items live in BatchTabManager.batch_files
         self.batch_processing = False
 
         # Create text widgets (exactly as in your Qt Designer layout)
@@ -350,17 +351,17 @@ class MainWindow(QMainWindow):
                 QGroupBox {
                     font: 11pt "Segoe UI";
                 }
-                QTableWidget {
+                QTableView {
                     background-color: #FFFFFF;
                     color: #000000;
                     gridline-color: #CCCCCC;
                 }
-                QTableWidget::item {
+                QTableView::item {
                     background-color: #FFFFFF;
                     color: #000000;
                     border: 1px solid #CCCCCC;
                 }
-                QTableWidget::item:selected {
+                QTableView::item:selected {
                     background-color: #0078D4;
                     color: #FFFFFF;
                 }
@@ -672,8 +673,8 @@ class MainWindow(QMainWindow):
     def process_next_batch_file(self):
         self.batch_tab_manager.process_next_batch_file()
 
-    def get_selected_voice_for_batch(self, file_info):
-        return self.batch_tab_manager.get_selected_voice_for_batch(file_info)
+    def get_selected_voice_for_batch(self, item):
+        return self.batch_tab_manager.get_selected_voice_for_batch(item)
 
     def update_batch_progress(self, value):
         self.batch_tab_manager.update_batch_progress(value)
@@ -682,6 +683,8 @@ class MainWindow(QMainWindow):
         self.batch_tab_manager.on_batch_file_finished(msg)
 
 if __name__ == "__main__":
+    # PDF import extracts pages in worker processes; required for the packaged exe
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,54 @@
+import os
+import zipfile
+
+import pytest
+
+pytest.importorskip("langdetect")
+
+from core.batch_items import BatchItem, BatchItemList
+from core.documents import read_document
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def write_text(path, content):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    return str(path)
+
+
+def write_docx(path, paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{_W}"><w:body>{body}</w:body></w:document>')
+    return str(path)
+
+
+@pytest.mark.parametrize("content", ["One line", "First\nSecond\n", "First\n\nThird\n\n"])
+def test_txt_chars_match_read_document(tmp_path, content):
+    path = write_text(tmp_path / "doc.txt", content)
+    assert BatchItem.from_file(path).chars == len(read_document(path))
+
+
+def test_docx_chars_match_read_document(tmp_path):
+    path = write_docx(tmp_path / "doc.docx", ["First paragraph", "", "Third"])
+    assert BatchItem.from_file(path).chars == len(read_document(path))
+
+
+def test_empty_file_is_skipped(tmp_path):
+    assert BatchItem.from_file(write_text(tmp_path / "empty.txt", "\n \n")) is None
+
+
+def test_list_totals(tmp_path):
+    items = BatchItemList()
+    paths = [write_text(tmp_path / "a.txt", "Hello"), write_text(tmp_path / "b.txt", "Hello again\n")]
+    items.extend([BatchItem.from_file(path) for path in paths])
+
+    assert len(items) == 2
+    assert items.total_chars == len("Hello") + len("Hello again\n")
+    assert items.total_size == sum(os.path.getsize(path) for path in paths)
+    assert [item.filename for item in items] == ["a.txt", "b.txt"]
+
+    items.clear()
+    assert not items
+    assert (items.total_chars, items.total_size) == (0, 0)
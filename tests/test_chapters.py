@@ -0,0 +1,35 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("langdetect")
+pytest.importorskip("edge_tts")
+
+import core.chapters
+from core.chapters import Chapter, render_chapters
+
+
+def render(monkeypatch, output_dir, titles):
+    async def synthesize_with_retries(text, voice, output_file, **settings):
+        with open(output_file, "wb") as f:
+            f.write(text.encode("utf-8"))
+        return len(text), 0
+
+    def iter_chapters(file_path, split_level):
+        for number, title in enumerate(titles, 1):
+            yield Chapter(number, title, f"Text of {title}.")
+
+    monkeypatch.setattr(core.chapters, "synthesize_with_retries", synthesize_with_retries)
+    monkeypatch.setattr(core.chapters, "iter_chapters", iter_chapters)
+    return asyncio.run(render_chapters("book.epub", output_dir, voice="en-US-AriaNeural"))
+
+
+def test_rerender_removes_chapters_the_book_no_longer_has(monkeypatch, tmp_path):
+    output_dir = str(tmp_path)
+    render(monkeypatch, output_dir, ["Opening", "Middle", "Ending"])
+    index = render(monkeypatch, output_dir, ["Opening", "Ending"])
+
+    files = [entry["file"] for entry in index["chapters"]]
+    assert [entry["status"] for entry in index["chapters"]] == ["unchanged", "done"]
+    assert sorted(name for name in os.listdir(output_dir) if name.endswith(".wav")) == sorted(files)
@@ -0,0 +1,32 @@
+import zipfile
+
+import pytest
+
+from core.documents import DocumentError, iter_document
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def write_docx(path, body):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{_W}"><w:body>{body}')
+
+
+def paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_docx_paragraphs(tmp_path):
+    path = str(tmp_path / "ok.docx")
+    write_docx(path, paragraph("One") + paragraph("Two") + "</w:body></w:document>")
+    assert list(iter_document(path)) == ["One", "Two"]
+
+
+def test_docx_damaged_after_first_paragraph(tmp_path):
+    path = str(tmp_path / "damaged.docx")
+    write_docx(path, paragraph("One") + "<w:p><w:r><w:t>Tw")
+    pages = []
+    with pytest.raises(DocumentError):
+        for text in iter_document(path):
+            pages.append(text)
+    assert pages == ["One"]
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from core.folder_watcher import FolderSnapshot
+
+
+def write(path, content="text"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_file_reported_once_settled(tmp_path):
+    snapshot = FolderSnapshot([str(tmp_path)], settle_seconds=2.0)
+    path = str(tmp_path / "book.txt")
+    write(path)
+    write(str(tmp_path / "notes.md"))
+    write(str(tmp_path / "~$draft.docx"))
+
+    assert snapshot.scan(now=0.0) == []
+    assert snapshot.has_pending()
+    assert snapshot.scan(now=1.0) == []
+    assert snapshot.scan(now=2.5) == [path]
+    assert not snapshot.has_pending()
+    assert snapshot.scan(now=10.0) == []
+
+
+def test_changed_file_settles_again(tmp_path):
+    snapshot = FolderSnapshot([str(tmp_path)], settle_seconds=1.0)
+    path = str(tmp_path / "book.txt")
+    write(path)
+    snapshot.scan(now=0.0)
+    assert snapshot.scan(now=1.0) == [path]
+
+    write(path, "longer text")
+    assert snapshot.scan(now=2.0) == []
+    assert snapshot.scan(now=3.0) == [path]
+
+
+def test_vanished_file_is_forgotten(tmp_path):
+    snapshot = FolderSnapshot([str(tmp_path)], settle_seconds=1.0)
+    path = str(tmp_path / "book.txt")
+    write(path)
+    snapshot.scan(now=0.0)
+    os.remove(path)
+    assert snapshot.scan(now=2.0) == []
+    assert not snapshot.has_pending()
@@ -0,0 +1,75 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.key_pool import KeyPool, KeyPoolExhausted, KEY_ACTIVE, KEY_COOLING, KEY_REJECTED
+from core.quota import UsageLedger
+
+SERVICE = "Microsoft Translator"
+# Answer of the stand-in service per key
+STATUSES = {'rejected-key': 401, 'throttled-key': 429, 'working-key': 200}
+
+
+class _KeyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        key = self.headers.get('X-Key')
+        self.server.keys.append(key)
+        status = STATUSES.get(key, 401)
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '120')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _KeyHandler)
+    server.keys = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(tmp_path, keys):
+    ledger = UsageLedger(str(tmp_path / "quota_usage.json"))
+    return KeyPool(SERVICE, [{'key': key} for key in keys], settings={}, ledger=ledger), ledger
+
+
+def send(pool, server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    return pool.request('GET', lambda key: (url, {'headers': {'X-Key': key.key}}), units=5)
+
+
+def test_rotates_past_rejected_and_throttled_keys(server, tmp_path):
+    pool, ledger = make_pool(tmp_path, ['rejected-key', 'throttled-key', 'working-key'])
+    response = send(pool, server)
+
+    assert response.status_code == 200
+    assert server.keys == ['rejected-key', 'throttled-key', 'working-key']
+    assert [row['state'] for row in pool.stats()] == [KEY_REJECTED, KEY_COOLING, KEY_ACTIVE]
+    # Only the request that went through is charged
+    assert [ledger.usage(SERVICE, key) for key in STATUSES] == [0, 0, 5]
+
+    # The next request goes straight to the working key
+    send(pool, server)
+    assert server.keys[3:] == ['working-key']
+    ledger.flush()
+
+
+def test_every_key_rejected(server, tmp_path):
+    pool, _ = make_pool(tmp_path, ['rejected-key', 'other-rejected-key'])
+    assert send(pool, server).status_code == 401
+    assert server.keys == ['rejected-key', 'other-rejected-key']
+    with pytest.raises(KeyPoolExhausted):
+        send(pool, server)
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+pytest.importorskip("langdetect")
+
+from core.manifest import iter_manifest, read_manifest_text, manifest_text_column
+
+
+def write(path, content):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    return str(path)
+
+
+def valid_items(path):
+    return [item for item, error in iter_manifest(path) if item is not None]
+
+
+def errors(path):
+    return [error for item, error in iter_manifest(path) if error is not None]
+
+
+def test_csv_rows_read_back_from_offsets(tmp_path):
+    path = write(tmp_path / "rows.csv",
+                 'id,voice,text,language\n'
+                 'a,,"Hello, world",English\n'
+                 'b,,"Two\nlines",English\n'
+                 'c,Male (Dmitry),Привет,Russian\n')
+    items = valid_items(path)
+    assert [item.row_id for item in items] == ["a", "b", "c"]
+    assert manifest_text_column(path) == 2
+    assert [item.load_text() for item in items] == ["Hello, world", "Two\nlines", "Привет"]
+    # Without the column index the header is parsed again
+    assert read_manifest_text(path, items[1].text_offset) == "Two\nlines"
+
+
+def test_jsonl_rows_and_line_numbers(tmp_path):
+    rows = [{"id": "one", "text": "First", "language": "en"}, "not an object", {"text": "", "language": "en"}]
+    path = write(tmp_path / "rows.jsonl", "\n".join(json.dumps(row) for row in rows) + "\n")
+    items = valid_items(path)
+    assert [(item.row_id, item.language, item.load_text()) for item in items] == [("one", "English", "First")]
+    assert errors(path) == ["line 2: row is not a JSON object", "line 3: empty text"]
+
+
+def test_voice_label_must_match_row_language(tmp_path):
+    path = write(tmp_path / "voices.csv",
+                 'text,language,voice\n'
+                 'Hello,English,Female (Aria)\n'
+                 'Hello,English,Male (Dmitry)\n')
+    assert [item.voice for item in valid_items(path)] == ["Female (Aria)"]
+    assert len(errors(path)) == 1
+    assert errors(path)[0].startswith("line 3: unknown voice 'Male (Dmitry)' for English")
@@ -0,0 +1,57 @@
+from core.mp3 import build_info_frame, iter_frames, parse_frame_header, parse_info_tag, split_at_times
+
+# Edge TTS format: MPEG-2 layer III, 24 kHz, 48 kbps, mono - 144 byte frames of 24 ms
+EDGE_HEADER = bytes((0xFF, 0xF3, 0x64, 0xC0))
+FRAME_BYTES = 144
+
+
+def audio(frames):
+    return b"".join(EDGE_HEADER + bytes([index % 256]) * (FRAME_BYTES - 4) for index in range(frames))
+
+
+def test_frame_header():
+    frame = parse_frame_header(EDGE_HEADER)
+    assert (frame.length, frame.sample_rate, frame.bitrate, frame.samples) == (FRAME_BYTES, 24000, 48000, 576)
+    assert frame.duration == 0.024
+    assert parse_frame_header(b"\xff\xff\xff\xff") is None
+
+
+def test_frames_skip_tags_and_garbage():
+    id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\0" * 10
+    id3v1 = b"TAG" + b"\0" * 125
+    data = id3v2 + b"junk" + audio(5) + id3v1
+    frames = list(iter_frames(data))
+    assert len(frames) == 5
+    assert frames[0].offset == len(id3v2) + 4
+    assert all(frame.length == FRAME_BYTES for frame in frames)
+
+
+def test_truncated_last_frame_is_dropped():
+    assert len(list(iter_frames(audio(3)[:-10]))) == 2
+
+
+def test_split_at_times_on_frame_boundaries():
+    pieces = split_at_times(audio(10), [0.1, 0.2])
+    assert [len(piece) // FRAME_BYTES for piece in pieces] == [5, 4, 1]
+    assert b"".join(pieces) == audio(10)
+    assert all(len(piece) % FRAME_BYTES == 0 for piece in pieces)
+
+
+def test_info_tag_round_trip():
+    tag = build_info_frame(EDGE_HEADER, 100, 100 * FRAME_BYTES, encoder=b"LAME3.100", delay=576, padding=1000)
+    frame = parse_frame_header(tag)
+    assert frame.length == len(tag)
+    info = parse_info_tag(tag, frame)
+    assert info == {'frames': 100, 'bytes': 100 * FRAME_BYTES, 'encoder': b"LAME3.100",
+                    'delay': 576, 'padding': 1000}
+
+
+def test_info_tag_without_lame_extension():
+    tag = build_info_frame(EDGE_HEADER, 7, 7 * FRAME_BYTES)
+    info = parse_info_tag(tag, parse_frame_header(tag))
+    assert (info['frames'], info['bytes'], info['encoder']) == (7, 7 * FRAME_BYTES, None)
+
+
+def test_audio_frame_has_no_info_tag():
+    data = audio(1)
+    assert parse_info_tag(data, parse_frame_header(data)) is None
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langdetect")
+pytest.importorskip("edge_tts")
+
+import core.batch
+import core.packing
+from core.packing import PackingError, cut_times, pack_text, synthesize_phrases
+
+
+def test_cut_times_between_phrases():
+    text, starts = pack_text(["Hello world", "Second one"])
+    boundaries = [(0.0, 0.4, "Hello"), (0.5, 0.4, "world"), (1.5, 0.5, "Second"), (2.1, 0.3, "one")]
+    assert cut_times(text, starts, boundaries) == [pytest.approx((0.9 + 1.5) / 2)]
+
+
+def test_cut_times_skips_unmatched_word_inside_phrase():
+    text, starts = pack_text(["It costs 12 euros", "Thanks"])
+    boundaries = [(0.0, 0.2, "It"), (0.3, 0.3, "costs"), (0.7, 0.5, "twelve"), (1.3, 0.4, "euros"),
+                  (2.5, 0.5, "Thanks")]
+    assert cut_times(text, starts, boundaries) == [pytest.approx((1.7 + 2.5) / 2)]
+
+
+def test_cut_times_rejects_unmatched_word_between_phrases():
+    text, starts = pack_text(["Call me", "5 times"])
+    boundaries = [(0.0, 0.3, "Call"), (0.4, 0.2, "me"), (1.2, 0.4, "five"), (1.7, 0.4, "times")]
+    with pytest.raises(PackingError):
+        cut_times(text, starts, boundaries)
+
+
+def test_pack_retries_are_charged_once(monkeypatch, tmp_path):
+    calls = []
+
+    async def synthesize_with_boundaries(text, voice, **settings):
+        calls.append(text)
+        if len(calls) == 1:
+            raise ConnectionError("dropped")
+        words = text.replace("\n\n", " ").replace(".", "").split()
+        return b"audio", [(float(i), 0.5, word) for i, word in enumerate(words)]
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(core.packing, "synthesize_with_boundaries", synthesize_with_boundaries)
+    monkeypatch.setattr(core.packing, "split_at_times", lambda audio, cuts: [b"part"] * (len(cuts) + 1))
+    monkeypatch.setattr(core.batch.asyncio, "sleep", no_sleep)
+
+    phrases = ["First phrase", "Second phrase", "Third phrase"]
+    outputs = [str(tmp_path / f"{i}.mp3") for i in range(len(phrases))]
+    sizes, retries = asyncio.run(synthesize_phrases(phrases, outputs, "en-US-AriaNeural", retries=2))
+
+    assert len(calls) == 2
+    assert sizes == [4, 4, 4]
+    assert retries == [1, 0, 0]
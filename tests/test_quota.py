@@ -0,0 +1,53 @@
+import json
+import os
+
+import pytest
+
+import core.quota
+from core.quota import UsageLedger, current_month, key_id
+
+SERVICE = "Microsoft Translator"
+
+
+def saved(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "quota_usage.json"))
+    yield ledger
+    ledger.flush()
+
+
+def test_records_are_saved_in_batches(ledger, monkeypatch):
+    monkeypatch.setattr(core.quota, "SAVE_EVERY", 3)
+    ledger.record(SERVICE, "key-a", 100)
+    ledger.record(SERVICE, "key-a", 50)
+    assert saved(ledger.path) == {}
+    assert ledger.usage(SERVICE, "key-a") == 150
+
+    ledger.record(SERVICE, "key-b", 10)
+    usage = saved(ledger.path)[current_month()][SERVICE]
+    assert usage[key_id("key-a")] == {'chars': 150, 'requests': 2}
+    assert usage[key_id("key-b")] == {'chars': 10, 'requests': 1}
+
+
+def test_flush_saves_pending_records(ledger):
+    ledger.record(SERVICE, "key-a", 100)
+    ledger.record(SERVICE, "key-a", 0)  # Nothing sent, nothing recorded
+    ledger.flush()
+    assert saved(ledger.path)[current_month()][SERVICE][key_id("key-a")] == {'chars': 100, 'requests': 1}
+    assert UsageLedger(ledger.path).service_usage(SERVICE) == {key_id("key-a"): 100}
+
+
+def test_timer_saves_after_interval(ledger, monkeypatch):
+    monkeypatch.setattr(core.quota, "SAVE_INTERVAL", 0.05)
+    ledger.record(SERVICE, "key-a", 100)
+    timer = ledger._timer
+    timer.join(5)
+    assert saved(ledger.path)[current_month()][SERVICE][key_id("key-a")]['chars'] == 100
+    assert ledger._timer is None
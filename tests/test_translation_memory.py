@@ -0,0 +1,52 @@
+import itertools
+import types
+
+import pytest
+
+import core.translation_memory
+from core.translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    # A clock that always moves on, so least recently used is well defined
+    clock = itertools.count(1)
+    monkeypatch.setattr(core.translation_memory, "time", types.SimpleNamespace(time=lambda: float(next(clock))))
+    memory = TranslationMemory(str(tmp_path / "memory.db"), max_entries=20)
+    yield memory
+    memory.close()
+
+
+def pairs(numbers):
+    return [(f"Segment {n}", f"Segment {n} translated") for n in numbers]
+
+
+def test_lookup_normalizes_whitespace(memory):
+    memory.store("Microsoft", "German", [("Hello  world\n", "Hallo Welt")])
+    assert memory.lookup("Microsoft", "German", ["Hello world", "Other"]) == {0: "Hallo Welt"}
+    assert memory.lookup("Google", "German", ["Hello world"]) == {}
+
+
+def test_replaced_segments_do_not_evict(memory):
+    memory.store("Microsoft", "German", pairs(range(20)))
+    memory.store("Microsoft", "German", pairs(range(20)))
+    assert memory.stats()['entries'] == 20
+    assert len(memory.lookup("Microsoft", "German", [f"Segment {n}" for n in range(20)])) == 20
+
+
+def test_overflow_evicts_least_recently_used(memory):
+    for n in range(20):
+        memory.store("Microsoft", "German", pairs([n]))
+    # Segments 0-4 are used again, so 5 and 6 are now the oldest
+    memory.lookup("Microsoft", "German", [f"Segment {n}" for n in range(5)])
+    memory.store("Microsoft", "German", pairs([20]))
+
+    assert memory.stats()['entries'] == 19  # 5% below the cap
+    found = memory.lookup("Microsoft", "German", [f"Segment {n}" for n in range(21)])
+    assert sorted(set(range(21)) - set(found)) == [5, 6]
+
+
+def test_clear(memory):
+    memory.store("Microsoft", "German", pairs(range(3)))
+    memory.clear()
+    assert memory.stats() == {'entries': 0, 'chars': 0}
@@ -0,0 +1,74 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("requests")
+
+from core.http_client import cancel_scope
+from core.translator import MicrosoftTranslator, TranslatorError, segment_text, pack_segments
+
+
+class _TranslateHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        self.server.hits += 1
+        payload = json.dumps([{'translations': [{'text': item['text'].upper()}]} for item in body]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _TranslateHandler)
+    server.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_translator(server):
+    translator = MicrosoftTranslator("test-key")
+    translator.endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    return translator
+
+
+def test_translate_sends_requests(server):
+    assert make_translator(server).translate("Hello there.", "Russian") == "HELLO THERE."
+    assert server.hits == 1
+
+
+def test_cancel_scope_reaches_request_threads(server):
+    cancelled = threading.Event()
+    cancelled.set()
+    translator = make_translator(server)
+    with cancel_scope(cancelled):
+        with pytest.raises(TranslatorError):
+            translator.translate("Hello there.", "Russian")
+        # Key checks turn the error into "invalid"; no request may go out either way
+        assert translator.test_key() is False
+    assert server.hits == 0
+
+
+def test_segment_text_keeps_layout_and_limit():
+    text = "First sentence. Second sentence!\n\n" + "word " * 400
+    segments, layout = segment_text(text, 200)
+    assert all(len(segment) <= 200 for segment in segments)
+    assert ''.join(segments[item] if isinstance(item, int) else item for item in layout) == text
+
+
+def test_pack_segments_within_limits():
+    segments = ["x" * 40] * 25
+    batches = pack_segments(segments, 10, 100)
+    assert [index for batch in batches for index in batch] == list(range(25))
+    assert all(len(batch) <= 10 and sum(len(segments[i]) for i in batch) <= 100 for batch in batches)
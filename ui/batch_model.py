@@ -0,0 +1,284 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtWidgets import QApplication, QComboBox, QStyle, QStyledItemDelegate, QStyleOptionProgressBar
+from core.voices import batch_voice_options
+
+# Column layout of the batch table
+COL_FILE = 0
+COL_LANGUAGE = 1
+COL_MODEL = 2
+COL_VOICE = 3
+COL_STATUS = 4
+
+COLUMN_HEADERS = ["File", "Language", "Model", "Voice", "Status"]
+
+# Custom item roles
+SortRole = Qt.UserRole
+ProgressRole = Qt.UserRole + 1
+OptionsRole = Qt.UserRole + 2
+
+BATCH_MODELS = ["Edge TTS"]
+
+STATUS_QUEUED = "Queued"
+STATUS_PROCESSING = "Processing"
+STATUS_DONE = "Done"
+STATUS_ERROR = "Error"
+
+
+class BatchTableModel(QAbstractTableModel):
+    """Table model over the batch file list.
+
+    Rows are the BatchItem records owned by BatchTabManager, so the model
+    never copies them; it only announces which rows or cells changed.
+    """
+
+    def __init__(self, batch_files, parent=None):
+        super().__init__(parent)
+        self.batch_files = batch_files
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.batch_files)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(COLUMN_HEADERS):
+            return COLUMN_HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in (COL_MODEL, COL_VOICE):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self.batch_files)):
+            return None
+
+        item = self.batch_files[index.row()]
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == COL_FILE:
+                return f"{item.filename}\n({item.chars} chars)"
+            elif column == COL_LANGUAGE:
+                return item.language
+            elif column == COL_MODEL:
+                return item.model
+            elif column == COL_VOICE:
+                return item.voice
+            elif column == COL_STATUS:
+                return self.status_text(item)
+        elif role == Qt.ToolTipRole:
+            if column == COL_FILE:
+                return (f"File: {item.filename}\n"
+                        f"Characters: {item.chars}\n"
+                        f"Language: {item.language}")
+            elif column == COL_STATUS and item.error:
+                return item.error
+            elif column == COL_STATUS and item.metrics:
+                metrics = item.metrics
+                return (f"Queue wait: {metrics['queue_wait_s']:.1f}s\n"
+                        f"Synthesis: {metrics['synthesis_s']:.1f}s ({metrics['chars_per_s']:.0f} chars/s)\n"
+                        f"Audio: {metrics['audio_s']:.1f}s, {metrics['bytes']} bytes\n"
+                        f"Retries: {metrics['retries']}")
+        elif role == SortRole:
+            if column == COL_FILE:
+                return item.filename.lower()
+            elif column == COL_STATUS:
+                return item.progress
+            return self.data(index, Qt.DisplayRole)
+        elif role == ProgressRole:
+            return item.progress
+        elif role == OptionsRole:
+            if column == COL_MODEL:
+                return BATCH_MODELS
+            elif column == COL_VOICE:
+                return batch_voice_options(item.model, item.language)
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+
+        row = index.row()
+        item = self.batch_files[row]
+
+        if index.column() == COL_MODEL:
+            if item.model == value:
+                return False
+            item.model = value
+            # Reset voice to first available option for the new model
+            options = batch_voice_options(value, item.language)
+            if options:
+                item.voice = options[0]
+            self.dataChanged.emit(self.index(row, COL_MODEL), self.index(row, COL_VOICE))
+            return True
+        elif index.column() == COL_VOICE:
+            if item.voice == value:
+                return False
+            item.voice = value
+            self.dataChanged.emit(index, index)
+            return True
+        return False
+
+    def status_text(self, item):
+        """Human readable status for the status column"""
+        status = item.status or STATUS_QUEUED
+        if status == STATUS_PROCESSING:
+            return f"{status} {item.progress}%"
+        if status == STATUS_DONE and item.metrics:
+            return f"{status} {item.metrics['synthesis_s']:.1f}s"
+        return status
+
+    def append_files(self, new_items):
+        """Append batch items to the list, announcing only the inserted rows"""
+        if not new_items:
+            return
+        first = len(self.batch_files)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_items) - 1)
+        self.batch_files.extend(new_items)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all rows"""
+        self.beginResetModel()
+        self.batch_files.clear()
+        self.endResetModel()
+
+    def set_all_models(self, model):
+        """Apply a model to every row with a single change notification"""
+        if not self.batch_files:
+            return
+        for item in self.batch_files:
+            item.model = model
+        self.dataChanged.emit(self.index(0, COL_MODEL), self.index(len(self.batch_files) - 1, COL_MODEL))
+
+    def set_language(self, row, language, voice):
+        """Set language and voice of one row (after translation) and repaint those cells"""
+        if not (0 <= row < len(self.batch_files)):
+            return
+        item = self.batch_files[row]
+        item.language = language
+        item.voice = voice
+        self.dataChanged.emit(self.index(row, COL_LANGUAGE), self.index(row, COL_VOICE))
+
+    def set_status(self, row, status, progress=None, error=None):
+        """Update status of one row and repaint only its status cell"""
+        if not (0 <= row < len(self.batch_files)):
+            return
+        item = self.batch_files[row]
+        item.status = status
+        if progress is not None:
+            item.progress = progress
+        item.error = error
+        index = self.index(row, COL_STATUS)
+        self.dataChanged.emit(index, index)
+
+    def set_progress(self, row, progress):
+        """Update progress of one row, skipping no-op repaints"""
+        if not (0 <= row < len(self.batch_files)):
+            return
+        item = self.batch_files[row]
+        if item.progress == progress and item.status == STATUS_PROCESSING:
+            return
+        self.set_status(row, STATUS_PROCESSING, progress)
+
+    def set_range_processing(self, first_row, last_row):
+        """Mark rows first_row..last_row as processing at 0% with a single change notification"""
+        last_row = min(last_row, len(self.batch_files) - 1)
+        if first_row > last_row:
+            return
+        for item in self.batch_files[first_row:last_row + 1]:
+            item.status = STATUS_PROCESSING
+            item.progress = 0
+            item.error = None
+        self.dataChanged.emit(self.index(first_row, COL_STATUS), self.index(last_row, COL_STATUS))
+
+    def set_range_progress(self, first_row, last_row, progress):
+        """Set the shared progress of the rows still processing in first_row..last_row
+        (files sharing requests in one batch) with a single ranged repaint"""
+        last_row = min(last_row, len(self.batch_files) - 1)
+        changed = False
+        for item in self.batch_files[first_row:last_row + 1]:
+            if item.status == STATUS_PROCESSING and item.progress != progress:
+                item.progress = progress
+                changed = True
+        if changed:
+            self.dataChanged.emit(self.index(first_row, COL_STATUS), self.index(last_row, COL_STATUS),
+                                  [Qt.DisplayRole, ProgressRole, SortRole])
+
+    def reset_statuses(self, first_row=0):
+        """Mark rows from first_row on as queued before a new run"""
+        if first_row >= len(self.batch_files):
+            return
+        for item in self.batch_files[first_row:]:
+            item.status = STATUS_QUEUED
+            item.progress = 0
+            item.error = None
+            item.metrics = None
+        self.dataChanged.emit(self.index(first_row, COL_STATUS), self.index(len(self.batch_files) - 1, COL_STATUS))
+
+
+class BatchFilterProxyModel(QSortFilterProxyModel):
+    """Sort/filter proxy for the batch table; filters on file name, language, voice and status"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SortRole)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+        self.setDynamicSortFilter(False)
+
+
+class BatchItemDelegate(QStyledItemDelegate):
+    """Delegate that creates combo box editors on demand and paints row progress"""
+
+    def createEditor(self, parent, option, index):
+        options = index.data(OptionsRole)
+        if options is None:
+            return super().createEditor(parent, option, index)
+        editor = QComboBox(parent)
+        editor.addItems(options)
+        # Commit as soon as the user picks an entry
+        editor.activated.connect(lambda _: self._commit_and_close(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(index.data(Qt.EditRole) or "")
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
+    def paint(self, painter, option, index):
+        progress = index.data(ProgressRole)
+        if index.column() != COL_STATUS or not progress:
+            super().paint(painter, option, index)
+            return
+
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 2, -2, -2)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = int(progress)
+        bar.text = index.data(Qt.DisplayRole) or ""
+        bar.textVisible = True
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter)
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.NoHint)
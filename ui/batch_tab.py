@@ -1,18 +1,46 @@
 import os
 import sys
-from PyQt5.QtWidgets import QFileDialog, QPushButton, QListWidget, QLabel, QProgressBar, QComboBox, QTableWidget, QTableWidgetItem
-from langdetect import detect
-from docx import Document
-from core.tts_worker import TTSWorker
+import time
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QFileDialog, QPushButton, QListWidget, QLabel, QProgressBar, QComboBox, QTableView, QLineEdit, QAbstractItemView, QHeaderView, QCheckBox, QMessageBox
+from core.tts_worker import TTSWorker, AsyncBatchWorker, ManifestWorker
+from core.batch_items import BatchItem, BatchItemList
+from core.batch import make_job, job_record, STATUS_DONE as JOB_DONE
+from core.dedup import run_dedup_batch, DedupStats
+from core.packing import run_packed_batch
+from core.pipeline import run_pipeline_batch, translation_stage, format_stats, DEFAULT_QUEUE_SIZE, DEFAULT_MEMORY_BUDGET
+from core.batch_report import BatchReport, make_record
+from core.voices import resolve_voice, batch_voice_label, voice_gender, batch_output_filename
+from core.translator import TranslatorManager, TranslatorError, LANGUAGE_CODES
+from core.quota import STATUS_OVER, STATUS_WARN, ACTION_BLOCK
+from core.documents import SUPPORTED_EXTENSIONS
+from core.manifest import MANIFEST_EXTENSIONS
+from core.settings import load_settings, save_settings
+from core.folder_watcher import FolderWatcher
+from ui.batch_model import (BatchTableModel, BatchFilterProxyModel, BatchItemDelegate,
+                            STATUS_PROCESSING, STATUS_DONE, STATUS_ERROR)
 
 class BatchTabManager:
     """Manager for Text to Audio (Batch) tab functionality"""
 
     def __init__(self, main_window):
         self.main_window = main_window
-        self.batch_files = []  # List of file info dictionaries
+        self.batch_files = BatchItemList()  # Compact BatchItem records, text is loaded on demand
         self.batch_processing = False
         self.current_batch_index = 0
+        self.batch_start_index = 0
+        self.batch_report = None
+        self.current_file_started = 0.0
+        self.folder_watcher = None
+        self.manifest_worker = None
+        self.manifest_queue = []  # Manifests waiting for the running ManifestWorker
+        self.async_batch = None  # (runner, name) of the running async batch
+        self.translator_manager = TranslatorManager()
+        self.batch_translation = None  # (translator, target language) of the running batch
+        self.batch_end_index = 0
+        self.batch_model = BatchTableModel(self.batch_files)
+        self.batch_proxy_model = BatchFilterProxyModel()
+        self.batch_proxy_model.setSourceModel(self.batch_model)
         
         # Setup batch UI elements
         self.setup_batch_ui()
@@ -27,22 +55,43 @@ class BatchTabManager:
             self.main_window.batchImportButton = self.main_window.findChild(QPushButton, "batchImportButton")
             self.main_window.batchProcessButton = self.main_window.findChild(QPushButton, "batchProcessButton")
             self.main_window.clearBatchListButton = self.main_window.findChild(QPushButton, "clearBatchListButton")
-            self.main_window.batchFileTable = self.main_window.findChild(QTableWidget, "batchFileTable")
+            self.main_window.batchFileTable = self.main_window.findChild(QTableView, "batchFileTable")
+            self.main_window.batchFilterInput = self.main_window.findChild(QLineEdit, "batchFilterInput")
             self.main_window.batchStatusLabel = self.main_window.findChild(QLabel, "batchStatusLabel")
             self.main_window.batchProgressBar = self.main_window.findChild(QProgressBar, "batchProgressBar")
             self.main_window.batchInfoLabel = self.main_window.findChild(QLabel, "batchInfoLabel")
             self.main_window.batchModelComboBox = self.main_window.findChild(QComboBox, "batchModelComboBox")
             self.main_window.batchModelLabel = self.main_window.findChild(QLabel, "batchModelLabel")
-
-            # Setup table column widths
+            self.main_window.batchWatchButton = self.main_window.findChild(QPushButton, "batchWatchButton")
+            self.main_window.batchReportLabel = self.main_window.findChild(QLabel, "batchReportLabel")
+            self.main_window.batchDedupCheckBox = self.main_window.findChild(QCheckBox, "batchDedupCheckBox")
+            self.main_window.batchPackCheckBox = self.main_window.findChild(QCheckBox, "batchPackCheckBox")
+            self.main_window.batchTranslateCheckBox = self.main_window.findChild(QCheckBox, "batchTranslateCheckBox")
+            self.main_window.batchTranslateLangComboBox = self.main_window.findChild(QComboBox, "batchTranslateLangComboBox")
+
+            # Attach model, proxy and delegate to the table view
             if self.main_window.batchFileTable:
-                # Set column widths: File (wide), Language (medium), Model (medium), Voice (narrow)
-                self.main_window.batchFileTable.setColumnWidth(0, 250)  # File column - widest
-                self.main_window.batchFileTable.setColumnWidth(1, 100)  # Language column - medium
-                self.main_window.batchFileTable.setColumnWidth(2, 100)  # Model column - medium
-                self.main_window.batchFileTable.setColumnWidth(3, 80)   # Voice column - narrowest
+                table = self.main_window.batchFileTable
+                table.setModel(self.batch_proxy_model)
+                self.batch_delegate = BatchItemDelegate(table)
+                table.setItemDelegate(self.batch_delegate)
+                # Editors for model/voice are created only when the user asks for them
+                table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
+                # Fixed row height: the view never measures rows, which keeps 100k rows cheap
+                table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+                table.verticalHeader().setDefaultSectionSize(36)
+                table.setSortingEnabled(True)
+                table.sortByColumn(-1, Qt.AscendingOrder)  # Keep import order until a header is clicked
+                # Set column widths: File (wide), Language (medium), Model (medium), Voice (narrow), Status (rest)
+                table.setColumnWidth(0, 250)  # File column - widest
+                table.setColumnWidth(1, 100)  # Language column - medium
+                table.setColumnWidth(2, 100)  # Model column - medium
+                table.setColumnWidth(3, 80)   # Voice column - narrowest
                 # Disable alternating row colors to avoid visibility issues with themes
-                self.main_window.batchFileTable.setAlternatingRowColors(False)
+                table.setAlternatingRowColors(False)
+
+            if self.main_window.batchFilterInput:
+                self.main_window.batchFilterInput.textChanged.connect(self.batch_proxy_model.setFilterFixedString)
 
             # Initialize UI state
             if self.main_window.batchStatusLabel:
@@ -58,6 +107,10 @@ class BatchTabManager:
                 self.main_window.batchModelComboBox.setCurrentText("Edge TTS")
                 self.main_window.batchModelComboBox.currentTextChanged.connect(self.update_default_model)
 
+            if self.main_window.batchTranslateLangComboBox:
+                self.main_window.batchTranslateLangComboBox.addItems(list(LANGUAGE_CODES))
+                self.main_window.batchTranslateLangComboBox.setCurrentText("English")
+
         except Exception as e:
             print(f"Batch UI setup error: {e}")
 
@@ -68,11 +121,7 @@ class BatchTabManager:
             self.main_window.log_message(f"Batch default model changed to: {model}", "blue")
 
             # Update existing files with new default model
-            for file_info in self.batch_files:
-                file_info['selected_model'] = model
-
-            # Update UI to reflect changes
-            self.update_batch_ui()
+            self.batch_model.set_all_models(model)
 
     def connect_batch_buttons(self):
         """Connect batch processing buttons"""
@@ -83,6 +132,25 @@ class BatchTabManager:
                 self.main_window.batchProcessButton.clicked.connect(self.batch_process_files)
             if hasattr(self.main_window, 'clearBatchListButton') and self.main_window.clearBatchListButton:
                 self.main_window.clearBatchListButton.clicked.connect(self.clear_batch_list)
+            # Dedup and packing are alternative runners, at most one can be on;
+            # translation is a stage of the pipeline runner, so it excludes both
+            dedup_box = getattr(self.main_window, 'batchDedupCheckBox', None)
+            pack_box = getattr(self.main_window, 'batchPackCheckBox', None)
+            translate_box = getattr(self.main_window, 'batchTranslateCheckBox', None)
+            if dedup_box and pack_box:
+                dedup_box.toggled.connect(lambda checked: checked and pack_box.setChecked(False))
+                pack_box.toggled.connect(lambda checked: checked and dedup_box.setChecked(False))
+            if translate_box:
+                for box in (dedup_box, pack_box):
+                    if box:
+                        translate_box.toggled.connect(lambda checked, box=box: checked and box.setChecked(False))
+                        box.toggled.connect(lambda checked: checked and translate_box.setChecked(False))
+            if hasattr(self.main_window, 'batchWatchButton') and self.main_window.batchWatchButton:
+                self.main_window.batchWatchButton.setCheckable(True)
+                self.main_window.batchWatchButton.toggled.connect(self.toggle_watch_mode)
+                # Resume watch mode from the previous session
+                if load_settings().get('watch_enabled', False):
+                    self.main_window.batchWatchButton.setChecked(True)
         except AttributeError as e:
             print(f"Batch button connection error: {e}")
 
@@ -91,135 +159,101 @@ class BatchTabManager:
         # Use project root directory as default
         program_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
         
-        file_paths, _ = QFileDialog.getOpenFileNames(self.main_window, "Select Text Files", program_dir, "Text Files (*.txt *.docx)")
+        file_paths, _ = QFileDialog.getOpenFileNames(self.main_window, "Select Text Files", program_dir,
+                                                     "Text Files (*.txt *.docx *.pdf *.epub);;Manifests (*.csv *.jsonl)")
 
         if not file_paths:
             return
 
+        for path in file_paths:
+            if path.endswith(MANIFEST_EXTENSIONS):
+                self.import_manifest(path)
+        documents = [path for path in file_paths if not path.endswith(MANIFEST_EXTENSIONS)]
+        if documents:
+            self.import_paths(documents)
+
+    def import_manifest(self, manifest_path):
+        """Parse a CSV/JSONL manifest in the background; rows are appended in chunks as they are validated.
+
+        Manifests selected while one is being imported are queued and imported in turn.
+        """
+        if self.manifest_worker and self.manifest_worker.isRunning():
+            self.manifest_queue.append(manifest_path)
+            self.main_window.log_message(f"Queued manifest: {os.path.basename(manifest_path)}", "blue")
+            return
+        model = "Edge TTS"
+        if hasattr(self.main_window, 'batchModelComboBox') and self.main_window.batchModelComboBox:
+            model = self.main_window.batchModelComboBox.currentText()
+        self.main_window.log_message(f"Importing manifest: {os.path.basename(manifest_path)}", "blue")
+        self.manifest_worker = ManifestWorker(manifest_path, model=model)
+        self.manifest_worker.rows_ready.connect(self.on_manifest_rows)
+        self.manifest_worker.log_signal.connect(lambda msg: self.main_window.log_message(f"[Manifest] {msg}", "orange"))
+        self.manifest_worker.finished.connect(self.on_manifest_finished)
+        self.manifest_worker.start()
+
+    def on_manifest_rows(self, items):
+        """Append a chunk of validated manifest rows; a running batch picks them up as it reaches them"""
+        if self.batch_processing:
+            queued_at = time.monotonic()
+            for item in items:
+                item.queued_at = queued_at
+        self.batch_model.append_files(items)
+        self.update_batch_ui()
+
+    def on_manifest_finished(self, loaded, errors):
+        # finished is emitted by run() itself; let the thread end before the next manifest starts
+        self.manifest_worker.wait()
+        color = "orange" if errors else "green"
+        self.main_window.log_message(f"Manifest import completed: {loaded} rows, {errors} skipped", color)
+        if self.manifest_queue:
+            self.import_manifest(self.manifest_queue.pop(0))
+        else:
+            self.log_time_estimate()
+
+    def import_paths(self, file_paths, output_dir=None):
+        """Read, detect language and append files to the batch list; returns the new batch items"""
         total_chars = 0
         imported_count = 0
+        new_files = []
 
         for file_path in file_paths:
             try:
-                # Read file content
-                if file_path.endswith('.txt'):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                elif file_path.endswith('.docx'):
-                    doc = Document(file_path)
-                    content = '\n'.join([para.text for para in doc.paragraphs])
-                else:
+                if not file_path.endswith(SUPPORTED_EXTENSIONS):
                     continue
 
-                if not content.strip():
+                # Determine default model
+                model = "Edge TTS"
+                if hasattr(self.main_window, 'batchModelComboBox') and self.main_window.batchModelComboBox:
+                    model = self.main_window.batchModelComboBox.currentText()
+
+                # Read once for char count and language detection; text is not kept
+                item = BatchItem.from_file(file_path, model=model, output_dir=output_dir)
+                if item is None:
                     continue
 
-                # Detect language
-                try:
-                    detected_lang = detect(content)
-                    if detected_lang == 'ru':
-                        lang = "Russian"
-                    elif detected_lang == 'en':
-                        lang = "English"
-                    elif detected_lang == 'uk':
-                        lang = "Ukrainian"
-                    elif detected_lang == 'ja':
-                        lang = "Japanese"
-                    else:
-                        lang = "English"
-                except:
-                    lang = "English"
-
-                # Determine default model based on language
-                default_model = "Edge TTS"
-                if hasattr(self.main_window, 'batchModelComboBox') and self.main_window.batchModelComboBox:
-                    default_model = self.main_window.batchModelComboBox.currentText()
-
-                model = default_model
-
-                # Set default voice based on language and model
-                if model == "Edge TTS":
-                    if lang == "English":
-                        default_voice = "Female (Aria)"
-                    elif lang == "Russian":
-                        default_voice = "Female (Svetlana)"
-                    elif lang == "Ukrainian":
-                        default_voice = "Female (Polina)"
-                    elif lang == "Japanese":
-                        default_voice = "Female (Nanami)"
-                    else:
-                        default_voice = "Female (Aria)"
-
-                # Add to batch list
-                filename = os.path.basename(file_path)
-                self.batch_files.append({
-                    'file_path': file_path,
-                    'filename': filename,
-                    'content': content,
-                    'detected_lang': lang,
-                    'selected_model': model,
-                    'selected_lang': lang,
-                    'selected_voice': default_voice  # Use language-appropriate default voice
-                })
-
-                total_chars += len(content)
+                new_files.append(item)
+                total_chars += item.chars
                 imported_count += 1
 
-                self.main_window.log_message(f"Imported: {filename} ({len(content)} chars, detected: {lang})", "green")
+                self.main_window.log_message(f"Imported: {item.filename} ({item.chars} chars, detected: {item.language})", "green")
 
             except Exception as e:
                 self.main_window.log_message(f"Error importing {os.path.basename(file_path)}: {e}", "red")
 
-        # Update UI
+        # Insert only the new rows, then refresh counters
+        self.batch_model.append_files(new_files)
         self.update_batch_ui()
         self.main_window.log_message(f"Batch import completed: {imported_count} files, {total_chars} total characters", "blue")
+        self.log_time_estimate()
+        return new_files
 
     def update_batch_ui(self):
-        """Update batch processing UI elements"""
+        """Update batch processing UI elements (counters and buttons; rows are handled by the model)"""
         if not hasattr(self.main_window, 'batchFileTable'):
             return
 
-        # Update the table widget
-        try:
-            table = self.main_window.batchFileTable
-            table.setRowCount(len(self.batch_files))
-            
-            for row, file_info in enumerate(self.batch_files):
-                filename = file_info['filename']
-                chars = len(file_info['content'])
-                lang = file_info['detected_lang']
-                model = file_info['selected_model']
-                voice = file_info['selected_voice']
-                
-                # File name column
-                file_item = QTableWidgetItem(f"{filename}\n({chars} chars)")
-                file_item.setToolTip(f"File: {filename}\nCharacters: {chars}\nLanguage: {lang}")
-                table.setItem(row, 0, file_item)
-                
-                # Language column
-                lang_item = QTableWidgetItem(lang)
-                table.setItem(row, 1, lang_item)
-                
-                # Model combo box column
-                model_combo = QComboBox()
-                model_combo.addItems(["Edge TTS"])
-                model_combo.setCurrentText(model)
-                model_combo.currentTextChanged.connect(lambda text, r=row: self.update_file_model(r, text))
-                table.setCellWidget(row, 2, model_combo)
-                
-                # Voice combo box column
-                voice_combo = QComboBox()
-                self.update_voice_options_for_row(voice_combo, model, lang)
-                voice_combo.setCurrentText(voice)
-                voice_combo.currentTextChanged.connect(lambda text, r=row: self.update_file_voice(r, text))
-                table.setCellWidget(row, 3, voice_combo)
-
-        except Exception as e:
-            print(f"Error updating batch table: {e}")
-            return
-
         # Update status label
-        total_chars = sum(len(f['content']) for f in self.batch_files)
+        total_chars = self.batch_files.total_chars
         if hasattr(self.main_window, 'batchStatusLabel') and self.main_window.batchStatusLabel:
             try:
                 self.main_window.batchStatusLabel.setText(f"Files: {len(self.batch_files)} | Characters: {total_chars}")
@@ -233,53 +267,21 @@ class BatchTabManager:
             except Exception as e:
                 print(f"Error enabling batch process button: {e}")
 
-        # Estimate processing time (rough estimate: ~10 chars/second for TTS)
+    def log_time_estimate(self):
+        """Log the estimated processing time of the batch list; called once per import"""
+        # Rough estimate: ~10 chars/second for TTS
         if len(self.batch_files) > 0:
-            estimated_time = total_chars / 10  # seconds
+            estimated_time = self.batch_files.total_chars / 10  # seconds
             time_str = f"~{estimated_time:.0f}s" if estimated_time < 60 else f"~{estimated_time/60:.1f}min"
             self.main_window.log_message(f"Estimated processing time: {time_str} for {len(self.batch_files)} files", "blue")
 
-    def update_file_model(self, row, model):
-        """Update model selection for a specific file"""
-        if 0 <= row < len(self.batch_files):
-            self.batch_files[row]['selected_model'] = model
-            # Update voice options when model changes
-            table = self.main_window.batchFileTable
-            voice_combo = table.cellWidget(row, 3)
-            if voice_combo:
-                lang = self.batch_files[row]['detected_lang']
-                self.update_voice_options_for_row(voice_combo, model, lang)
-                # Reset voice to first available option
-                if voice_combo.count() > 0:
-                    voice_combo.setCurrentIndex(0)
-                    self.batch_files[row]['selected_voice'] = voice_combo.currentText()
-
-    def update_file_voice(self, row, voice):
-        """Update voice selection for a specific file"""
-        if 0 <= row < len(self.batch_files):
-            self.batch_files[row]['selected_voice'] = voice
-
-    def update_voice_options_for_row(self, voice_combo, model, lang):
-        """Update available voice options for a combo box based on model and language"""
-        voice_combo.clear()
-        
-        if model == "Edge TTS":
-            if lang == "English":
-                voice_combo.addItems(["Male (Zira)", "Female (Aria)"])
-            elif lang == "Russian":
-                voice_combo.addItems(["Male (Dmitry)", "Female (Svetlana)"])
-            elif lang == "Ukrainian":
-                voice_combo.addItems(["Male (Ostap)", "Female (Polina)"])
-            elif lang == "Japanese":
-                voice_combo.addItems(["Male (Keita)", "Female (Nanami)"])
-            else:
-                voice_combo.addItems(["Female (Aria)", "Male (Zira)"])
-
     def clear_batch_list(self):
         """Clear the batch file list"""
-        self.batch_files.clear()
-        if hasattr(self.main_window, 'batchFileTable'):
-            self.main_window.batchFileTable.setRowCount(0)
+        self.manifest_queue.clear()
+        if self.manifest_worker and self.manifest_worker.isRunning():
+            self.manifest_worker.stop()
+            self.manifest_worker.wait()
+        self.batch_model.clear()
         self.update_batch_ui()
         self.main_window.log_message("Batch file list cleared", "blue")
 
@@ -293,14 +295,72 @@ class BatchTabManager:
             self.main_window.log_message("Batch processing already in progress", "orange")
             return
 
+        if not self.prepare_translation(0):
+            return
+        self.start_batch(0)
+
+    def prepare_translation(self, start_index, confirm=True):
+        """Set up the translation stage when "Translate to" is checked; False if the batch must not start"""
+        self.batch_translation = None
+        translate_box = getattr(self.main_window, 'batchTranslateCheckBox', None)
+        if not translate_box or not translate_box.isChecked():
+            return True
+        lang_box = getattr(self.main_window, 'batchTranslateLangComboBox', None)
+        target_language = lang_box.currentText() if lang_box else "English"
+
+        settings = load_settings()
+        service = settings.get('translator_service', 'Microsoft Translator')
+        api_key = settings.get('translator_api_key', '')
+        if not api_key:
+            self.main_window.log_message("Batch translation needs a translator API key in Settings", "red")
+            if confirm:
+                QMessageBox.warning(self.main_window, "API Key Required",
+                                    "Please set up translator API key in Settings first.")
+            return False
+        try:
+            translator = self.translator_manager.get_translator(service, api_key,
+                                                                use_memory=settings.get('translation_memory', True),
+                                                                track_quota=True)
+        except TranslatorError as e:
+            self.main_window.log_message(f"Batch translation error: {e}", "red")
+            return False
+
+        # Upper bound from the import-time language of every row: files already in the
+        # target language and segments found in the translation memory are not sent
+        chars = sum(item.chars for item in self.batch_files[start_index:] if item.language != target_language)
+        check = translator.quota.check(chars)
+        if check.status == STATUS_OVER:
+            if translator.quota.action == ACTION_BLOCK:
+                self.main_window.log_message(f"Batch translation blocked: {check.message()}", "red")
+                if confirm:
+                    QMessageBox.warning(self.main_window, "Translation Quota", check.message())
+                return False
+            if confirm:
+                answer = QMessageBox.question(self.main_window, "Translation Quota",
+                                              f"{check.message()}\n\nTranslate anyway?",
+                                              QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+                if answer != QMessageBox.Yes:
+                    return False
+            else:
+                self.main_window.log_message(check.message(), "orange")
+        elif check.status == STATUS_WARN:
+            self.main_window.log_message(check.message(), "yellow")
+
+        self.batch_translation = (translator, target_language)
+        self.main_window.log_message(f"Translating files to {target_language} using {service} before synthesis "
+                                     f"(up to {chars:,} characters)", "blue")
+        return True
+
+    def start_batch(self, start_index):
+        """Start processing batch rows from start_index to the end of the list"""
         self.batch_processing = True
-        self.main_window.log_message(f"Starting batch processing of {len(self.batch_files)} files...", "blue")
+        self.main_window.log_message(f"Starting batch processing of {len(self.batch_files) - start_index} files...", "blue")
 
         # Show progress bar
         if hasattr(self.main_window, 'batchProgressBar') and self.main_window.batchProgressBar:
             self.main_window.batchProgressBar.setVisible(True)
             self.main_window.batchProgressBar.setValue(0)
-            self.main_window.batchProgressBar.setMaximum(len(self.batch_files))
+            self.main_window.batchProgressBar.setMaximum(100)
 
         # Disable buttons during processing
         if hasattr(self.main_window, 'batchProcessButton'):
@@ -311,7 +371,121 @@ class BatchTabManager:
             self.main_window.clearBatchListButton.setEnabled(False)
 
         # Start batch processing
-        self.current_batch_index = 0
+        self.batch_model.reset_statuses(start_index)
+        self.batch_report = BatchReport()
+        queued_at = time.monotonic()
+        for item in self.batch_files[start_index:]:
+            item.queued_at = queued_at
+        self.batch_start_index = start_index
+        self.current_batch_index = start_index
+        dedup_box = getattr(self.main_window, 'batchDedupCheckBox', None)
+        pack_box = getattr(self.main_window, 'batchPackCheckBox', None)
+        if self.batch_translation is not None:
+            self.start_async_batch(start_index, run_pipeline_batch, "Pipeline")
+        elif dedup_box and dedup_box.isChecked():
+            self.start_async_batch(start_index, run_dedup_batch, "Dedup")
+        elif pack_box and pack_box.isChecked():
+            self.start_async_batch(start_index, run_packed_batch, "Pack")
+        elif load_settings().get('batch_pipeline', True):
+            self.start_async_batch(start_index, run_pipeline_batch, "Pipeline")
+        else:
+            self.process_next_batch_file()
+
+    def pipeline_options(self):
+        """Stage concurrency, queue size and memory budget of the batch pipeline from settings.json"""
+        settings = load_settings()
+        options = {
+            'concurrency': settings.get('pipeline_concurrency', {}),
+            'queue_size': settings.get('pipeline_queue_size', DEFAULT_QUEUE_SIZE),
+            'memory_budget': int(settings.get('pipeline_memory_mb', DEFAULT_MEMORY_BUDGET // 2**20)) * 2**20,
+            'ocr': self.main_window.img_to_text_tab_manager.ocr_image_bytes
+        }
+        if self.batch_translation is not None:
+            translator, target_language = self.batch_translation
+            options['translate'] = translation_stage(translator, target_language)
+            # Enough documents in flight to keep every request slot of the service busy
+            options['concurrency'] = dict({'translate': translator.MAX_CONCURRENT_REQUESTS}, **options['concurrency'])
+        return options
+
+    def start_async_batch(self, start_index, runner, name):
+        """Run the rows from start_index in one worker with a core batch runner (pipeline, dedup or packing)"""
+        self.async_batch = (runner, name)
+        self.batch_start_index = start_index
+        target_language = self.batch_translation[1] if self.batch_translation else None
+        jobs = []
+        for index in range(start_index, len(self.batch_files)):
+            item = self.batch_files[index]
+            item.output_file = self.get_batch_output_file(index, item, language=target_language)
+            if target_language:
+                # The pipeline detects the language of the whole text and picks the voice after
+                # translation; only the gender of the row's voice is kept
+                language, voice = None, voice_gender(item.voice, item.language, item.model)
+            else:
+                language, voice = item.language, self.get_selected_voice_for_batch(item)
+            jobs.append(make_job(item.file_path, item.output_file, language=language,
+                                 voice=voice, model=item.model,
+                                 speed=item.speed, volume=item.volume, pitch=item.pitch,
+                                 text_offset=item.text_offset, text_column=item.text_column))
+
+        self.batch_end_index = len(self.batch_files)
+        self.batch_model.set_range_processing(start_index, self.batch_end_index - 1)
+        pipeline = runner is run_pipeline_batch
+        self.main_window.batch_worker = AsyncBatchWorker(jobs, runner,
+                                    speed=self.main_window.voice_speed,
+                                    volume=self.main_window.voice_volume,
+                                    pitch=self.main_window.voice_pitch,
+                                    runner_kwargs=self.pipeline_options() if pipeline else None,
+                                    report_stats=pipeline)
+        self.main_window.batch_worker.stats.connect(self.update_pipeline_stats)
+        self.main_window.batch_worker.progress.connect(self.update_async_progress)
+        self.main_window.batch_worker.log_signal.connect(lambda msg: self.main_window.log_message(f"[{name}] {msg}", "blue"))
+        self.main_window.batch_worker.job_finished.connect(self.on_async_job_finished)
+        self.main_window.batch_worker.finished.connect(self.on_async_batch_finished)
+        self.main_window.batch_worker.start()
+
+    def update_async_progress(self, value):
+        """Requests are shared between files, so progress is reported for the whole batch"""
+        if hasattr(self.main_window, 'batchProgressBar') and self.main_window.batchProgressBar:
+            self.main_window.batchProgressBar.setValue(value)
+        self.batch_model.set_range_progress(self.batch_start_index, self.batch_end_index - 1, value)
+
+    def update_pipeline_stats(self, stats):
+        """Show pipeline queue depths and buffered memory while the batch runs"""
+        if hasattr(self.main_window, 'batchReportLabel') and self.main_window.batchReportLabel:
+            self.main_window.batchReportLabel.setText(format_stats(stats))
+
+    def on_async_job_finished(self, job_index, job):
+        """Record one finished (or failed) output of a pipeline/dedup/packed batch"""
+        index = self.batch_start_index + job_index
+        item = self.batch_files[index]
+        item.metrics = job_record(job)
+        if job['status'] == JOB_DONE:
+            if self.batch_translation is not None:
+                self.batch_model.set_language(index, job['language'],
+                                              batch_voice_label(item.model, job['language'], job['voice']))
+            self.batch_model.set_status(index, STATUS_DONE, 100)
+            self.main_window.log_message(f"Completed: {item.filename} (File saved: {job['bytes']} bytes)", "green")
+        else:
+            self.batch_model.set_status(index, STATUS_ERROR, error=job['error'])
+            self.main_window.log_message(f"Failed: {item.filename} - {job['error']}", "orange")
+        if self.batch_report:
+            self.batch_report.add(item.metrics)
+
+    def on_async_batch_finished(self, result):
+        """Merge dedup savings into the report and finish the batch"""
+        if isinstance(result, DedupStats):
+            self.main_window.log_message(f"[Dedup] Unique paragraphs: {result.unique_segments}/{result.segments}, "
+                                         f"saved {result.saved_chars} of {result.total_chars} chars", "blue")
+            if self.batch_report:
+                self.batch_report.stats.update(result.as_dict())
+        for index in range(self.batch_start_index, self.batch_end_index):
+            if self.batch_files[index].status == STATUS_PROCESSING:
+                self.batch_model.set_status(index, STATUS_ERROR, error="Batch aborted")
+        if result is not None and len(self.batch_files) > self.batch_end_index:
+            # Rows appended while running (watch mode) go through the same runner
+            self.start_async_batch(self.batch_end_index, *self.async_batch)
+            return
+        self.current_batch_index = len(self.batch_files)
         self.process_next_batch_file()
 
     def process_next_batch_file(self):
@@ -320,6 +494,7 @@ class BatchTabManager:
             # Batch processing completed
             self.batch_processing = False
             self.main_window.log_message("Batch processing completed!", "green")
+            self.finish_batch_report()
 
             # Hide progress bar
             if hasattr(self.main_window, 'batchProgressBar'):
@@ -335,14 +510,38 @@ class BatchTabManager:
 
             return
 
-        file_info = self.batch_files[self.current_batch_index]
-        filename = file_info['filename']
-        content = file_info['content']
-        model = file_info['selected_model']
-        lang = file_info['selected_lang']
+        item = self.batch_files[self.current_batch_index]
+        filename = item.filename
+        model = item.model
+        lang = item.language
 
         self.main_window.log_message(f"Processing file {self.current_batch_index + 1}/{len(self.batch_files)}: {filename}", "blue")
 
+        output_file = self.get_batch_output_file(self.current_batch_index, item)
+        item.output_file = output_file
+        self.main_window.log_message(f"Output file: {output_file}", "blue")
+
+        # Get voice for this file
+        voice = self.get_selected_voice_for_batch(item)
+
+        # Start TTS worker
+        # Text is read inside the worker thread, only for the file being synthesized
+        self.current_file_started = time.monotonic()
+        # Manifest rows may override the voice settings
+        self.main_window.batch_worker = TTSWorker(None, voice, output_file,
+                                    speed=item.speed if item.speed is not None else self.main_window.voice_speed,
+                                    volume=item.volume if item.volume is not None else self.main_window.voice_volume,
+                                    pitch=item.pitch if item.pitch is not None else self.main_window.voice_pitch,
+                                    model=model,
+                                    text_loader=lambda: item.load_text(ocr=self.main_window.img_to_text_tab_manager.ocr_image_bytes),
+                                    measure_output=True)
+        self.main_window.batch_worker.progress.connect(self.update_batch_progress)
+        self.main_window.batch_worker.log_signal.connect(lambda msg: self.main_window.log_message(f"[{filename}] {msg}", "blue"))
+        self.main_window.batch_worker.finished.connect(self.on_batch_file_finished)
+        self.main_window.batch_worker.start()
+
+    def get_batch_output_file(self, index, item, language=None):
+        """Output path for batch row index (in language, default the row's); creates the output directory"""
         # Create output directory - use correct base directory for portable version
         if getattr(sys, 'frozen', False):
             # Running as packaged exe - use exe directory
@@ -360,116 +559,144 @@ class BatchTabManager:
                 # Fallback to script directory if main.py not found
                 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         
-        output_dir = os.path.join(base_dir, 'tts_audio')
+        output_dir = item.output_dir or os.path.join(base_dir, 'tts_audio')
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
             self.main_window.log_message(f"Created output directory: {output_dir}", "blue")
 
-        # Generate output filename
-        lang_code = {
-            "Russian": "ru",
-            "English": "eng",
-            "Ukrainian": "ua",
-            "Japanese": "jp"
-        }.get(lang, "unk")
-
-        if model == "Edge TTS":
-            model_tag = "edge"
-
-        output_file = os.path.join(output_dir, f"batch_{self.current_batch_index + 1}_{lang_code}_{model_tag}_{os.path.splitext(filename)[0]}.wav")
-        self.main_window.log_message(f"Output file: {output_file}", "blue")
-
-        # Get voice for this file
-        voice = self.get_selected_voice_for_batch(file_info)
-
-        # Start TTS worker
-        self.main_window.batch_worker = TTSWorker(content, voice, output_file,
-                                    speed=self.main_window.voice_speed,
-                                    volume=self.main_window.voice_volume,
-                                    pitch=self.main_window.voice_pitch,
-                                    model=model)
-        self.main_window.batch_worker.progress.connect(self.update_batch_progress)
-        self.main_window.batch_worker.log_signal.connect(lambda msg: self.main_window.log_message(f"[{filename}] {msg}", "blue"))
-        self.main_window.batch_worker.finished.connect(self.on_batch_file_finished)
-        self.main_window.batch_worker.start()
+        if item.output_name:
+            # Manifest row: output path given by the manifest
+            output_file = os.path.join(output_dir, item.output_name)
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        elif item.output_dir:
+            # Watch mode: stable name so a re-dropped file overwrites its previous output
+            output_file = os.path.join(output_dir, f"{os.path.splitext(item.filename)[0]}.wav")
+        else:
+            output_file = os.path.join(output_dir, batch_output_filename(index + 1, language or item.language,
+                                                                         item.model, item.filename))
+        return output_file
 
-    def get_selected_voice_for_batch(self, file_info):
+    def get_selected_voice_for_batch(self, item):
         """Get selected voice for batch file processing"""
-        model = file_info['selected_model']
-        lang = file_info['selected_lang']
-        voice_type = file_info['selected_voice']
-
-        if model == "Edge TTS":
-            voice_map = {
-                "English": {
-                    "Male (Zira)": "en-US-ZiraNeural",
-                    "Female (Aria)": "en-US-AriaNeural"
-                },
-                "Russian": {
-                    "Male (Dmitry)": "ru-RU-DmitryNeural", 
-                    "Female (Svetlana)": "ru-RU-SvetlanaNeural"
-                },
-                "Ukrainian": {
-                    "Male (Ostap)": "uk-UA-OstapNeural",
-                    "Female (Polina)": "uk-UA-PolinaNeural"
-                },
-                "Japanese": {
-                    "Male (Keita)": "ja-JP-KeitaNeural",
-                    "Female (Nanami)": "ja-JP-NanamiNeural"
-                }
-            }
-            return voice_map.get(lang, {}).get(voice_type, "en-US-AriaNeural")
-        return "en-US-AriaNeural"
+        return resolve_voice(item.voice, item.language, item.model)
 
     def update_batch_progress(self, value):
         """Update batch progress bar"""
         if hasattr(self.main_window, 'batchProgressBar') and self.main_window.batchProgressBar:
             # Update overall progress
             current_file_progress = value / 100.0
-            overall_progress = (self.current_batch_index + current_file_progress) / len(self.batch_files) * 100
+            total = max(1, len(self.batch_files) - self.batch_start_index)
+            overall_progress = (self.current_batch_index - self.batch_start_index + current_file_progress) / total * 100
             self.main_window.batchProgressBar.setValue(int(overall_progress))
+        self.batch_model.set_progress(self.current_batch_index, value)
 
     def on_batch_file_finished(self, msg):
         """Handle completion of batch file processing"""
-        filename = self.batch_files[self.current_batch_index]['filename']
-        
-        # Check if output file was created - use correct base directory for portable version
-        if getattr(sys, 'frozen', False):
-            # Running as packaged exe - use exe directory
-            base_dir = os.path.dirname(sys.executable)
-        else:
-            # Running in development - find project root (directory containing main.py)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Go up until we find main.py or reach drive root
-            while current_dir and current_dir != os.path.dirname(current_dir):
-                if os.path.exists(os.path.join(current_dir, 'main.py')):
-                    base_dir = current_dir
-                    break
-                current_dir = os.path.dirname(current_dir)
-            else:
-                # Fallback to script directory if main.py not found
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        output_dir = os.path.join(base_dir, 'tts_audio')
-        lang_code = {
-            "Russian": "ru",
-            "English": "eng", 
-            "Ukrainian": "ua",
-            "Japanese": "jp"
-        }.get(self.batch_files[self.current_batch_index]['selected_lang'], "unk")
-        
-        model = self.batch_files[self.current_batch_index]['selected_model']
-        if model == "Edge TTS":
-            model_tag = "edge"
-            
-        output_file = os.path.join(output_dir, f"batch_{self.current_batch_index + 1}_{lang_code}_{model_tag}_{os.path.splitext(filename)[0]}.wav")
-        
-        if os.path.exists(output_file):
+        item = self.batch_files[self.current_batch_index]
+        filename = item.filename
+        output_file = item.output_file
+
+        finished = time.monotonic()
+        queue_wait = self.current_file_started - item.queued_at if item.queued_at is not None else 0.0
+        synthesis_time = finished - self.current_file_started
+
+        if os.path.exists(output_file) and not msg.startswith("Error"):
             file_size = os.path.getsize(output_file)
-            self.main_window.log_message(f"Completed: {filename} - {msg} (File saved: {file_size} bytes)", "green")
+            item.metrics = make_record(item.file_path, output_file, "done", chars=item.chars,
+                                       queue_wait=queue_wait, synthesis_time=synthesis_time, size_bytes=file_size,
+                                       audio_duration=self.main_window.batch_worker.audio_duration)
+            self.batch_model.set_status(self.current_batch_index, STATUS_DONE, 100)
+            self.main_window.log_message(f"Completed: {filename} - {msg} (File saved: {file_size} bytes, "
+                                         f"{item.metrics['audio_s']:.1f}s of audio)", "green")
         else:
+            item.metrics = make_record(item.file_path, output_file, "failed", chars=item.chars,
+                                       queue_wait=queue_wait, synthesis_time=synthesis_time, error=msg)
+            self.batch_model.set_status(self.current_batch_index, STATUS_ERROR, error=msg)
             self.main_window.log_message(f"Completed: {filename} - {msg} (WARNING: File not found at {output_file})", "orange")
+        if self.batch_report:
+            self.batch_report.add(item.metrics)
 
         # Move to next file
         self.current_batch_index += 1
-        self.process_next_batch_file()
\ No newline at end of file
+        self.process_next_batch_file()
+
+    def finish_batch_report(self):
+        """Show run metrics in the batch tab and export them as CSV/JSON next to the outputs"""
+        report = self.batch_report
+        if not report or not report.records:
+            return
+        report.finish()
+        summary = report.summary_text()
+        self.main_window.log_message(f"Batch report: {summary}", "blue")
+        if hasattr(self.main_window, 'batchReportLabel') and self.main_window.batchReportLabel:
+            self.main_window.batchReportLabel.setText(summary)
+
+        try:
+            report_dir = os.path.dirname(report.records[0]['output'])
+            csv_path, json_path = report.export(report_dir)
+            if hasattr(self.main_window, 'batchReportLabel') and self.main_window.batchReportLabel:
+                self.main_window.batchReportLabel.setToolTip(f"{csv_path}\n{json_path}")
+            self.main_window.log_message(f"Batch report saved: {csv_path}", "green")
+        except Exception as e:
+            self.main_window.log_message(f"Error saving batch report: {e}", "red")
+
+    def toggle_watch_mode(self, enabled):
+        """Start or stop hot-folder watch mode"""
+        settings = load_settings()
+        if enabled:
+            folders = [folder for folder in settings.get('watch_folders', []) if os.path.isdir(folder)]
+            if not folders:
+                folder = QFileDialog.getExistingDirectory(self.main_window, "Select Folder to Watch")
+                if not folder:
+                    self.main_window.batchWatchButton.setChecked(False)
+                    return
+                folders = [folder]
+                settings['watch_folders'] = folders
+
+            output_dir = settings.get('watch_output_dir', '')
+            if not output_dir:
+                output_dir = QFileDialog.getExistingDirectory(self.main_window, "Select Output Folder for Watched Files")
+                if not output_dir:
+                    self.main_window.batchWatchButton.setChecked(False)
+                    return
+                settings['watch_output_dir'] = output_dir
+
+            settings['watch_enabled'] = True
+            save_settings(settings)
+            self.start_watch_mode(folders, output_dir,
+                                  settle_seconds=settings.get('watch_settle_seconds', 2.0),
+                                  poll_interval=settings.get('watch_poll_interval', 5.0))
+        else:
+            settings['watch_enabled'] = False
+            save_settings(settings)
+            self.stop_watch_mode()
+
+    def start_watch_mode(self, folders, output_dir, settle_seconds=2.0, poll_interval=5.0):
+        """Watch folders and convert every new or changed file into output_dir"""
+        self.stop_watch_mode()
+        self.watch_output_dir = output_dir
+        self.folder_watcher = FolderWatcher(folders, settle_seconds=settle_seconds,
+                                            poll_interval=poll_interval, parent=self.main_window)
+        self.folder_watcher.files_ready.connect(self.on_watch_files_ready)
+        self.folder_watcher.log_signal.connect(lambda msg: self.main_window.log_message(f"[Watch] {msg}", "orange"))
+        self.main_window.log_message(f"Watch mode started: {', '.join(folders)} -> {output_dir}", "green")
+        self.folder_watcher.start()
+
+    def stop_watch_mode(self):
+        """Stop watching folders"""
+        if self.folder_watcher:
+            self.folder_watcher.stop()
+            self.folder_watcher.deleteLater()
+            self.folder_watcher = None
+            self.main_window.log_message("Watch mode stopped", "blue")
+
+    def on_watch_files_ready(self, file_paths):
+        """Enqueue stable files from watched folders and start converting them"""
+        first_new_row = len(self.batch_files)
+        new_files = self.import_paths(file_paths, output_dir=self.watch_output_dir)
+        queued_at = time.monotonic()
+        for item in new_files:
+            item.queued_at = queued_at
+        # A running batch picks up appended rows by itself
+        if new_files and not self.batch_processing and self.prepare_translation(first_new_row, confirm=False):
+            self.start_batch(first_new_row)
@@ -1,11 +1,15 @@
 import os
 import sys
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from langdetect import detect
-from docx import Document
-from core.tts_worker import TTSWorker
+from core.tts_worker import (TTSWorker, ChapterWorker, StreamingWorker, TranslationWorker, TranslateSpeakWorker,
+                             DocumentImportWorker)
+from core.documents import read_document
+from core.chapters import CHAPTER_EXTENSIONS
+from core.streaming import LARGE_TEXT_BYTES, read_preview
+from core.voices import detect_language
 from core.settings import load_settings, save_settings
 from core.translator import TranslatorManager, TranslatorError
+from core.quota import STATUS_OVER, STATUS_WARN, ACTION_BLOCK
 
 class GeneralTabManager:
     """Manager for General tab functionality"""
@@ -15,50 +19,87 @@ class GeneralTabManager:
         self.selected_file = None
         self.text_content = ""
         self.translated_text = None  # Store translated text separately
+        self.streaming_file = None  # Huge .txt converted from disk, text_edit only shows a preview
         self.translator_manager = TranslatorManager()
+        self.translation_worker = None
+        self.import_worker = None  # PDF being extracted page by page
 
     def import_text(self):
         """Import text from file"""
         program_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
-        file_path, _ = QFileDialog.getOpenFileName(self.main_window, "Select Text File", program_dir, "Text Files (*.txt *.docx)")
+        file_path, _ = QFileDialog.getOpenFileName(self.main_window, "Select Text File", program_dir, "Text Files (*.txt *.docx *.pdf *.epub)")
         if file_path:
+            if self.import_worker is not None:
+                self.main_window.log_message("A PDF is still being imported", "orange")
+                return
             self.selected_file = file_path
-            filename = os.path.basename(file_path)
             try:
-                if file_path.endswith('.txt'):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        self.text_content = f.read()
-                elif file_path.endswith('.docx'):
-                    doc = Document(file_path)
-                    self.text_content = '\n'.join([para.text for para in doc.paragraphs])
-
-                char_count = len(self.text_content)
+                self.streaming_file = None
+                self.translated_text = None  # Reset translated text on new import
+                if file_path.endswith('.pdf'):
+                    self.import_pdf(file_path)
+                    return
+                elif file_path.lower().endswith('.txt') and os.path.getsize(file_path) >= LARGE_TEXT_BYTES:
+                    # Too large for the editor: keep a preview and convert from disk in segments
+                    self.streaming_file = file_path
+                    self.text_content = read_preview(file_path)
+                else:
+                    self.text_content = read_document(file_path)
+
                 # Set text in the text edit widget
                 if hasattr(self.main_window, 'text_edit'):
                     self.main_window.text_edit.setPlainText(self.text_content)
-                self.translated_text = None  # Reset translated text on new import
-                self.main_window.log_message(f"File: {filename}", "green")
-                self.main_window.log_message(f"Characters: {char_count}", "green")
-                # Detect language
-                try:
-                    detected_lang = detect(self.text_content)
-                    if detected_lang == 'ru':
-                        self.main_window.comboBox_2.setCurrentText("Russian")
-                    elif detected_lang == 'en':
-                        self.main_window.comboBox_2.setCurrentText("English")
-                    elif detected_lang == 'uk':
-                        self.main_window.comboBox_2.setCurrentText("Ukrainian")
-                    elif detected_lang == 'ja':
-                        self.main_window.comboBox_2.setCurrentText("Japanese")
-                    else:
-                        self.main_window.comboBox_2.setCurrentText("English")
-                    self.main_window.log_message(f"Detected language: {self.main_window.comboBox_2.currentText()}", "green")
-                except:
-                    self.main_window.comboBox_2.setCurrentText("English")
-                    self.main_window.log_message("Language detection failed, defaulting to English", "yellow")
+                self.show_imported(file_path)
             except Exception as e:
                 self.main_window.log_message(f"Error importing file: {e}", "red")
 
+    def show_imported(self, file_path):
+        """Log the imported file and select its detected language"""
+        char_count = len(self.text_content)
+        self.main_window.log_message(f"File: {os.path.basename(file_path)}", "green")
+        if self.streaming_file:
+            size_mb = os.path.getsize(file_path) / 2**20
+            self.main_window.log_message(f"Size: {size_mb:.0f} MB - showing the first {char_count} characters, "
+                                         "the whole file is converted in streaming mode", "yellow")
+        else:
+            self.main_window.log_message(f"Characters: {char_count}", "green")
+        # Detect language
+        detected_lang = detect_language(self.text_content)
+        if detected_lang:
+            self.main_window.comboBox_2.setCurrentText(detected_lang)
+            self.main_window.log_message(f"Detected language: {self.main_window.comboBox_2.currentText()}", "green")
+        else:
+            self.main_window.comboBox_2.setCurrentText("English")
+            self.main_window.log_message("Language detection failed, defaulting to English", "yellow")
+
+    def import_pdf(self, file_path):
+        """Extract a PDF in a worker thread, showing pages in the text area as they arrive;
+        scanned pages go through OCR after the quota pre-flight"""
+        ocr = self.main_window.img_to_text_tab_manager.pdf_ocr(file_path)
+        self.text_content = ""
+        if hasattr(self.main_window, 'text_edit'):
+            self.main_window.text_edit.clear()
+        self.import_worker = DocumentImportWorker(file_path, ocr=ocr)
+        self.import_worker.page_ready.connect(self.on_pdf_page)
+        self.import_worker.finished.connect(self.on_pdf_imported)
+        self.main_window.log_message(f"Importing {os.path.basename(file_path)}...", "blue")
+        self.import_worker.start()
+
+    def on_pdf_page(self, number, page):
+        if hasattr(self.main_window, 'text_edit'):
+            self.main_window.text_edit.appendPlainText(page)
+        self.main_window.log_message(f"Page {number} imported", "blue")
+
+    def on_pdf_imported(self, result):
+        worker = self.import_worker
+        # finished is emitted by run() itself; let the thread end before it is dropped
+        worker.wait()
+        self.import_worker = None
+        if result['error']:
+            self.main_window.log_message(f"Error importing file: {result['error']}", "red")
+        self.text_content = result['text']
+        self.show_imported(worker.file_path)
+
     def play_selected(self):
         """Play selected text from text edit"""
         if not hasattr(self.main_window, 'text_edit') or not self.main_window.text_edit:
@@ -95,7 +136,7 @@ class GeneralTabManager:
 
     def save_to_audio(self):
         """Save text content to audio file"""
-        if not self.text_content:
+        if not self.text_content and self.import_worker is None:
             self.main_window.log_message("Import text first", "red")
             return
         voice = self.get_selected_voice()
@@ -124,6 +165,19 @@ class GeneralTabManager:
             self.main_window.log_message(f"Created folder: <b>{output_dir}</b>", "white")
         output_file = os.path.join(output_dir, self.generate_filename(is_example=False))
 
+        if self.split_into_chapters():
+            self.save_chapters(voice, output_dir)
+            return
+        if self.streaming_file:
+            self.save_streaming(voice, model, output_file)
+            return
+        if self.import_worker is not None:
+            self.save_importing_pdf(voice, model, output_file)
+            return
+        if self.translate_on_save():
+            self.save_translated(output_dir)
+            return
+
         self.main_window.worker = TTSWorker(self.text_content, voice, output_file,
                                speed=self.main_window.voice_speed,
                                volume=self.main_window.voice_volume,
@@ -135,10 +189,128 @@ class GeneralTabManager:
         self.main_window.show_progress_bar()
         self.main_window.worker.start()
 
-    def get_selected_voice(self):
-        """Get selected voice based on current combo box selections"""
+    def save_importing_pdf(self, voice, model, output_file):
+        """Speak a PDF that is still being imported: pages are synthesized as the import extracts them"""
+        self.main_window.log_message("The PDF is still being imported, pages are spoken as they are extracted", "blue")
+        self.main_window.worker = TTSWorker(None, voice, output_file,
+                               speed=self.main_window.voice_speed,
+                               volume=self.main_window.voice_volume,
+                               pitch=self.main_window.voice_pitch,
+                               model=model, text_loader=self.import_worker.follow)
+        self.main_window.worker.progress.connect(self.main_window.update_progress)
+        self.main_window.worker.log_signal.connect(lambda msg: self.main_window.log_message(msg, "blue"))
+        self.main_window.worker.finished.connect(self.main_window.on_tts_finished)
+        self.main_window.show_progress_bar()
+        self.main_window.worker.start()
+
+    def split_into_chapters(self):
+        """Chapter mode applies to imported .docx/.epub files whose text was not translated"""
+        checkbox = getattr(self.main_window, 'chapterSplitCheckBox', None)
+        if not checkbox or not checkbox.isChecked():
+            return False
+        if not self.selected_file or not self.selected_file.lower().endswith(CHAPTER_EXTENSIONS):
+            self.main_window.log_message("Chapter splitting needs a .docx or .epub file, saving one file", "yellow")
+            return False
+        if self.translated_text is not None:
+            self.main_window.log_message("Translated text has no chapters, saving one file", "yellow")
+            return False
+        return True
+
+    def save_chapters(self, voice, output_dir):
+        """Render the imported document as one file per chapter into tts_audio/<document name>/"""
+        book_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(self.selected_file))[0])
+        self.main_window.log_message(f"Saving chapters to <b>{book_dir}</b>", "blue")
+        self.main_window.worker = ChapterWorker(self.selected_file, book_dir, voice,
+                                                speed=self.main_window.voice_speed,
+                                                volume=self.main_window.voice_volume,
+                                                pitch=self.main_window.voice_pitch)
+        self.main_window.worker.progress.connect(self.main_window.update_progress)
+        self.main_window.worker.log_signal.connect(lambda msg: self.main_window.log_message(msg, "blue"))
+        self.main_window.worker.finished.connect(self.main_window.on_tts_finished)
+        self.main_window.show_progress_bar()
+        self.main_window.worker.start()
+
+    def translate_on_save(self):
+        """"Translate on save" applies to text that was not translated yet"""
+        checkbox = getattr(self.main_window, 'translateSpeakCheckBox', None)
+        return bool(checkbox and checkbox.isChecked() and self.translated_text is None)
+
+    def save_translated(self, output_dir):
+        """Translate the text and speak each part as soon as it is translated"""
+        if self.translation_worker is not None:
+            self.main_window.log_message("A translation is already running", "orange")
+            return
+        settings = load_settings()
+        service = settings.get('translator_service', 'Microsoft Translator')
+        api_key = settings.get('translator_api_key', '')
+        if not api_key:
+            QMessageBox.warning(self.main_window, "API Key Required",
+                              "Please set up translator API key in Settings first.")
+            return
+        target_lang = getattr(self.main_window, 'translateLangComboBox', None)
+        target_language = target_lang.currentText() if target_lang else "English"
+        try:
+            translator = self.translator_manager.get_translator(service, api_key,
+                                                                use_memory=settings.get('translation_memory', True),
+                                                                track_quota=True)
+        except TranslatorError as e:
+            QMessageBox.critical(self.main_window, "Translation Error", str(e))
+            return
+        if not self.confirm_quota(translator, target_language):
+            return
+
+        voice = self.get_selected_voice(target_language)
+        output_file = os.path.join(output_dir, self.generate_filename(is_example=False, language=target_language))
+        self.main_window.log_message(f"Translating to {target_language} using {service} and saving to "
+                                     f"<b>{output_file}</b> as the translation arrives", "blue")
+        self.set_translating(True)
+        self.translation_worker = TranslateSpeakWorker(translator, self.text_content, target_language, voice,
+                                                       output_file, speed=self.main_window.voice_speed,
+                                                       volume=self.main_window.voice_volume,
+                                                       pitch=self.main_window.voice_pitch)
+        self.translation_worker.progress.connect(self.main_window.update_progress)
+        self.translation_worker.finished.connect(
+            lambda result: self.on_translate_speak_finished(result, target_language))
+        self.main_window.show_progress_bar()
+        self.translation_worker.start()
+
+    def on_translate_speak_finished(self, result, target_language):
+        """Show the translation that was spoken; the audio file is already complete"""
+        if result['cancelled'] or result['error'] is not None:
+            self.on_translation_finished(result)
+            return
+        self.translation_worker = None
+        self.set_translating(False)
+        spoken = result['result']
+        stats = spoken['stats']
+        if stats.get('hits'):
+            self.main_window.log_message(
+                f"Translation memory: {stats['hits']}/{stats['segments']} segments reused, "
+                f"{stats['chars_saved']} of {stats['chars']} characters not sent", "blue")
+        self.text_content = self.translated_text = spoken['text']
+        if hasattr(self.main_window, 'text_edit'):
+            self.main_window.text_edit.setPlainText(spoken['text'])
+        self.main_window.comboBox_2.setCurrentText(target_language)
+        self.main_window.on_tts_finished(f"Translated and saved {spoken['segments']} segments "
+                                         f"({spoken['bytes'] / 1024:.0f} KB of audio)")
+
+    def save_streaming(self, voice, model, output_file):
+        """Convert the huge imported .txt file segment by segment, straight from disk"""
+        self.main_window.log_message(f"Streaming {os.path.basename(self.streaming_file)} to <b>{output_file}</b>", "blue")
+        self.main_window.worker = StreamingWorker(self.streaming_file, output_file, voice=voice, model=model,
+                                                  speed=self.main_window.voice_speed,
+                                                  volume=self.main_window.voice_volume,
+                                                  pitch=self.main_window.voice_pitch)
+        self.main_window.worker.progress.connect(self.main_window.update_progress)
+        self.main_window.worker.log_signal.connect(lambda msg: self.main_window.log_message(msg, "blue"))
+        self.main_window.worker.finished.connect(self.main_window.on_tts_finished)
+        self.main_window.show_progress_bar()
+        self.main_window.worker.start()
+
+    def get_selected_voice(self, language=None):
+        """Get selected voice based on current combo box selections (or another language)"""
         model = self.main_window.comboBox.currentText()
-        language = self.main_window.comboBox_2.currentText()
+        language = language or self.main_window.comboBox_2.currentText()
         voice_type = self.main_window.comboBox_3.currentText()
         if model == "Edge TTS":
             voice_map = {
@@ -150,10 +322,10 @@ class GeneralTabManager:
             return voice_map.get(language, {}).get(voice_type, "en-US-AriaNeural")
         return "en-US-AriaNeural"
 
-    def generate_filename(self, is_example=False):
+    def generate_filename(self, is_example=False, language=None):
         """Generate filename for audio output"""
         model = self.main_window.comboBox.currentText()
-        language = self.main_window.comboBox_2.currentText()
+        language = language or self.main_window.comboBox_2.currentText()
         voice_type = self.main_window.comboBox_3.currentText()
         lang_code = {
             "Russian": "ru",
@@ -173,7 +345,7 @@ class GeneralTabManager:
                 "ja-JP-KeitaNeural": "keita",
                 "ja-JP-NanamiNeural": "nanami"
             }
-            voice_tag = voice_short.get(self.get_selected_voice(), voice_type.lower()[:3])
+            voice_tag = voice_short.get(self.get_selected_voice(language), voice_type.lower()[:3])
             model_tag = "edge"
 
         if is_example:
@@ -198,10 +370,17 @@ class GeneralTabManager:
         self.main_window.comboBox_3.setCurrentText("Female")
 
     def translate_text(self):
-        """Translate text using selected translator service"""
+        """Translate text using selected translator service; a second click cancels"""
+        if self.translation_worker is not None:
+            self.translation_worker.stop()
+            self.main_window.log_message("Cancelling translation after the requests already sent...", "orange")
+            return
         if not self.text_content:
             self.main_window.log_message("Import text first", "red")
             return
+        if self.streaming_file:
+            self.main_window.log_message("Files converted in streaming mode cannot be translated in the editor", "orange")
+            return
 
         # Get translator settings
         settings = load_settings()
@@ -220,42 +399,96 @@ class GeneralTabManager:
         else:
             target_language = "English"
 
+        try:
+            translator = self.translator_manager.get_translator(service, api_key,
+                                                                use_memory=settings.get('translation_memory', True),
+                                                                track_quota=True)
+        except TranslatorError as e:
+            QMessageBox.critical(self.main_window, "Translation Error", str(e))
+            return
+        if not self.confirm_quota(translator, target_language):
+            return
+
         self.main_window.log_message(f"Translating text to {target_language} using {service}...", "blue")
+        # The result replaces the editor text, so edits made meanwhile would be lost
+        self.set_translating(True)
+        self.translation_worker = TranslationWorker(translator, self.text_content, target_language)
+        self.translation_worker.progress.connect(self.on_translation_progress)
+        self.translation_worker.finished.connect(self.on_translation_finished)
+        self.main_window.show_progress_bar()
+        self.translation_worker.start()
 
-        try:
-            translator = self.translator_manager.get_translator(service, api_key)
-            translated_text = translator.translate(self.text_content, target_language)
+    def confirm_quota(self, translator, target_language):
+        """Pre-flight check of the characters this translation would send against the monthly budget"""
+        check = translator.quota.check(translator.estimate(self.text_content, target_language))
+        if check.status == STATUS_OVER:
+            if translator.quota.action == ACTION_BLOCK:
+                QMessageBox.warning(self.main_window, "Translation Quota", check.message())
+                self.main_window.log_message(f"Translation blocked: {check.message()}", "red")
+                return False
+            answer = QMessageBox.question(self.main_window, "Translation Quota",
+                                          f"{check.message()}\n\nTranslate anyway?",
+                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            return answer == QMessageBox.Yes
+        if check.status == STATUS_WARN:
+            self.main_window.log_message(check.message(), "yellow")
+        return True
 
-            # Update text content and UI
-            self.text_content = translated_text
-            self.translated_text = translated_text
-            if hasattr(self.main_window, 'text_edit'):
-                self.main_window.text_edit.setPlainText(translated_text)
+    def set_translating(self, translating):
+        """Turn the Translate button into Cancel and lock the editor while a translation runs"""
+        button = getattr(self.main_window, 'translateButton', None)
+        if button is not None:
+            localization = self.main_window.localization_manager
+            button.setText(localization.get_text("translate_cancel" if translating else "translate_button"))
+        if hasattr(self.main_window, 'text_edit'):
+            self.main_window.text_edit.setReadOnly(translating)
 
-            # Auto-detect language of translated text and update UI
-            try:
-                detected_lang = detect(translated_text)
-                if detected_lang == 'ru':
-                    self.main_window.comboBox_2.setCurrentText("Russian")
-                elif detected_lang == 'en':
-                    self.main_window.comboBox_2.setCurrentText("English")
-                elif detected_lang == 'uk':
-                    self.main_window.comboBox_2.setCurrentText("Ukrainian")
-                elif detected_lang == 'ja':
-                    self.main_window.comboBox_2.setCurrentText("Japanese")
-                else:
-                    self.main_window.comboBox_2.setCurrentText("English")
-                # Update voice options for the detected language
-                self.update_voice_options()
-                self.main_window.log_message(f"Detected translated language: {self.main_window.comboBox_2.currentText()}", "green")
-            except:
-                self.main_window.log_message("Language detection for translated text failed", "yellow")
+    def on_translation_progress(self, done, total):
+        if hasattr(self.main_window, 'progressBar'):
+            self.main_window.progressBar.setValue(done * 100 // total if total else 100)
+            self.main_window.progressBar.setFormat(f"Translating {done}/{total}")
 
-            self.main_window.log_message(f"Text translated successfully ({len(translated_text)} chars)", "green")
+    def on_translation_finished(self, result):
+        """Apply a completed translation to the editor, or report why there is none"""
+        self.translation_worker = None
+        self.set_translating(False)
+        if result['cancelled']:
+            self.main_window.log_message("Translation cancelled, text unchanged", "orange")
+            self.main_window.hide_progress_bar()
+            return
+        error = result['error']
+        if error is not None:
+            self.main_window.hide_progress_bar()
+            if isinstance(error, TranslatorError):
+                QMessageBox.critical(self.main_window, "Translation Error", str(error))
+                self.main_window.log_message(f"Translation failed: {error}", "red")
+            else:
+                QMessageBox.critical(self.main_window, "Translation Error", f"Unexpected error: {str(error)}")
+                self.main_window.log_message(f"Translation error: {error}", "red")
+            return
 
-        except TranslatorError as e:
-            QMessageBox.critical(self.main_window, "Translation Error", str(e))
-            self.main_window.log_message(f"Translation failed: {e}", "red")
-        except Exception as e:
-            QMessageBox.critical(self.main_window, "Translation Error", f"Unexpected error: {str(e)}")
-            self.main_window.log_message(f"Translation error: {e}", "red")
\ No newline at end of file
+        translated_text = result['text']
+        stats = result['stats']
+        if stats.get('hits'):
+            self.main_window.log_message(
+                f"Translation memory: {stats['hits']}/{stats['segments']} segments reused "
+                f"({stats['hits'] * 100 // stats['segments']}% hit rate), "
+                f"{stats['chars_saved']} of {stats['chars']} characters not sent", "blue")
+
+        # Update text content and UI
+        self.text_content = translated_text
+        self.translated_text = translated_text
+        if hasattr(self.main_window, 'text_edit'):
+            self.main_window.text_edit.setPlainText(translated_text)
+
+        # Auto-detect language of translated text and update UI
+        detected_lang = detect_language(translated_text)
+        if detected_lang:
+            self.main_window.comboBox_2.setCurrentText(detected_lang)
+            # Update voice options for the detected language
+            self.update_voice_options()
+            self.main_window.log_message(f"Detected translated language: {self.main_window.comboBox_2.currentText()}", "green")
+        else:
+            self.main_window.log_message("Language detection for translated text failed", "yellow")
+
+        self.main_window.on_tts_finished(f"Text translated successfully ({len(translated_text)} chars)")
@@ -1,7 +1,10 @@
 import os
 import sys
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from core.settings import load_settings, save_settings
+from core.settings import load_settings, save_settings, service_endpoint
+from core.quota import STATUS_OVER, STATUS_WARN, ACTION_BLOCK
+from core.key_pool import get_key_pool
+from core.key_check import KeyStatusChecker, STATE_VALID, STATE_INVALID, STATE_CHECKING
 
 class ImgToTextTabManager:
     """Manager for IMG to Text (OCR) tab functionality"""
@@ -10,6 +13,8 @@ class ImgToTextTabManager:
         self.main_window = main_window
         self.selected_image = None
         self.extracted_text = ""
+        self.key_checker = KeyStatusChecker(parent=main_window)
+        self.key_checker.status_changed.connect(self.show_api_key_status)
 
     def setup_ui(self):
         """Setup UI elements from Qt Designer"""
@@ -40,6 +45,7 @@ class ImgToTextTabManager:
                 self.main_window.ocrApiKeyInput.textChanged.connect(self.save_ocr_settings)
             if hasattr(self.main_window, 'azureEndpointInput'):
                 self.main_window.azureEndpointInput.textChanged.connect(self.save_ocr_settings)
+                self.main_window.azureEndpointInput.textChanged.connect(self.update_api_key_status)
 
             # Load saved settings
             self.load_ocr_settings()
@@ -94,6 +100,9 @@ class ImgToTextTabManager:
             service = self.main_window.ocrServiceComboBox.currentText() if hasattr(self.main_window, 'ocrServiceComboBox') else "Google Vision API"
             api_key = self.main_window.ocrApiKeyInput.text() if hasattr(self.main_window, 'ocrApiKeyInput') else ""
 
+            if service in ("Google Vision API", "Azure Computer Vision") and not self.confirm_quota(service, api_key):
+                return
+
             if service == "Google Vision API":
                 self.extracted_text = self._extract_with_google_vision(api_key)
             elif service == "Azure Computer Vision":
@@ -111,6 +120,74 @@ class ImgToTextTabManager:
             self.main_window.log_message(error_msg, "red")
             QMessageBox.critical(self.main_window, "OCR Error", error_msg)
 
+    def ocr_image(self, image_path):
+        """OCR an image file with the saved OCR service; Tesseract (local) when no API key is set.
+
+        Reads service and key from settings, not widgets, so it can run in worker threads
+        (PDF import uses it for scanned pages). Returns "" when nothing is recognized.
+        """
+        settings = load_settings()
+        service = settings.get('ocr_service', 'Azure Computer Vision')
+        api_key = settings.get('ocr_api_key', '')
+        if service == "Google Vision API" and api_key:
+            text = self._extract_with_google_vision(api_key, image_path)
+        elif service == "Azure Computer Vision" and api_key:
+            text = self._extract_with_azure_vision(api_key, image_path)
+        else:
+            text = self._extract_with_tesseract(image_path)
+        return "" if text == "No text found in image" else text
+
+    def key_pool(self, service, api_key):
+        """Key pool (core.key_pool) of an OCR service with api_key as its first key"""
+        if service == "Azure Computer Vision":
+            endpoint = load_settings().get('azure_endpoint', 'https://westeurope.api.cognitive.microsoft.com/')
+            return get_key_pool(service, {'key': api_key, 'endpoint': endpoint})
+        return get_key_pool(service, api_key)
+
+    def confirm_quota(self, service, api_key, images=1):
+        """Pre-flight check of the images to send against the monthly budget of the OCR service's keys"""
+        guard = self.key_pool(service, api_key)
+        check = guard.check(images)
+        if check.status == STATUS_OVER:
+            if guard.action == ACTION_BLOCK:
+                QMessageBox.warning(self.main_window, "OCR Quota", check.message())
+                return False
+            answer = QMessageBox.question(self.main_window, "OCR Quota", f"{check.message()}\n\nContinue anyway?",
+                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            return answer == QMessageBox.Yes
+        if check.status == STATUS_WARN:
+            self.main_window.log_message(check.message(), "yellow")
+        return True
+
+    def pdf_ocr(self, file_path):
+        """OCR callback for the scanned pages of a PDF after the quota pre-flight, or None to skip them.
+
+        The page count is the upper bound of the images sent, pages with a text layer are not OCR'd.
+        """
+        settings = load_settings()
+        service = settings.get('ocr_service', 'Azure Computer Vision')
+        api_key = settings.get('ocr_api_key', '')
+        if service in ("Google Vision API", "Azure Computer Vision") and api_key:
+            from core.pdf_import import pdf_page_count
+            if not self.confirm_quota(service, api_key, pdf_page_count(file_path)):
+                self.main_window.log_message("Scanned PDF pages are skipped (OCR quota)", "orange")
+                return None
+        return self.ocr_image_bytes
+
+    def ocr_image_bytes(self, image_data):
+        """OCR in-memory PNG data (rendered PDF page) via a temporary file"""
+        import tempfile
+        fd, temp_path = tempfile.mkstemp(suffix='.png')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(image_data)
+            return self.ocr_image(temp_path)
+        finally:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
     def copy_extracted_text(self):
         """Copy extracted text to clipboard"""
         if not self.extracted_text:
@@ -222,41 +299,36 @@ class ImgToTextTabManager:
         save_settings(settings)
 
     def update_api_key_status(self):
-        """Update API key status icon based on current input and service"""
+        """Check the OCR API key once the input settles (core.key_check)"""
         if not hasattr(self.main_window, 'ocrApiKeyStatusLabel') or not hasattr(self.main_window, 'ocrApiKeyInput'):
             return
 
         api_key = self.main_window.ocrApiKeyInput.text().strip()
         service = self.main_window.ocrServiceComboBox.currentText() if hasattr(self.main_window, 'ocrServiceComboBox') else "Google Vision API"
 
-        # Default status: empty field
-        if not api_key:
-            self.main_window.ocrApiKeyStatusLabel.setText("⭕")
-            self.main_window.ocrApiKeyStatusLabel.setToolTip("API Key Status: No key entered")
-            return
-
-        # Test the key asynchronously (don't block UI)
-        try:
-            if service == "Google Vision API":
-                success = self._test_google_vision_key(api_key)
-            elif service == "Azure Computer Vision":
-                success = self._test_azure_vision_key(api_key)
-            elif service == "Tesseract (Local)":
-                success = self._test_tesseract_setup()
-            else:
-                success = False
+        scope = ''
+        if service == "Google Vision API":
+            test = self._test_google_vision_key
+        elif service == "Azure Computer Vision":
+            test = self._test_azure_vision_key
+            # An Azure key is only valid for its own resource endpoint
+            if hasattr(self.main_window, 'azureEndpointInput'):
+                scope = self.main_window.azureEndpointInput.text().strip()
+        elif service == "Tesseract (Local)":
+            test = lambda key: self._test_tesseract_setup()
+        else:
+            test = lambda key: False
 
-            if success:
-                self.main_window.ocrApiKeyStatusLabel.setText("✅")
-                self.main_window.ocrApiKeyStatusLabel.setToolTip("API Key Status: Valid")
-            else:
-                self.main_window.ocrApiKeyStatusLabel.setText("❌")
-                self.main_window.ocrApiKeyStatusLabel.setToolTip("API Key Status: Invalid")
+        # The tests send real requests, so they run in a worker thread
+        self.key_checker.request(service, api_key, test, scope)
 
-        except Exception as e:
-            # On error, show neutral status
-            self.main_window.ocrApiKeyStatusLabel.setText("⭕")
-            self.main_window.ocrApiKeyStatusLabel.setToolTip(f"API Key Status: Error - {str(e)}")
+    def show_api_key_status(self, state, message):
+        """Status icon for a KeyStatusChecker result"""
+        if not hasattr(self.main_window, 'ocrApiKeyStatusLabel'):
+            return
+        icons = {STATE_VALID: "✅", STATE_INVALID: "❌", STATE_CHECKING: "⏳"}
+        self.main_window.ocrApiKeyStatusLabel.setText(icons.get(state, "⭕"))
+        self.main_window.ocrApiKeyStatusLabel.setToolTip(f"API Key Status: {message}")
 
     def test_ocr_api_key(self):
         """Test OCR API key validity (legacy method, kept for compatibility)"""
@@ -297,7 +369,7 @@ class ImgToTextTabManager:
     def _test_google_vision_key(self, api_key):
         """Test Google Vision API key by making a simple request"""
         try:
-            import requests
+            from core.http_client import http_post
 
             # Create a minimal test request (empty image detection)
             test_data = {
@@ -312,9 +384,10 @@ class ImgToTextTabManager:
                 }]
             }
 
-            url = f"https://vision.googleapis.com/v1/images:annotate?key={api_key}"
+            url = service_endpoint("Google Vision API")
             headers = {'Content-Type': 'application/json'}
-            response = requests.post(url, json=test_data, headers=headers, timeout=10)
+            response = http_post(url, params={'key': api_key}, json=test_data, headers=headers, timeout=10,
+                                 idempotent=True, retries=1)
 
             if response.status_code == 200:
                 result = response.json()
@@ -343,6 +416,7 @@ class ImgToTextTabManager:
             import requests
             from PIL import Image
             import io
+            from core.http_client import http_post
 
             # Get Azure endpoint from settings
             settings = load_settings()
@@ -361,7 +435,7 @@ class ImgToTextTabManager:
             }
 
             url = f"{azure_endpoint}/vision/v3.2/analyze?visualFeatures=Categories"
-            response = requests.post(url, headers=headers, data=img_byte_arr, timeout=10)
+            response = http_post(url, headers=headers, data=img_byte_arr, timeout=10, idempotent=True, retries=1)
 
             # If we get 200 or even 400 (bad request), key is valid
             # If 401/403, key is invalid
@@ -393,7 +467,7 @@ class ImgToTextTabManager:
         except Exception as e:
             raise Exception(f"Tesseract setup test failed: {str(e)}")
 
-    def _extract_with_google_vision(self, api_key):
+    def _extract_with_google_vision(self, api_key, image_path=None):
         """Extract text using Google Vision API"""
         try:
             from google.cloud import vision
@@ -405,7 +479,7 @@ class ImgToTextTabManager:
             # since the Python client requires service account credentials
 
             # Read image and encode to base64
-            with open(self.selected_image, 'rb') as image_file:
+            with open(image_path or self.selected_image, 'rb') as image_file:
                 content = base64.b64encode(image_file.read()).decode('utf-8')
 
             # Prepare request
@@ -421,11 +495,12 @@ class ImgToTextTabManager:
                 }]
             }
 
-            # Make API request
-            import requests
-            url = f"https://vision.googleapis.com/v1/images:annotate?key={api_key}"
+            # Make API request through the key pool; scanned PDF pages stop here once every key
+            # is used up with quota_action block
+            url = service_endpoint("Google Vision API")
             headers = {'Content-Type': 'application/json'}
-            response = requests.post(url, json=request_data, headers=headers)
+            response = self.key_pool("Google Vision API", api_key).request(
+                'POST', lambda key: (url, {'params': {'key': key.key}, 'json': request_data, 'headers': headers}), units=1)
             response.raise_for_status()
 
             result = response.json()
@@ -447,7 +522,7 @@ class ImgToTextTabManager:
         except Exception as e:
             raise Exception(f"Google Vision API error: {str(e)}")
 
-    def _extract_with_azure_vision(self, api_key):
+    def _extract_with_azure_vision(self, api_key, image_path=None):
         """Extract text using Azure Computer Vision API"""
         try:
             import requests
@@ -457,25 +532,26 @@ class ImgToTextTabManager:
             azure_endpoint = settings.get('azure_endpoint', 'https://westeurope.api.cognitive.microsoft.com/').rstrip('/')
 
             # Read image
-            with open(self.selected_image, 'rb') as image_file:
+            with open(image_path or self.selected_image, 'rb') as image_file:
                 content = image_file.read()
 
-            # Azure Computer Vision OCR API
-            url = f"{azure_endpoint}/vision/v3.2/ocr"
-
-            headers = {
-                'Ocp-Apim-Subscription-Key': api_key,
-                'Content-Type': 'application/octet-stream'
-            }
-
             # Optional parameters for better OCR
             params = {
                 'language': 'unk',  # Auto-detect language
                 'detectOrientation': 'true'
             }
 
-            # Make API request
-            response = requests.post(url, headers=headers, params=params, data=content, timeout=30)
+            def build(key):
+                # Azure Computer Vision OCR API of the key's resource
+                url = f"{(key.endpoint or azure_endpoint).rstrip('/')}/vision/v3.2/ocr"
+                headers = {
+                    'Ocp-Apim-Subscription-Key': key.key,
+                    'Content-Type': 'application/octet-stream'
+                }
+                return url, {'headers': headers, 'params': params, 'data': content}
+
+            # Make API request through the key pool
+            response = self.key_pool("Azure Computer Vision", api_key).request('POST', build, units=1)
             response.raise_for_status()
 
             result = response.json()
@@ -508,14 +584,14 @@ class ImgToTextTabManager:
         except Exception as e:
             raise Exception(f"Azure Computer Vision OCR error: {str(e)}")
 
-    def _extract_with_tesseract(self):
+    def _extract_with_tesseract(self, image_path=None):
         """Extract text using Tesseract OCR (local)"""
         try:
             import pytesseract
             from PIL import Image
 
             # Open image
-            image = Image.open(self.selected_image)
+            image = Image.open(image_path or self.selected_image)
 
             # Extract text
             text = pytesseract.image_to_string(image)
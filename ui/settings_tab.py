@@ -4,6 +4,8 @@ import shutil
 import webbrowser
 from core.settings import load_settings, save_settings
 from core.translator import TranslatorManager, TranslatorError
+from core.key_check import KeyStatusChecker, STATE_VALID, STATE_INVALID, STATE_CHECKING
+from core.key_pool import get_key_pool, format_pool_stats
 from PyQt5.QtWidgets import QLabel, QComboBox, QLineEdit, QPushButton, QTextEdit, QVBoxLayout, QWidget, QHBoxLayout, QMessageBox
 
 class SettingsTabManager:
@@ -12,6 +14,8 @@ class SettingsTabManager:
     def __init__(self, main_window):
         self.main_window = main_window
         self.translator_manager = TranslatorManager()
+        self.key_checker = KeyStatusChecker(parent=main_window)
+        self.key_checker.status_changed.connect(self.show_translator_api_key_status)
         self.setup_translator_ui()
 
     def setup_settings_combo_boxes(self):
@@ -140,6 +144,12 @@ class SettingsTabManager:
                 self.main_window.translatorApiKeyInput.textChanged.connect(self.save_translator_settings)
                 self.main_window.translatorApiKeyInput.textChanged.connect(self.update_translator_api_key_status)
 
+            # Key usage is read when the Settings tab is shown
+            if hasattr(self.main_window, 'tabWidget'):
+                self.main_window.tabWidget.currentChanged.connect(self.refresh_key_usage)
+            if hasattr(self.main_window, 'translatorServiceComboBox'):
+                self.main_window.translatorServiceComboBox.currentTextChanged.connect(self.refresh_key_usage)
+
             if hasattr(self.main_window, 'translatorVideoButton'):
                 self.main_window.translatorVideoButton.clicked.connect(self.open_video_tutorial)
 
@@ -162,33 +172,43 @@ class SettingsTabManager:
             self.main_window.translatorDescriptionText.setHtml(description)
 
     def update_translator_api_key_status(self):
-        """Update translator API key status icon based on current input and service"""
+        """Check the translator API key once the input settles (core.key_check)"""
         if not hasattr(self.main_window, 'translatorApiKeyStatusLabel') or not hasattr(self.main_window, 'translatorApiKeyInput'):
             return
 
         api_key = self.main_window.translatorApiKeyInput.text().strip()
         service = self.main_window.translatorServiceComboBox.currentText() if hasattr(self.main_window, 'translatorServiceComboBox') else "Microsoft Translator"
 
-        # Default status: empty field
-        if not api_key:
-            self.main_window.translatorApiKeyStatusLabel.setText("⭕")
-            self.main_window.translatorApiKeyStatusLabel.setToolTip("API Key Status: No key entered")
-            return
-
-        # Test the key asynchronously (don't block UI)
-        try:
-            translator = self.translator_manager.get_translator(service, api_key)
-            if translator.test_key():
-                self.main_window.translatorApiKeyStatusLabel.setText("✅")
-                self.main_window.translatorApiKeyStatusLabel.setToolTip("API Key Status: Valid")
-            else:
-                self.main_window.translatorApiKeyStatusLabel.setText("❌")
-                self.main_window.translatorApiKeyStatusLabel.setToolTip("API Key Status: Invalid")
+        # test_key sends a real translation, so it runs in a worker thread
+        self.key_checker.request(service, api_key,
+                                 lambda key: self.translator_manager.get_translator(service, key).test_key())
 
-        except Exception as e:
-            # On error, show neutral status
-            self.main_window.translatorApiKeyStatusLabel.setText("⭕")
-            self.main_window.translatorApiKeyStatusLabel.setToolTip(f"API Key Status: Error - {str(e)}")
+    def show_translator_api_key_status(self, state, message):
+        """Status icon for a KeyStatusChecker result"""
+        if not hasattr(self.main_window, 'translatorApiKeyStatusLabel'):
+            return
+        icons = {STATE_VALID: "✅", STATE_INVALID: "❌", STATE_CHECKING: "⏳"}
+        self.main_window.translatorApiKeyStatusLabel.setText(icons.get(state, "⭕"))
+        self.main_window.translatorApiKeyStatusLabel.setToolTip(f"API Key Status: {message}")
+
+    def refresh_key_usage(self, *args):
+        """Show monthly usage, state and errors of every translator and OCR key (core.key_pool)"""
+        usage_text = getattr(self.main_window, 'keyUsageText', None)
+        if usage_text is None or not usage_text.isVisible():
+            return
+        settings = load_settings()
+        service = settings.get('translator_service', 'Microsoft Translator')
+        pool = get_key_pool(service, settings.get('translator_api_key', ''), settings)
+        sections = [format_pool_stats(service, pool.stats())]
+        ocr_service = settings.get('ocr_service', 'Azure Computer Vision')
+        if ocr_service in ("Google Vision API", "Azure Computer Vision"):
+            # Same first key as the IMG to Text tab, so the pool and its counters are shared
+            primary = settings.get('ocr_api_key', '')
+            if ocr_service == "Azure Computer Vision":
+                primary = {'key': primary,
+                           'endpoint': settings.get('azure_endpoint', 'https://westeurope.api.cognitive.microsoft.com/')}
+            sections.append(format_pool_stats(ocr_service, get_key_pool(ocr_service, primary, settings).stats()))
+        usage_text.setPlainText('\n'.join(sections))
 
     def test_translator_api_key(self):
         """Test the translator API key (legacy method, kept for compatibility)"""